@@ -0,0 +1,108 @@
+# backends.py
+"""
+Registry fuer optionale Backends (Hardware, Grafik).
+
+Schwere bzw. plattformabhaengige Bibliotheken (Blinka, pygame, PyOpenGL) werden erst
+beim ersten get() importiert. Headless-Analyse, Replay und Tests laden sie nie.
+
+    hw = backends.get("hardware")        # Namespace mit hw.board, hw.busio, ...
+    Visualizer = backends.get("graphics").visualizer
+"""
+import sys
+import os
+import importlib
+import importlib.util
+import types
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+class BackendUnavailable(ImportError):
+    """Backend ist nicht registriert oder seine Bibliotheken fehlen auf diesem Rechner."""
+
+
+class Backend:
+    def __init__(self, kind, name, symbols, description="", requires=()):
+        self.kind = kind
+        self.name = name
+        # Attribut -> "modul" oder "modul:objekt"
+        self.symbols = dict(symbols)
+        self.description = description
+        # Externe Pakete, die die Symbol-Module intern importieren
+        self.requires = tuple(requires)
+        self._loaded = None
+
+    def modules(self):
+        return sorted({target.split(":")[0] for target in self.symbols.values()} | set(self.requires))
+
+    def available(self):
+        """Prueft, ob alle Module installiert sind, ohne sie zu importieren."""
+        for module in self.modules():
+            try:
+                if importlib.util.find_spec(module) is None:
+                    return False
+            except (ImportError, ValueError):
+                return False
+        return True
+
+    def load(self):
+        if self._loaded is None:
+            namespace = types.SimpleNamespace()
+            for attr, target in self.symbols.items():
+                module_name, _, obj = target.partition(":")
+                try:
+                    module = importlib.import_module(module_name)
+                except ImportError as e:
+                    raise BackendUnavailable(f"{self.kind}/{self.name}: {e}") from e
+                setattr(namespace, attr, getattr(module, obj) if obj else module)
+            self._loaded = namespace
+        return self._loaded
+
+
+_REGISTRY = {}
+_DEFAULTS = {}
+
+
+def register(kind, name, symbols, description="", requires=(), default=False):
+    """Registriert ein Backend. Das erste Backend einer Art ist die Voreinstellung."""
+    backend = Backend(kind, name, symbols, description, requires)
+    _REGISTRY.setdefault(kind, {})[name] = backend
+    if default or kind not in _DEFAULTS:
+        _DEFAULTS[kind] = name
+    return backend
+
+
+def get(kind, name=None):
+    """Laedt ein Backend (beim ersten Aufruf) und liefert seinen Namespace."""
+    name = name or _DEFAULTS.get(kind)
+    backend = _REGISTRY.get(kind, {}).get(name)
+    if backend is None:
+        raise BackendUnavailable(f"Kein Backend '{name}' fuer '{kind}' registriert")
+    return backend.load()
+
+
+def available(kind):
+    """Namen aller installierten Backends einer Art (ohne Import)."""
+    return [name for name, backend in _REGISTRY.get(kind, {}).items() if backend.available()]
+
+
+def loaded():
+    """Liste (Art, Name) der bereits geladenen Backends."""
+    return [(kind, name) for kind, backends in _REGISTRY.items()
+            for name, backend in backends.items() if backend._loaded is not None]
+
+
+register("hardware", "blinka", {
+    "board": "board",
+    "busio": "busio",
+    "bno055": "adafruit_bno055",
+    "mux": "adafruit_tca9548a",
+}, "Raspberry Pi / CircuitPython Blinka (BNO055 hinter TCA9548A)")
+
+register("hardware", "i2cdev", {
+    "i2cdev": "hardware.i2cdev",
+}, "Linux /dev/i2c-N direkt (I2C_RDWR), faellt auf Blinka zurueck")
+
+register("graphics", "opengl", {
+    "visualizer": "visualization.arm_renderer:ArmVisualizer",
+}, "pygame + PyOpenGL Fenster", requires=("pygame", "OpenGL"))
@@ -1,11 +1,34 @@
 # config.py
 
 # --- HARDWARE ---
-I2C_FREQ = 10000
+I2C_FREQ = 10000       # Feste Bus-Frequenz (wenn I2C_AUTOTUNE aus ist)
 MUX_ADDRESS = 0x70
 BNO_ADDRESS = 0x28
+I2C_BUS = 1            # Bus-Nummer (/dev/i2c-1 am Pi), Schluessel in der Topologie
 
-# Mapping der Sensoren am Multiplexer
+# Topologie-Erkennung (hardware/discovery.py): Beim ersten Start werden alle Multiplexer-
+# Kanaele nach BNO055 (0x28/0x29) gescannt, danach nur noch der Cache bestaetigt.
+DISCOVERY = True
+DISCOVERY_MUX_ADDRESSES = [0x70]  # Zu pruefende TCA9548A-Adressen (0x70..0x77)
+DISCOVERY_CACHE = "~/.cache/armsense/topology.json"
+
+# Automatisches Tuning der Bus-Frequenz (jeder Kabelbaum vertraegt etwas anderes).
+# Beim Start werden die Kandidaten aufsteigend gegen die echten Sensoren getestet
+# (NAKs + korrupte Quaternionen), im Betrieb wird bei Fehlern zurueckgeschaltet.
+# Gewechselt wird nur der Bus-Takt; Sensoren und Kalibrierung bleiben erhalten.
+# Hinweis: Auf dem Raspberry Pi legt der Kernel-Treiber die Frequenz fest
+# (dtparam=i2c_arm_baudrate); dort wirkt das Tuning nur mit einem Backend,
+# das die Frequenz tatsaechlich setzen kann (z.B. bitbangio / Microcontroller).
+# Mit HARDWARE_BACKEND = "i2cdev" bleibt das Tuning deshalb aus (Meldung beim Start).
+I2C_AUTOTUNE = False
+I2C_FREQ_CANDIDATES = [10000, 50000, 100000, 200000, 400000]
+I2C_ERROR_BUDGET = 0.01    # Max. Fehlerrate (1%)
+I2C_TUNE_SAMPLES = 20      # Sweeps pro getesteter Frequenz (im Betrieb: normale Frames)
+I2C_ERROR_WINDOW = 200     # Lesezugriffe im Betrieb fuer die Fehlerrate
+I2C_RETUNE_INTERVAL = 300.0  # Sekunden zwischen Tests der naechsthoeheren Stufe
+
+# Mapping der Sensoren am Multiplexer: Kanal an MUX_ADDRESS oder (Mux-Adresse, Kanal),
+# z.B. "hand": (0x71, 3) fuer einen zweiten TCA9548A (nur Blinka-Backend)
 SENSOR_MAPPING = {
     "base": 2,  # Sensor am Oberarm
     "arm": 7    # Sensor am Unterarm
@@ -35,8 +58,125 @@ BODY_POS = (-BODY_WIDTH - 0.5, -6.0, -BODY_DEPTH/2)
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 FPS = 30
+# Geister-Arme (main.py --ghosts): aufgezeichnete Sitzungen halbtransparent ueber dem Live-Arm
+GHOST_ALPHA = 0.25
+GHOST_COLORS = [(0.4, 0.7, 1.0), (1.0, 0.8, 0.3), (0.8, 0.5, 1.0), (0.4, 1.0, 0.8), (1.0, 0.5, 0.6)]
+GHOST_LIMIT = 500  # Hoechstens so viele Sitzungen laden
 # --- SIGNAL FILTERING ---
 # Maximal erlaubter Sprung pro Frame in Grad.
 # Alles darüber wird als Glitch ignoriert.
 MAX_ANGLE_JUMP = 20.0
-MAX_OUTLIERS = 5  # Anzahl Frames, die ein Wert abweichen darf, bevor er akzeptiert wird
\ No newline at end of file
+MAX_OUTLIERS = 5  # Anzahl Frames, die ein Wert abweichen darf, bevor er akzeptiert wird
+# Filter-Kette pro Sensor (hardware/filters.py): "jump" (obige Grenzen), "median" (Spikes),
+# "one_euro" (adaptiver Tiefpass), "slerp" (exponentielle Glaettung). Mehr Glaettung = mehr Latenz.
+FILTER_CHAIN = [("jump", {})]
+FILTER_CHAINS = {}  # Pro Sensor, z.B. {"arm": [("median", {"window": 3}), ("jump", {}),
+                    #                            ("one_euro", {"min_cutoff": 1.0, "beta": 1.0})]}
+
+# --- SHARED MEMORY (Akquisitions-Daemon) ---
+# Der Daemon (main.py --daemon) besitzt die Hardware und schreibt jeden
+# gefilterten Frame in einen Ringpuffer. Beliebig viele lokale Tools lesen mit.
+SHM_NAME = "armsense_frames"
+SHM_CAPACITY = 256   # Anzahl Frames im Ringpuffer
+ACQ_RATE = 100       # Ziel-Rate des Daemons in Hz (BNO055 Fusion laeuft mit 100 Hz)
+
+# --- NETZWERK-STREAMING ---
+# Kompakte Binaer-Frames (int16 Quaternionen) an entfernte Viewer/Recorder.
+STREAM_GROUP = "239.255.42.99"  # UDP Multicast-Gruppe
+STREAM_PORT = 5005
+STREAM_WS_PORT = 8765           # Lokaler WebSocket-Server
+STREAM_DELAY = 0.05             # Interpolations-Verzoegerung beim Client in Sekunden
+
+# --- HEADLESS-BETRIEB (main.py --headless) ---
+# Akquisition und Posen-Erkennung ohne Grafik und ohne Taktbremse (headless.py).
+HEADLESS_CONTROL_HOST = "127.0.0.1"  # Steuer-Socket fuer Kalibrier-Kommandos (nur lokal)
+HEADLESS_CONTROL_PORT = 9106
+HEADLESS_POSE_MIN_DURATION = 0.1     # Sekunden, die eine neue Pose anliegen muss, bevor sie gemeldet wird
+
+# --- SPLIT-MODUS (main.py --split) ---
+# Akquisition und Rendering laufen in getrennten Prozessen.
+ACQ_CPU = None            # CPU-Kern fuer den Akquisitions-Prozess (z.B. 3 auf dem Pi), None = frei
+SPLIT_POSE_TEXT_LEN = 128 # Max. Laenge des Posen-Texts im Shared Memory
+
+# --- POLLING-SCHEDULER ---
+# Schnell bewegte Segmente werden oefter gelesen, ruhige seltener (bis POLL_MIN_RATE).
+# Pro Sweep werden nur so viele Sensoren gelesen, wie in POLL_SWEEP_BUDGET passen.
+POLL_SCHEDULER = False
+POLL_SWEEP_BUDGET = 0.008   # I2C-Zeit pro Sweep in Sekunden
+POLL_MIN_RATE = 5.0         # Untergrenze in Hz (auch ruhende Sensoren)
+POLL_MAX_RATE = 100.0       # Obergrenze in Hz (BNO055 Fusionsrate)
+POLL_RESOLUTION = 1.0       # Ziel: max. Winkelaenderung (Grad) zwischen zwei Reads
+
+# --- ZEITBUDGET PRO FRAME ---
+# get_data() wartet hoechstens SWEEP_DEADLINE Sekunden auf den Bus (hardware/deadline.py).
+# Die Reads laufen dann in einem Bus-Worker-Thread; Sensoren, die nicht mehr ins Budget
+# passen oder haengen, liefern ihren letzten gueltigen Wert und gelten als veraltet.
+SWEEP_DEADLINE = None   # z.B. 0.008; None = ohne Zeitlimit lesen (bisheriges Verhalten)
+STALE_WARN_AGE = 0.1    # Ab diesem Alter (s) zeigen Visualizer und Posen-Erkennung "veraltet"
+
+# --- ZEITVERSATZ IM SWEEP (hardware/skew.py) ---
+# Die Sensoren werden nacheinander gelesen. Mit SKEW_COMPENSATION werden alle per SLERP auf
+# den Zeitpunkt des aeltesten Reads im Sweep gebracht (konsistente Gelenkwinkel auch bei
+# langsamem Bus, dafuer bis zu einem Sweep mehr Latenz).
+SKEW_COMPENSATION = False
+SKEW_HISTORY = 4        # Reads pro Sensor fuer die Interpolation
+
+# --- METRIKEN (metrics.py) ---
+# Zaehler/Histogramme pro Sensor (Reads, Fehler, Jump-Filter, veraltete Frames, Read-Dauer)
+METRICS_PORT = 9105         # Prometheus-Text auf http://METRICS_HOST:METRICS_PORT/metrics, None = aus
+METRICS_HOST = "127.0.0.1"  # Nur lokal; fuer zentrales Scraping z.B. "0.0.0.0"
+METRICS_SNAPSHOT = None     # Pfad fuer periodischen JSON-Snapshot, z.B. "/var/lib/armsense/metrics.json"
+METRICS_SNAPSHOT_INTERVAL = 10.0  # Sekunden
+
+# --- KALIBRIERUNG ---
+# Kalibrierung mittelt ueber mehrere Frames (Markley-Mittelwert mit Ausreisser-Filter)
+# und laeuft im Hintergrund, waehrend weiter gerendert wird.
+CALIB_SAMPLES = 50          # Frames pro Kalibrierung (bei 100 Hz = 0.5 s)
+CALIB_MAX_DEVIATION = 5.0   # Samples weiter als x Grad vom Mittelwert werden verworfen
+
+# --- SENSORFUSION ---
+# "onboard": Fusion im BNO055 (sensor.quaternion, max. 100 Hz, feste Filter-Parameter)
+# "host": BNO055 im AMG-Modus, Rohdaten per Burst-Read und Madgwick-Filter auf dem Host
+#         (hardware/fusion.py, benoetigt numpy). Rohdaten lassen sich mit
+#         main.py --record-raw aufzeichnen und offline neu fusionieren.
+FUSION_MODE = "onboard"
+FUSION_BETA = 0.1       # Madgwick-Gain (hoeher = schnellere Drift-Korrektur, mehr Rauschen)
+FUSION_GAINS = {}       # Gain pro Sensor, z.B. {"arm": 0.05}
+FUSION_USE_MAG = True   # False: nur Gyro + Beschleunigung (Blickrichtung driftet)
+
+# --- BNO055 BETRIEBSMODUS / MONTAGE (hardware/bno055_config.py) ---
+# Wird beim Init auf jeden Sensor geschrieben. Modi: "ndof", "ndof_fmc_off", "imuplus"
+# (ohne Magnetometer, stoerungsfrei neben Motoren/Metall), "m4g" (50 Hz), "compass" (20 Hz).
+# Mit FUSION_MODE = "host" laufen alle Sensoren im Modus "amg".
+BNO055_MODE = "ndof"
+# Pro Sensor: "mode", "mount" und "units", z.B.
+#   {"arm": {"mode": "imuplus", "mount": "-y,x,z", "units": {"gyro": "rps"}}}
+# mount = Lage des Segments im Sensor: Achsen ("-y,x,z": Segment-X = Sensor -Y, ...) oder
+# Quaternion (w, x, y, z). Passt sie auf einen der 24 Chip-Remaps (AXIS_MAP_CONFIG/SIGN),
+# dreht der Sensor selbst, sonst korrigiert der Host jeden Frame.
+# units: acc "m/s2"|"mg", gyro "dps"|"rps", euler "deg"|"rad", temp "c"|"f", orientation "windows"|"android"
+BNO055_SETUP = {}
+
+# --- BACKENDS (backends.py) ---
+# Werden erst beim ersten Zugriff geladen; fehlt ein Backend, startet der SensorManager im Dummy-Modus.
+HARDWARE_BACKEND = "blinka"   # Blinka (board/busio) + Adafruit BNO055/TCA9548A Treiber
+                              # "i2cdev": /dev/i2c-{I2C_BUS} direkt (hardware/i2cdev.py), sonst Blinka
+# i2cdev: Kanaele mit unterschiedlichen Sensor-Adressen gemeinsam schalten (eine Kanalwahl fuer
+# mehrere Sensoren). Alle Geraete an diesen Kanaelen muessen in SENSOR_MAPPING stehen.
+I2C_DEV_GROUP_CHANNELS = False
+I2C_DEV_MAX_READS = None      # Lese-Nachrichten pro ioctl; None = automatisch (bcm2835: 1)
+GRAPHICS_BACKEND = "opengl"   # pygame + PyOpenGL
+
+# --- AUFZEICHNUNG (main.py --record) ---
+# Spaltenweise Aufzeichnung (recording/session.py, benoetigt numpy)
+RECORD_CHUNK_FRAMES = 6000   # Frames pro Chunk-Datei (60 s bei 100 Hz)
+RECORD_KEYFRAME_FRAMES = 500 # Filter-Zustand alle x Frames sichern (Replay-Sprung max. 5 s neu filtern)
+POSE_EVENT_MERGE_GAP = 0.2   # Gleiche Pose nach kuerzerer Unterbrechung (s) = ein Ereignis (Posen-Index)
+# Gelenkwinkel: Name -> (Eltern-Segment, Kind-Segment); None = Nullpunkt (Arm haengt)
+JOINTS = {
+    "shoulder": (None, "base"),
+    "elbow": ("base", "arm"),
+}
+# Bewegungsumfang (rom_stats.py): Genauigkeit der Perzentile (t-Digest, ~Zentroide pro Kanal)
+ROM_COMPRESSION = 100
+ROM_PERCENTILES = (5, 25, 50, 75, 95)
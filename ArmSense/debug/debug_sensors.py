@@ -1,126 +1,244 @@
 import sys
 import os
 import time
-from collections import deque
+import argparse
+import threading
+import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 
 # Pfad erweitern
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import SHM_NAME, ACQ_RATE
 from hardware.sensor_manager import SensorManager
+from transport.shm_ring import SharedFrameReader
 from utils import q_to_euler
 
 # Configuration
-HISTORY_LEN = 100  # How many data points to show on screen
-INTERVAL = 100     # Update interval in milliseconds
+HISTORY_SEC = 300      # Seconds of history kept (and shown) per channel
+DRAW_INTERVAL = 30     # Redraw interval in milliseconds (drawing is decoupled from sampling)
+Y_LIMIT = 180.0        # Initial fixed y-range in degrees (+/-)
+AXIS_ADAPT_SEC = 2.0   # How often the y-range may grow/shrink
+
+CHANNELS = ["Heading", "Roll", "Pitch"]
+COLORS = ["red", "green", "blue"]
+SEGMENTS = [("base", "BASE (Oberarm)"), ("arm", "ARM (Unterarm)")]
+
+
+class SampleRing:
+    """
+    Fixed-size NumPy ring buffer: one timestamp column plus one column per channel.
+    Written by the acquisition thread, read (copied) by the GUI thread.
+    """
+
+    def __init__(self, capacity, n_channels):
+        self.capacity = capacity
+        self.t = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((capacity, n_channels), dtype=np.float32)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def append(self, t, row):
+        with self._lock:
+            i = self.count % self.capacity
+            self.t[i] = t
+            self.values[i] = row
+            self.count += 1
+
+    def snapshot(self):
+        """Returns (t, values) in chronological order (copies)."""
+        with self._lock:
+            n = min(self.count, self.capacity)
+            start = self.count % self.capacity if self.count > self.capacity else 0
+            idx = (np.arange(n) + start) % self.capacity
+            return self.t[idx], self.values[idx]
+
+
+def minmax_decimate(x, y, n_buckets):
+    """
+    Reduces (x, y) to at most 2 * n_buckets points while keeping the envelope:
+    each bucket contributes its minimum and its maximum, so spikes stay visible.
+    y is 2D (samples x channels); x is 1D.
+    """
+    n = len(x)
+    if n <= 2 * n_buckets:
+        return x, y
+    per = n // n_buckets
+    offset = n - per * n_buckets  # drop the oldest samples so the newest edge stays exact
+
+    xb = x[offset:].reshape(n_buckets, per)
+    yb = y[offset:].reshape(n_buckets, per, -1)
+    x_out = np.repeat(xb[:, [0, -1]].mean(axis=1), 2)
+    y_out = np.empty((2 * n_buckets, yb.shape[2]), dtype=y.dtype)
+    y_out[0::2] = yb.min(axis=1)
+    y_out[1::2] = yb.max(axis=1)
+    return x_out, y_out
+
+
+class Acquisition(threading.Thread):
+    """Pulls frames at the real sample rate and writes Euler angles into the ring."""
+
+    def __init__(self, sensors, ring, rate):
+        super().__init__(daemon=True)
+        self.sensors = sensors
+        self.ring = ring
+        self.period = 1.0 / rate
+        self.running = True
+
+    def _append(self, t, data):
+        row = []
+        for name, _ in SEGMENTS:
+            row.extend(q_to_euler(data.get(name, (1, 0, 0, 0))))
+        self.ring.append(t, row)
+
+    def run(self):
+        if isinstance(self.sensors, SharedFrameReader):
+            self._run_shm()
+        else:
+            self._run_polling()
+
+    def _run_shm(self):
+        # Every frame the daemon published, with its own timestamp (no polling aliasing)
+        reader = self.sensors
+        last_seq = reader.write_seq
+        while self.running:
+            for seq, t, values in reader.read_since(last_seq):
+                self._append(t, reader.to_dict(values))
+                last_seq = seq
+            time.sleep(self.period / 2)
+
+    def _run_polling(self):
+        next_tick = time.perf_counter()
+        while self.running:
+            self._append(time.time(), self.sensors.get_data())
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+
+class LivePlot:
+    """Blitted plot: the background is cached, only the lines and the status text are redrawn."""
+
+    def __init__(self, ring, history_sec):
+        self.ring = ring
+
+        self.fig, self.axes = plt.subplots(2, 1, sharex=True, figsize=(10, 8))
+        self.fig.suptitle('Real-Time IMU Data (Base vs. Arm)')
+
+        self.lines = []
+        for ax, (_, title) in zip(self.axes, SEGMENTS):
+            ax.set_title(title)
+            ax.set_ylabel("Angle (Degrees)")
+            for label, color in zip(CHANNELS, COLORS):
+                line, = ax.plot([], [], label=label, color=color, lw=1, animated=True)
+                self.lines.append(line)
+            ax.set_xlim(-history_sec, 0)
+            ax.set_ylim(-Y_LIMIT, Y_LIMIT)
+            ax.legend(loc='upper right')
+            ax.grid(True)
+        self.axes[-1].set_xlabel("Time (s, 0 = now)")
+        self.status = self.axes[0].text(0.01, 0.95, "", transform=self.axes[0].transAxes,
+                                        va="top", animated=True)
+
+        self.background = None
+        self.last_adapt = time.time()
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+        self.timer = self.fig.canvas.new_timer(interval=DRAW_INTERVAL)
+        self.timer.add_callback(self._update)
+
+    def _on_draw(self, event):
+        # Full redraw happened (start, resize, axis change) -> re-cache the static background
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for line in self.lines:
+            line.axes.draw_artist(line)
+        self.status.axes.draw_artist(self.status)
+
+    def _adapt_axes(self, values):
+        """Slowly adapts the y-range (at most every AXIS_ADAPT_SEC). Returns True if it changed."""
+        now = time.time()
+        if now - self.last_adapt < AXIS_ADAPT_SEC:
+            return False
+        self.last_adapt = now
+        changed = False
+        for k, ax in enumerate(self.axes):
+            seg = values[:, 3 * k:3 * k + 3]
+            lo, hi = float(seg.min()), float(seg.max())
+            margin = max(5.0, 0.1 * (hi - lo))
+            cur_lo, cur_hi = ax.get_ylim()
+            # Grow as soon as data leaves the range, shrink only if it is far too wide
+            if lo < cur_lo or hi > cur_hi or (hi - lo + 2 * margin) < 0.25 * (cur_hi - cur_lo):
+                ax.set_ylim(lo - margin, hi + margin)
+                changed = True
+        return changed
+
+    def _update(self):
+        t, values = self.ring.snapshot()
+        if len(t) == 0 or self.background is None:
+            return
+
+        if self._adapt_axes(values):
+            self.fig.canvas.draw_idle()  # _on_draw re-caches the background
+            return
+
+        width_px = int(self.axes[0].bbox.width)
+        x, y = minmax_decimate(t - t[-1], values, max(width_px, 100))
+        for i, line in enumerate(self.lines):
+            line.set_data(x, y[:, i])
+
+        span = t[-1] - t[0]
+        rate = (len(t) - 1) / span if span > 0 else 0.0
+        self.status.set_text(f"{rate:5.1f} Hz | {len(t)} samples | {len(x)} drawn")
+
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        self._draw_artists()
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def show(self):
+        self.timer.start()
+        plt.show()
+
 
 def main():
+    parser = argparse.ArgumentParser(description="IMU Live Graph")
+    parser.add_argument("--shm", action="store_true",
+                        help="Read frames from the running daemon (main.py --daemon)")
+    parser.add_argument("--rate", type=float, default=ACQ_RATE,
+                        help="Sample rate in Hz when polling the SensorManager directly")
+    parser.add_argument("--history", type=float, default=HISTORY_SEC,
+                        help="Seconds of history to keep and display")
+    args = parser.parse_args()
+
     print("--- IMU Live Graph ---")
-    print("Initializing SensorManager...")
-    
-    # Initialize your hardware
+
+    # Initialize your hardware (or attach to the acquisition daemon)
     try:
-        sensors = SensorManager()
+        if args.shm:
+            print(f"Attaching to daemon ('{SHM_NAME}')...")
+            sensors = SharedFrameReader(SHM_NAME)
+        else:
+            print("Initializing SensorManager...")
+            sensors = SensorManager()
     except Exception as e:
         print(f"Error initializing hardware: {e}")
         return
 
-    # --- Data Storage ---
-    # We use deques (double-ended queues) with a fixed length 
-    # to automatically discard old data.
-    x_data = deque(maxlen=HISTORY_LEN)
-    
-    # Base Data Containers
-    base_h = deque(maxlen=HISTORY_LEN)
-    base_r = deque(maxlen=HISTORY_LEN)
-    base_p = deque(maxlen=HISTORY_LEN)
-    
-    # Arm Data Containers
-    arm_h = deque(maxlen=HISTORY_LEN)
-    arm_r = deque(maxlen=HISTORY_LEN)
-    arm_p = deque(maxlen=HISTORY_LEN)
-
-    # Pre-fill x_data simply as a counter 0..N
-    # (or you can use time.time() if you want absolute timestamps)
-    for i in range(HISTORY_LEN):
-        x_data.append(i)
-        base_h.append(0); base_r.append(0); base_p.append(0)
-        arm_h.append(0);  arm_r.append(0);  arm_p.append(0)
-
-    # --- Plot Setup ---
-    # Create a figure with 2 subplots vertically
-    fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(10, 8))
-    fig.suptitle('Real-Time IMU Data (Base vs. Arm)')
-
-    # Setup Subplot 1: BASE
-    ax1.set_title("BASE (Oberarm)")
-    ax1.set_ylabel("Angle (Degrees)")
-    line_bh, = ax1.plot(x_data, base_h, label='Heading', color='red')
-    line_br, = ax1.plot(x_data, base_r, label='Roll',    color='green')
-    line_bp, = ax1.plot(x_data, base_p, label='Pitch',   color='blue')
-    ax1.legend(loc='upper right')
-    ax1.grid(True)
-
-    # Setup Subplot 2: ARM
-    ax2.set_title("ARM (Unterarm)")
-    ax2.set_xlabel("Samples")
-    ax2.set_ylabel("Angle (Degrees)")
-    line_ah, = ax2.plot(x_data, arm_h, label='Heading', color='red')
-    line_ar, = ax2.plot(x_data, arm_r, label='Roll',    color='green')
-    line_ap, = ax2.plot(x_data, arm_p, label='Pitch',   color='blue')
-    ax2.legend(loc='upper right')
-    ax2.grid(True)
-
-    # --- Update Function ---
-    def update(frame):
-        # 1. Fetch data from hardware
-        data = sensors.get_data()
-        
-        # Extract Quaternions (Default to Identity)
-        q_b = data.get("base", (1, 0, 0, 0))
-        q_a = data.get("arm",  (1, 0, 0, 0))
-
-        # Convert to Euler
-        b_h_val, b_r_val, b_p_val = q_to_euler(q_b)
-        a_h_val, a_r_val, a_p_val = q_to_euler(q_a)
-
-        # 2. Update Data Containers
-        # (x_data stays fixed as 0..100, we just shift y-values if using simple scrolling)
-        # However, a cleaner way for 'rolling' graphs is just appending new data 
-        # and matplotlib handles the plotting of the deque.
-        
-        base_h.append(b_h_val)
-        base_r.append(b_r_val)
-        base_p.append(b_p_val)
-        
-        arm_h.append(a_h_val)
-        arm_r.append(a_r_val)
-        arm_p.append(a_p_val)
-
-        # 3. Update Lines on the Plot
-        line_bh.set_ydata(base_h)
-        line_br.set_ydata(base_r)
-        line_bp.set_ydata(base_p)
-        
-        line_ah.set_ydata(arm_h)
-        line_ar.set_ydata(arm_r)
-        line_ap.set_ydata(arm_p)
-
-        # 4. Rescale Y-Axis dynamically
-        # This ensures if angles wrap or jump, the graph adapts
-        ax1.relim()
-        ax1.autoscale_view()
-        ax2.relim()
-        ax2.autoscale_view()
-
-        return line_bh, line_br, line_bp, line_ah, line_ar, line_ap
-
-    # --- Start Animation ---
+    # Ring sized for the full history at the (daemon or polling) rate
+    ring = SampleRing(int(args.history * max(args.rate, ACQ_RATE)), 3 * len(SEGMENTS))
+    acquisition = Acquisition(sensors, ring, args.rate)
+    acquisition.start()
+
+    plot = LivePlot(ring, args.history)
     print("Graph started. Close the window to stop.")
-    ani = animation.FuncAnimation(fig, update, interval=INTERVAL, blit=False)
-    
-    plt.show()
+    plot.show()
+    acquisition.running = False
 
 if __name__ == "__main__":
     main()
@@ -2,19 +2,31 @@
 import time
 import sys
 import os
+import argparse
 
 # Pfad erweitern, damit wir Module vom Parent importieren koennen
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import SHM_NAME
 from hardware.sensor_manager import SensorManager
+from transport.shm_ring import SharedFrameReader
 from utils import q_to_euler
 
 def main():
+    parser = argparse.ArgumentParser(description="IMU Debug Monitor")
+    parser.add_argument("--shm", action="store_true",
+                        help="Frames vom laufenden Daemon (main.py --daemon) lesen")
+    args = parser.parse_args()
+
     print("--- IMU Debug Monitor (Quaternion Mode) ---")
-    print("Initialisiere SensorManager...")
-    
-    # Nutzt deine existierende Logik (inkl. Multiplexer & Config)
-    sensors = SensorManager()
+
+    if args.shm:
+        print(f"Verbinde mit Daemon ('{SHM_NAME}')...")
+        sensors = SharedFrameReader(SHM_NAME)
+    else:
+        print("Initialisiere SensorManager...")
+        # Nutzt deine existierende Logik (inkl. Multiplexer & Config)
+        sensors = SensorManager()
     
     print("\nMessung läuft. Drücke STRG+C zum Beenden.\n")
     print(f"{'BASE (Heading, Roll, Pitch)':^35} | {'ARM (Heading, Roll, Pitch)':^35}")
@@ -0,0 +1,109 @@
+# frame.py
+"""
+Kompakter Frame fuer get_data(): alle Quaternionen in einem array('d'), Flags pro Sensor
+in einem bytearray, Sensor-Indizes einmal pro Layout aufgeloest.
+
+Ein SensorFrame ist ein Mapping (name -> (w, x, y, z)); bestehender Code mit
+data["arm"] / data.get(...) / data.items() laeuft unveraendert. Heisse Pfade lesen
+per Index (frame.q(i), frame.values) ohne String-Lookup und ohne Tuple pro Sensor.
+"""
+import sys
+import os
+from array import array
+from collections.abc import Mapping
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config import SENSOR_MAPPING
+
+# Flags pro Sensor
+FRESH = 0x01   # Frisch gelesener Wert in diesem Frame
+HELD = 0x02    # Kein frischer Wert: letzter gueltiger Wert weitergegeben
+ERROR = 0x04   # Ausnahme im Filter: letzter gueltiger Wert weitergegeben
+
+
+class FrameLayout:
+    """Reihenfolge der Sensoren und Vorlagen fuer neue Frames (einmal pro Sensor-Satz)."""
+    __slots__ = ("names", "index", "_values", "_flags")
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self._values = array("d", (1.0, 0.0, 0.0, 0.0) * len(self.names))
+        self._flags = bytes(len(self.names))
+
+
+_layouts = {}
+
+
+def layout_for(names):
+    names = tuple(names)
+    layout = _layouts.get(names)
+    if layout is None:
+        layout = _layouts[names] = FrameLayout(names)
+    return layout
+
+
+DEFAULT_LAYOUT = layout_for(SENSOR_MAPPING)
+
+
+class SensorFrame(Mapping):
+    """Quaternionen aller Sensoren eines Frames; fehlende Werte sind (1, 0, 0, 0)."""
+    __slots__ = ("layout", "values", "flags", "timestamp")
+
+    def __init__(self, layout=DEFAULT_LAYOUT, timestamp=None):
+        self.layout = layout
+        self.values = layout._values[:]   # Kopie der Vorlage (ein memcpy)
+        self.flags = bytearray(layout._flags)
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_mapping(cls, data, layout=DEFAULT_LAYOUT, timestamp=None, flags=FRESH):
+        frame = cls(layout, timestamp)
+        for i, name in enumerate(layout.names):
+            q = data.get(name)
+            if q is not None:
+                frame.set(i, q, flags)
+        return frame
+
+    def set(self, i, q, flags=FRESH):
+        j = 4 * i
+        v = self.values
+        v[j], v[j + 1], v[j + 2], v[j + 3] = q
+        self.flags[i] = flags
+
+    def q(self, i):
+        """Quaternion des Sensors mit Index i (ohne Namens-Lookup)."""
+        j = 4 * i
+        v = self.values
+        return (v[j], v[j + 1], v[j + 2], v[j + 3])
+
+    # --- Mapping ---
+    def __getitem__(self, name):
+        return self.q(self.layout.index[name])
+
+    def __contains__(self, name):
+        return name in self.layout.index
+
+    def __iter__(self):
+        return iter(self.layout.names)
+
+    def __len__(self):
+        return len(self.layout.names)
+
+    def to_dict(self):
+        return {name: self.q(i) for i, name in enumerate(self.layout.names)}
+
+    def __repr__(self):
+        return f"SensorFrame({self.to_dict()!r}, timestamp={self.timestamp!r})"
+
+    def __reduce__(self):
+        # Fuer multiprocessing/pickle: Layout ueber die Namen neu aufloesen
+        return _rebuild, (self.layout.names, self.values.tobytes(), bytes(self.flags), self.timestamp)
+
+
+def _rebuild(names, values, flags, timestamp):
+    frame = SensorFrame(layout_for(names), timestamp)
+    frame.values = array("d")
+    frame.values.frombytes(values)
+    frame.flags = bytearray(flags)
+    return frame
@@ -1,2 +1,8 @@
 # hardware/__init__.py
-from .sensor_manager import SensorManager
\ No newline at end of file
+# Lazy: "import hardware.bus_tuner" (Tests, Tools) laedt den SensorManager und seine Backends nicht mit
+
+def __getattr__(name):
+    if name == "SensorManager":
+        from .sensor_manager import SensorManager
+        return SensorManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
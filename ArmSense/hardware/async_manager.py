@@ -0,0 +1,189 @@
+# hardware/async_manager.py
+import sys
+import os
+import time
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import ACQ_RATE
+
+# Backpressure-Strategien fuer langsame Konsumenten
+POLICY_LATEST = "latest"            # Nur der neueste Frame zaehlt (Visualisierung)
+POLICY_BOUNDED = "bounded"          # Warteschlange voll -> Akquisition wartet (Logging, nichts geht verloren)
+POLICY_DROP_OLDEST = "drop_oldest"  # Warteschlange voll -> aeltester Frame fliegt raus
+
+_CLOSED = object()
+
+
+class _Subscription:
+    """Puffer eines einzelnen frames()-Konsumenten."""
+
+    def __init__(self, policy, maxsize):
+        if policy not in (POLICY_LATEST, POLICY_BOUNDED, POLICY_DROP_OLDEST):
+            raise ValueError(f"Unbekannte Backpressure-Strategie: {policy}")
+        self.policy = policy
+        self.dropped = 0
+        if policy == POLICY_BOUNDED:
+            self.queue = asyncio.Queue(maxsize)
+        else:
+            self.buffer = collections.deque(maxlen=1 if policy == POLICY_LATEST else maxsize)
+            self.ready = asyncio.Event()
+
+    async def put(self, frame):
+        if self.policy == POLICY_BOUNDED:
+            await self.queue.put(frame)
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(frame)
+        self.ready.set()
+
+    def close(self):
+        if self.policy == POLICY_BOUNDED:
+            # Ende-Marker darf nicht blockieren: notfalls aeltesten Frame verwerfen
+            if self.queue.full():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(_CLOSED)
+        else:
+            self.buffer.append(_CLOSED)
+            self.ready.set()
+
+    def detach(self):
+        """Konsument ist weg: Puffer leeren, damit ein wartender Producer nicht haengen bleibt."""
+        if self.policy == POLICY_BOUNDED:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+    async def get(self):
+        if self.policy == POLICY_BOUNDED:
+            return await self.queue.get()
+        while not self.buffer:
+            self.ready.clear()
+            await self.ready.wait()
+        return self.buffer.popleft()
+
+
+class AsyncSensorManager:
+    """
+    asyncio-Schnittstelle fuer SensorManager (oder jede Quelle mit get_data(), z.B. SharedFrameReader).
+
+        async with AsyncSensorManager(SensorManager()) as manager:
+            async for frame in manager.frames():
+                ...
+
+    Die blockierenden I2C-Zugriffe laufen in einem einzelnen Worker-Thread (der Bus
+    wird nie parallel benutzt). Ein Producer-Task liest mit `rate` Hz und verteilt
+    jeden Frame an alle laufenden frames()-Iteratoren.
+    """
+
+    def __init__(self, manager, rate=ACQ_RATE, policy=POLICY_LATEST, maxsize=64):
+        self.manager = manager
+        self.period = 1.0 / rate
+        self.policy = policy
+        self.maxsize = maxsize
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ArmSense-I2C")
+        self._subscribers = set()
+        self._producer = None
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _call(self, func, *args):
+        """Fuehrt einen blockierenden Aufruf im I2C-Worker aus."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def get_data(self):
+        return await self._call(self.manager.get_data)
+
+    async def _produce(self):
+        next_tick = time.perf_counter()
+        try:
+            while True:
+                data = await self.get_data()
+                for sub in list(self._subscribers):
+                    await sub.put(data)
+
+                next_tick += self.period
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()
+                    await asyncio.sleep(0)  # Andere Tasks nicht aushungern
+        except Exception as e:
+            print(f"[HAL] Akquisition abgebrochen: {e}")
+            for sub in list(self._subscribers):
+                sub.close()
+
+    async def frames(self, policy=None, maxsize=None):
+        """
+        Async-Iterator ueber Frames im get_data()-Format.
+        policy/maxsize ueberschreiben die Voreinstellung fuer diesen Konsumenten.
+        """
+        if self._closed:
+            return
+        sub = _Subscription(policy or self.policy, maxsize or self.maxsize)
+        self._subscribers.add(sub)
+        if self._producer is None or self._producer.done():
+            self._producer = asyncio.create_task(self._produce())
+        try:
+            while True:
+                frame = await sub.get()
+                if frame is _CLOSED:
+                    return
+                yield frame
+        finally:
+            self._subscribers.discard(sub)
+            sub.detach()
+            if not self._subscribers and self._producer is not None:
+                # Letzter Konsument weg -> Bus nicht weiter pollen
+                self._producer.cancel()
+
+    async def _calibrate(self, start, samples, timeout):
+        if await self._call(start, *([samples] if samples else [])) is False:
+            return False  # Abgelehnt: eine andere Kalibrierung laeuft noch
+        status = getattr(self.manager, "calibration_status", None)
+        if status is None:
+            return True  # Quelle ohne lokale Kalibrierung (z.B. Kommando an den Daemon)
+        # Die Samples kommen aus dem normalen Frame-Strom -> nur warten
+        deadline = time.perf_counter() + timeout
+        while status() is not None:
+            if self._producer is None or self._producer.done():
+                await self.get_data()  # Niemand liest gerade Frames -> selbst fuettern
+            else:
+                await asyncio.sleep(self.period)
+            if time.perf_counter() > deadline:
+                raise asyncio.TimeoutError("Kalibrierung nicht abgeschlossen")
+        return True
+
+    async def calibrate_zero(self, samples=None, timeout=10.0):
+        """Null-Kalibrierung; True, sobald der Nullpunkt gesetzt ist, False, wenn sie abgelehnt wurde."""
+        return await self._calibrate(self.manager.calibrate_zero, samples, timeout)
+
+    async def calibrate_forward(self, samples=None, timeout=10.0):
+        """Vorwaerts-Kalibrierung; True, sobald die Ausrichtung gesetzt ist, False, wenn sie abgelehnt wurde."""
+        return await self._calibrate(self.manager.calibrate_forward, samples, timeout)
+
+    def dropped(self):
+        """Anzahl verworfener Frames aller aktiven Konsumenten."""
+        return sum(sub.dropped for sub in self._subscribers)
+
+    async def close(self):
+        """Stoppt die Akquisition und beendet alle frames()-Iteratoren."""
+        self._closed = True
+        if self._producer is not None:
+            self._producer.cancel()
+            try:
+                await self._producer
+            except asyncio.CancelledError:
+                pass
+        for sub in list(self._subscribers):
+            sub.close()
+        self._executor.shutdown(wait=True)
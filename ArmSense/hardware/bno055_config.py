@@ -0,0 +1,204 @@
+# hardware/bno055_config.py
+"""
+Betriebsmodus, Achsen-Remap und Einheiten der BNO055 (BNO055_MODE / BNO055_SETUP in config.py).
+
+Die Montage eines Sensors ("mount") ist die Lage des Segments im Sensor-Koordinatensystem,
+als Achsen ("-y,x,z": Segment-X = Sensor -Y, ...) oder als Quaternion (w, x, y, z).
+Entspricht sie einer der 24 Drehungen, die der Chip per AXIS_MAP_CONFIG/AXIS_MAP_SIGN
+abbilden kann, wird sie beim Init auf den Sensor geschrieben und kostet pro Frame nichts.
+Sonst rechnet der SensorManager q_segment = q_sensor * mount auf dem Host.
+"""
+import sys
+import os
+import time
+import itertools
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import q_rotate_vec, q_normalize, q_angle_between
+
+# --- BNO055 Register (Datenblatt, Kap. 3.3-3.6, 4.3) ---
+REG_PAGE_ID = 0x07
+REG_UNIT_SEL = 0x3B
+REG_OPR_MODE = 0x3D
+REG_AXIS_MAP_CONFIG = 0x41
+REG_AXIS_MAP_SIGN = 0x42
+AXIS_MAP_DEFAULT = (0x24, 0x00)  # X=X, Y=Y, Z=Z, alle positiv
+
+MODE_CONFIG = 0x00
+MODES = {
+    "amg": 0x07,           # Nur Rohdaten (Host-Fusion)
+    "imuplus": 0x08,       # Beschleunigung + Gyro, ohne Magnetometer (relative Blickrichtung)
+    "compass": 0x09,
+    "m4g": 0x0A,           # Magnetometer statt Gyro
+    "ndof_fmc_off": 0x0B,  # NDOF ohne schnelle Magnetometer-Kalibrierung
+    "ndof": 0x0C,
+}
+# Ausgaberate der Onboard-Fusion in Hz (Datenblatt Tab. 3-14); AMG: Rate legt der Host fest
+FUSION_RATE = {"amg": None, "imuplus": 100.0, "compass": 20.0, "m4g": 50.0, "ndof_fmc_off": 100.0, "ndof": 100.0}
+
+# UNIT_SEL-Bits pro Groesse (Default = 0). Die Quaternion ist einheitenlos.
+UNITS = {
+    "acc": {"m/s2": 0x00, "mg": 0x01},
+    "gyro": {"dps": 0x00, "rps": 0x02},
+    "euler": {"deg": 0x00, "rad": 0x04},
+    "temp": {"c": 0x00, "f": 0x10},
+    "orientation": {"windows": 0x00, "android": 0x80},
+}
+
+_AXES = "xyz"
+_BASIS = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+
+
+def _to_quaternion(m):
+    """Rotationsmatrix (Zeilen) -> Quaternion (w, x, y, z)."""
+    trace = m[0][0] + m[1][1] + m[2][2]
+    if trace > 0:
+        s = 2.0 * (trace + 1.0) ** 0.5
+        q = (0.25 * s, (m[2][1] - m[1][2]) / s, (m[0][2] - m[2][0]) / s, (m[1][0] - m[0][1]) / s)
+    else:
+        i = max(range(3), key=lambda k: m[k][k])
+        j, k = (i + 1) % 3, (i + 2) % 3
+        s = 2.0 * (1.0 + m[i][i] - m[j][j] - m[k][k]) ** 0.5
+        v = [0.0, 0.0, 0.0]
+        v[i] = 0.25 * s
+        v[j] = (m[j][i] + m[i][j]) / s
+        v[k] = (m[k][i] + m[i][k]) / s
+        q = ((m[k][j] - m[j][k]) / s,) + tuple(v)
+    return q if q[0] >= 0 else tuple(-c for c in q)
+
+
+def _remap_quaternion(axes):
+    """
+    axes: ((quelle, vorzeichen), ...) fuer Segment-X/Y/Z. Remap-Matrix M (v_segment = M v_sensor)
+    -> Montage-Quaternion m mit R(m) = M^T.
+    """
+    rows = [[sign if j == source else 0 for j in range(3)] for source, sign in axes]
+    return _to_quaternion([[rows[j][i] for j in range(3)] for i in range(3)])
+
+
+def _registers(axes):
+    config = axes[0][0] | axes[1][0] << 2 | axes[2][0] << 4
+    sign = (axes[0][1] < 0) << 2 | (axes[1][1] < 0) << 1 | (axes[2][1] < 0)
+    return config, sign
+
+
+def _is_rotation(axes):
+    """Rechtshaendig? (Spiegelungen liefert der Chip zwar, die Fusion ist dann unbrauchbar)."""
+    sources = [source for source, _ in axes]
+    inversions = sum(1 for a, b in itertools.combinations(sources, 2) if a > b)
+    det = (-1) ** inversions
+    for _, sign in axes:
+        det *= sign
+    return det > 0
+
+
+# Alle 24 Remaps des Chips: Register -> Montage-Quaternion
+CHIP_REMAPS = {}
+for _perm in itertools.permutations(range(3)):
+    for _signs in itertools.product((1, -1), repeat=3):
+        _axes = tuple(zip(_perm, _signs))
+        if _is_rotation(_axes):
+            CHIP_REMAPS[_registers(_axes)] = _remap_quaternion(_axes)
+
+
+def parse_axes(text):
+    """'-y,x,z' -> ((quelle, vorzeichen), ...); ValueError bei ungueltiger oder gespiegelter Angabe."""
+    parts = [p.strip().lower() for p in text.split(",")]
+    axes = []
+    for part in parts:
+        sign = -1 if part.startswith("-") else 1
+        name = part.lstrip("+-")
+        if name not in _AXES:
+            raise ValueError(f"Unbekannte Achse '{part}' in mount='{text}'")
+        axes.append((_AXES.index(name), sign))
+    if len(axes) != 3 or len({source for source, _ in axes}) != 3:
+        raise ValueError(f"mount='{text}' muss jede Achse genau einmal enthalten")
+    if not _is_rotation(axes):
+        raise ValueError(f"mount='{text}' ist eine Spiegelung, keine Drehung")
+    return tuple(axes)
+
+
+def match_remap(q, tolerance=1.0):
+    """Chip-Remap (config, sign) fuer eine Montage-Quaternion, wenn eine bis auf tolerance Grad passt."""
+    best = min(CHIP_REMAPS.items(), key=lambda item: q_angle_between(q, item[1]))
+    return best[0] if q_angle_between(q, best[1]) <= tolerance else None
+
+
+def rotation_matrix(q):
+    """Zeilen der Rotationsmatrix R(q) (fuer Tests/Debugging)."""
+    columns = [q_rotate_vec(q, e) for e in _BASIS]
+    return [[columns[j][i] for j in range(3)] for i in range(3)]
+
+
+class SensorSetup:
+    """Aufgeloeste Einstellungen eines Sensors: was auf den Chip geschrieben und was auf dem Host gerechnet wird."""
+    __slots__ = ("mode", "axis_map", "unit_sel", "host_mount")
+
+    def __init__(self, mode="ndof", axis_map=AXIS_MAP_DEFAULT, unit_sel=0, host_mount=None):
+        self.mode = mode
+        self.axis_map = axis_map      # (AXIS_MAP_CONFIG, AXIS_MAP_SIGN)
+        self.unit_sel = unit_sel
+        self.host_mount = host_mount  # Montage-Quaternion fuer den Host, None = nichts zu tun
+
+    @property
+    def fusion_rate(self):
+        return FUSION_RATE[self.mode]
+
+    def registers(self):
+        """(Register, Wert) die im CONFIG-Modus geschrieben werden."""
+        return [(REG_PAGE_ID, 0), (REG_AXIS_MAP_CONFIG, self.axis_map[0]),
+                (REG_AXIS_MAP_SIGN, self.axis_map[1]), (REG_UNIT_SEL, self.unit_sel)]
+
+
+def resolve(spec, host_fusion=False, default_mode="ndof"):
+    """
+    Eintrag aus BNO055_SETUP ({"mode", "mount", "units"}) -> SensorSetup.
+    Mit Host-Fusion laeuft der Sensor immer im AMG-Modus.
+    """
+    spec = dict(spec or {})
+    unknown = set(spec) - {"mode", "mount", "units"}
+    if unknown:
+        raise ValueError(f"Unbekannte Einstellungen: {', '.join(sorted(unknown))}")
+
+    mode = spec.get("mode", default_mode)
+    if mode not in MODES:
+        raise ValueError(f"Unbekannter Modus '{mode}' (erlaubt: {', '.join(MODES)})")
+    if host_fusion and mode != "amg":
+        if "mode" in spec:
+            print(f"[HAL] FUSION_MODE = 'host': Modus '{mode}' wird durch 'amg' ersetzt")
+        mode = "amg"
+
+    unit_sel = 0
+    for quantity, unit in spec.get("units", {}).items():
+        if quantity not in UNITS or unit not in UNITS[quantity]:
+            raise ValueError(f"Unbekannte Einheit {quantity}='{unit}'")
+        unit_sel |= UNITS[quantity][unit]
+
+    mount = spec.get("mount")
+    axis_map, host_mount = AXIS_MAP_DEFAULT, None
+    if isinstance(mount, str):
+        axis_map = _registers(parse_axes(mount))
+    elif mount is not None:
+        mount = q_normalize(tuple(float(c) for c in mount))
+        axis_map = match_remap(mount)
+        if axis_map is None:
+            # Keine Chip-Drehung: Korrektur bleibt auf dem Host
+            axis_map, host_mount = AXIS_MAP_DEFAULT, mount
+    return SensorSetup(mode, axis_map, unit_sel, host_mount)
+
+
+def resolve_all(names, setup, host_fusion=False, default_mode="ndof"):
+    return {name: resolve(setup.get(name), host_fusion, default_mode) for name in names}
+
+
+def apply(write, setup, sleep=time.sleep):
+    """
+    Schreibt Modus, Remap und Einheiten ueber write(register, wert).
+    Remap und Einheiten sind nur im CONFIG-Modus schreibbar.
+    """
+    write(REG_OPR_MODE, MODE_CONFIG)
+    sleep(0.02)  # Datenblatt: 19 ms fuer den Wechsel in CONFIG
+    for reg, value in setup.registers():
+        write(reg, value)
+    write(REG_OPR_MODE, MODES[setup.mode])
+    sleep(0.01)  # 7 ms aus CONFIG in einen Fusionsmodus
@@ -0,0 +1,177 @@
+# hardware/bus_tuner.py
+import time
+import math
+from collections import deque
+
+# Maximal erlaubte Abweichung der Quaternion-Norm von 1.
+# Der BNO055 liefert keine Pruefsumme: Kaputte Bytes auf dem Bus zeigen sich
+# als nicht-normierte Quaternionen.
+NORM_TOLERANCE = 0.05
+
+
+def is_glitch(q):
+    """True, wenn ein gelesenes Quaternion offensichtlich korrupt ist."""
+    if not q or q[0] is None:
+        return True
+    try:
+        norm = math.sqrt(sum(v * v for v in q))
+    except TypeError:
+        return True
+    return abs(norm - 1.0) > NORM_TOLERANCE
+
+
+class BusTuner:
+    """
+    Sucht die schnellste I2C-Frequenz innerhalb eines Fehlerbudgets und
+    regelt im Betrieb nach:
+
+    - tune():     testet alle Kandidaten aufsteigend gegen die echten Sensoren
+    - record():   meldet jeden Lesezugriff im Betrieb (ok / Fehler)
+    - maintain(): geht bei zu hoher Fehlerrate eine Stufe zurueck und probiert
+                  periodisch die naechsthoehere Stufe (ueber `samples` normale Frames
+                  verteilt, ohne eigenen Mess-Sweep im Akquisitions-Loop)
+
+    set_frequency(freq) aendert nur den Bus-Takt (Sensoren werden nicht neu initialisiert,
+    Fusion und Kalibrierung bleiben erhalten), read_all() liest jeden Sensor einmal und
+    liefert eine Liste von Quaternionen (oder None / Exception pro Sensor).
+    """
+
+    def __init__(self, set_frequency, read_all, candidates, error_budget=0.01,
+                 samples=20, window=200, retune_interval=300.0):
+        self.set_frequency = set_frequency
+        self.read_all = read_all
+        self.candidates = sorted(candidates)
+        self.error_budget = error_budget
+        self.samples = samples
+        self.retune_interval = retune_interval
+
+        self.frequency = self.candidates[0]
+        self.results = {}   # freq -> gemessene Fehlerrate
+        self._window = deque(maxlen=window)
+        self._last_tune = time.monotonic()
+        self._probe = None          # Frequenz, die gerade im Betrieb getestet wird
+        self._probe_frames = 0
+
+    def measure(self, freq):
+        """Fehlerrate (0..1) bei freq: NAKs/Exceptions und korrupte Quaternionen."""
+        try:
+            self.set_frequency(freq)
+        except Exception as e:
+            print(f"[I2C] {freq / 1000:.0f} kHz: Frequenzwechsel fehlgeschlagen ({e})")
+            return 1.0
+
+        errors, total = 0, 0
+        for _ in range(self.samples):
+            try:
+                values = self.read_all()
+            except Exception:
+                # Ganzer Sweep fehlgeschlagen (z.B. Mux antwortet nicht)
+                values = [None]
+            for q in values:
+                total += 1
+                if isinstance(q, Exception) or is_glitch(q):
+                    errors += 1
+        rate = errors / total if total else 1.0
+        self.results[freq] = rate
+        return rate
+
+    def tune(self, start=None):
+        """
+        Testet die Kandidaten aufsteigend (ab start) und bleibt bei der schnellsten
+        Frequenz im Fehlerbudget. Sobald eine Stufe das Budget reisst, wird abgebrochen
+        (hoehere Frequenzen werden nur schlechter).
+        """
+        best = None
+        for freq in self.candidates:
+            if start is not None and freq < start:
+                continue
+            rate = self.measure(freq)
+            print(f"[I2C] {freq / 1000:.0f} kHz: Fehlerrate {rate * 100:.1f}%")
+            if rate > self.error_budget:
+                break
+            best = freq
+
+        if best is None:
+            best = self.candidates[0]
+            print(f"[I2C] Kein Kandidat im Fehlerbudget, nutze {best / 1000:.0f} kHz")
+        self._switch(best)
+        self._last_tune = time.monotonic()
+        return best
+
+    def _switch(self, freq):
+        self.set_frequency(freq)
+        self.frequency = freq
+        self._window.clear()
+
+    def record(self, ok):
+        self._window.append(0 if ok else 1)
+
+    @property
+    def error_rate(self):
+        return sum(self._window) / len(self._window) if self._window else 0.0
+
+    def maintain(self):
+        """
+        Regelt nach; einmal pro Frame aufrufen. Liefert True, wenn die Frequenz
+        gewechselt wurde. Wirft nie (laeuft in get_data()): Bei einem Fehler bleibt
+        die bisherige Frequenz.
+        """
+        previous = self.frequency
+        try:
+            return self._maintain()
+        except Exception as e:
+            print(f"[I2C] Nachregeln fehlgeschlagen ({e}), bleibe bei {previous / 1000:.0f} kHz")
+            self._last_tune = time.monotonic()
+            self._probe = None
+            try:
+                self._switch(previous)
+            except Exception as e:
+                print(f"[I2C] {previous / 1000:.0f} kHz nicht wiederhergestellt: {e}")
+            return False
+
+    def _maintain(self):
+        if self._probe is not None:
+            return self._finish_probe()
+
+        idx = self.candidates.index(self.frequency)
+
+        # Backoff: Fehlerrate im Fenster ueber Budget -> eine Stufe langsamer
+        if len(self._window) == self._window.maxlen and self.error_rate > self.error_budget:
+            if idx > 0:
+                slower = self.candidates[idx - 1]
+                print(f"[I2C] Fehlerrate {self.error_rate * 100:.1f}% -> zurueck auf {slower / 1000:.0f} kHz")
+                self._switch(slower)
+                self._last_tune = time.monotonic()
+                return True
+            self._window.clear()
+            return False
+
+        # Periodisch die naechsthoehere Stufe testen: Takt umstellen und die
+        # normalen Reads der naechsten `samples` Frames ueber record() auswerten
+        if self.retune_interval and time.monotonic() - self._last_tune > self.retune_interval:
+            self._last_tune = time.monotonic()
+            if idx + 1 < len(self.candidates):
+                faster = self.candidates[idx + 1]
+                self.set_frequency(faster)
+                self._probe = faster
+                self._probe_frames = 0
+                self._window.clear()
+        return False
+
+    def _finish_probe(self):
+        """Wertet den laufenden Test aus, sobald `samples` Frames mit der neuen Frequenz gelesen wurden."""
+        self._probe_frames += 1
+        if self._probe_frames < self.samples:
+            return False
+
+        probe, self._probe = self._probe, None
+        rate = self.error_rate if self._window else 1.0
+        self.results[probe] = rate
+        if rate <= self.error_budget:
+            print(f"[I2C] {probe / 1000:.0f} kHz stabil -> Frequenz erhoeht")
+            self.frequency = probe
+            self._window.clear()
+            return True
+        print(f"[I2C] {probe / 1000:.0f} kHz: Fehlerrate {rate * 100:.1f}% -> bleibe bei {self.frequency / 1000:.0f} kHz")
+        self._switch(self.frequency)
+        return False
@@ -0,0 +1,108 @@
+# hardware/calibration.py
+import sys
+import os
+import math
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import q_normalize, q_angle_between
+
+
+def average_quaternions(quats, iterations=50):
+    """
+    Mittelwert mehrerer Orientierungen nach Markley et al. (2007):
+    Eigenvektor zum groessten Eigenwert von M = Summe(q * q^T).
+    Unabhaengig vom Vorzeichen der Quaternionen (q und -q sind dieselbe Rotation).
+    Der Eigenvektor wird per Potenz-Iteration bestimmt (M ist symmetrisch, positiv semidefinit).
+    """
+    m = [[0.0] * 4 for _ in range(4)]
+    for q in quats:
+        for i in range(4):
+            qi = q[i]
+            row = m[i]
+            for j in range(4):
+                row[j] += qi * q[j]
+
+    # Startwert: erstes Sample (liegt bei ruhigem Arm schon nahe am Ergebnis)
+    v = q_normalize(quats[0])
+    for _ in range(iterations):
+        w = [sum(m[i][j] * v[j] for j in range(4)) for i in range(4)]
+        w = q_normalize(w)
+        if sum((a - b) ** 2 for a, b in zip(w, v)) < 1e-18:
+            v = w
+            break
+        v = w
+
+    # Einheitliche Darstellung mit w >= 0
+    if v[0] < 0:
+        v = tuple(-c for c in v)
+    return tuple(v)
+
+
+def robust_average(quats, max_deviation):
+    """
+    Mittelwert mit Ausreisser-Entfernung. Referenz ist das Medoid (Sample mit der
+    kleinsten Winkelsumme zu allen anderen), damit ein Ausreisser sie nicht verschiebt.
+    Samples weiter als min(max_deviation, Median + 3 * MAD) Grad davon werden verworfen.
+    Rueckgabe: (Mittelwert, Anzahl verwendeter Samples).
+    """
+    dists = [[q_angle_between(a, b) for b in quats] for a in quats]
+    ref = min(range(len(quats)), key=lambda i: sum(dists[i]))
+    angles = dists[ref]
+
+    ordered = sorted(angles)
+    median = ordered[len(ordered) // 2]
+    mad = sorted(abs(a - median) for a in angles)[len(angles) // 2]
+    # 1.4826 * MAD entspricht der Standardabweichung bei normalverteiltem Rauschen
+    limit = min(max_deviation, max(0.5, median + 3.0 * 1.4826 * mad))
+
+    # Das Medoid selbst (Winkel 0) ist immer Inlier -> Liste nie leer
+    inliers = [q for q, a in zip(quats, angles) if a <= limit]
+    return average_quaternions(inliers), len(inliers)
+
+
+class CalibrationJob:
+    """
+    Sammelt ueber mehrere Frames Samples pro Sensor (aus dem normalen Akquisitions-Strom)
+    und berechnet am Ende einen robusten Mittelwert.
+    kind: "zero" (Roh-Quaternionen) oder "forward" (nullpunkt-korrigierte Quaternionen)
+    """
+
+    def __init__(self, kind, names, n_samples, max_deviation):
+        self.kind = kind
+        self.n_samples = n_samples
+        self.max_deviation = max_deviation
+        self.samples = {name: [] for name in names}
+        self.frames = 0
+
+    def add(self, sensor_data):
+        self.frames += 1
+        for name, q in sensor_data.items():
+            buf = self.samples.get(name)
+            if buf is not None and len(buf) < self.n_samples:
+                buf.append(q)
+
+    @property
+    def progress(self):
+        if not self.samples:
+            return 1.0
+        return min(len(buf) for buf in self.samples.values()) / self.n_samples
+
+    @property
+    def done(self):
+        # Abbruch nach 3x so vielen Frames, falls ein Sensor kaum Daten liefert
+        return self.progress >= 1.0 or self.frames >= 3 * self.n_samples
+
+    def result(self):
+        """
+        Robuster Mittelwert pro Sensor: dict name -> (q_mean, verwendete Samples).
+        Sensoren mit zu wenigen Samples oder bei denen weniger als die Haelfte
+        uebrig bleibt (Arm war nicht ruhig), fehlen im Ergebnis.
+        """
+        means = {}
+        for name, buf in self.samples.items():
+            if not buf or len(buf) * 2 < self.n_samples:
+                continue
+            mean, used = robust_average(buf, self.max_deviation)
+            if used * 2 >= len(buf):
+                means[name] = (mean, used)
+        return means
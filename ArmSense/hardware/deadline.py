@@ -0,0 +1,144 @@
+# hardware/deadline.py
+import time
+import threading
+from collections import deque
+
+
+class _Read:
+    """Ein Lesezugriff, den der Bus-Worker ausfuehrt."""
+    __slots__ = ("name", "fn", "done", "value", "error", "cost", "t_end")
+
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.cost = 0.0
+        self.t_end = 0.0    # Ende der Transaktion (perf_counter), im Worker gemessen
+
+
+class DeadlineSweep:
+    """
+    Sweep ueber alle Sensoren mit festem Zeitbudget pro Frame.
+
+    Die Bus-Zugriffe laufen in einem eigenen Worker-Thread; der Sweep wartet hoechstens
+    bis zur Deadline. Ein Read, dessen geschaetzte Dauer nicht mehr ins Budget passt,
+    wird auf den naechsten Sweep verschoben. Ein Read, der die Deadline reisst (z.B.
+    haengende Transaktion bis zum Treiber-Timeout), wird aufgegeben: Der Worker bleibt
+    damit beschaeftigt, folgende Sweeps lesen nichts, bis er wieder frei ist.
+    Verschobene Sensoren kommen im naechsten Sweep zuerst dran, ein aufgegebener zuletzt.
+
+    So dauert ein Sweep nie laenger als budget (plus Thread-Wechsel), egal wie lange
+    der Bus-Treiber blockiert.
+    """
+
+    def __init__(self, budget, smoothing=0.3, default_cost=0.002):
+        self.budget = budget
+        self.smoothing = smoothing
+        self.default_cost = default_cost
+        self.cost = {}          # geglaettete Dauer eines Reads pro Sensor
+        self.misses = 0         # Sweeps mit aufgegebenem Read (Deadline gerissen)
+        self.deferred = 0       # Verschobene Reads (passten nicht mehr ins Budget)
+        self.sweeps = 0
+        self.max_sweep = 0.0    # Laengste Sweep-Dauer in Sekunden
+        self._order = deque()   # Lese-Reihenfolge: zuletzt verschobene zuerst
+        self._pending = None    # Aufgegebener Read, den der Worker noch ausfuehrt
+        self._jobs = deque()
+        self._wake = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="bus-worker", daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        while True:
+            with self._wake:
+                while not self._jobs and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                job = self._jobs.popleft()
+            t_start = time.perf_counter()
+            try:
+                job.value = job.fn()
+            except Exception as e:
+                job.error = e
+            job.t_end = time.perf_counter()
+            job.cost = job.t_end - t_start
+            job.done.set()
+
+    def _learn(self, job):
+        old = self.cost.get(job.name, self.default_cost)
+        self.cost[job.name] = old + self.smoothing * (job.cost - old)
+
+    @property
+    def busy(self):
+        """True, solange ein aufgegebener Read den Bus noch blockiert."""
+        return self._pending is not None and not self._pending.done.is_set()
+
+    def run(self, reads):
+        """
+        Fuehrt die Reads {name: fn} innerhalb des Budgets aus.
+        Rueckgabe: {name: (Ergebnis oder Exception, Ende des Reads, Dauer)} der fertigen Reads;
+        fehlende Namen wurden verschoben oder aufgegeben.
+        """
+        t_start = time.perf_counter()
+        deadline = t_start + self.budget
+        results = {}
+
+        # Aufgegebener Read aus einem frueheren Sweep: Ergebnis ist veraltet, nur die Dauer zaehlt
+        if self._pending is not None:
+            if not self._pending.done.is_set():
+                self.deferred += len(reads)
+                self._finish(t_start)
+                return results
+            self._learn(self._pending)
+            self._pending = None
+
+        for name in reads:
+            if name not in self._order:
+                self._order.append(name)
+        order = [name for name in self._order if name in reads]
+
+        done, abandoned = [], None
+        for i, name in enumerate(order):
+            now = time.perf_counter()
+            # Passt der Read nicht mehr ins Budget -> naechster Sweep (der erste wird immer versucht)
+            if i and now + self.cost.get(name, self.default_cost) > deadline:
+                self.deferred += len(order) - i
+                break
+            job = _Read(name, reads[name])
+            with self._wake:
+                self._jobs.append(job)
+                self._wake.notify()
+            if not job.done.wait(max(0.0, deadline - now)):
+                # Deadline gerissen: Read aufgeben, der Bus bleibt bis zum Ende belegt
+                self._pending = abandoned = job
+                self.misses += 1
+                self.deferred += len(order) - i - 1
+                break
+            self._learn(job)
+            results[name] = (job.error if job.error else job.value, job.t_end, job.cost)
+            done.append(name)
+
+        # Gelesene Sensoren ans Ende: Verschobene sind im naechsten Sweep zuerst dran.
+        # Ein aufgegebener Sensor ganz ans Ende, sonst blockiert er bei jedem Sweep alle anderen.
+        for name in done + ([abandoned.name] if abandoned else []):
+            self._order.remove(name)
+            self._order.append(name)
+        self._finish(t_start)
+        return results
+
+    def _finish(self, t_start):
+        self.sweeps += 1
+        self.max_sweep = max(self.max_sweep, time.perf_counter() - t_start)
+
+    def stats(self):
+        """Zaehler fuer Anzeige/Log."""
+        return {"sweeps": self.sweeps, "misses": self.misses, "deferred": self.deferred,
+                "max_sweep": self.max_sweep, "busy": self.busy}
+
+    def close(self):
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
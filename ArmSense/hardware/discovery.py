@@ -0,0 +1,262 @@
+# hardware/discovery.py
+"""
+Erkennung der Bus-Topologie: Welche BNO055 haengen an welchem Multiplexer-Kanal?
+
+Ein voller Scan prueft jeden Multiplexer (TCA9548A) und jeden Kanal auf BNO055 an
+0x28/0x29 (Chip-ID 0xA0). Mehrere Busse werden parallel gescannt (ein Thread pro Bus,
+auf einem Bus sind Transaktionen ohnehin seriell), Pausen gibt es keine.
+Das Ergebnis wird mit Fingerprint gecacht; beim naechsten Start werden nur die
+gecachten Positionen geprueft. Ein voller Scan folgt nur, wenn das nicht passt.
+
+    python hardware/discovery.py            # Cache pruefen bzw. scannen
+    python hardware/discovery.py --rescan   # Immer voll scannen
+"""
+import sys
+import os
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+BNO055_ADDRESSES = (0x28, 0x29)
+BNO055_CHIP_ID = 0xA0
+REG_CHIP_ID = 0x00
+MUX_CHANNELS = 8
+CACHE_VERSION = 1
+
+
+class _Locked:
+    """Bus exklusiv belegen (busio.I2C verlangt try_lock vor jedem Zugriff)."""
+
+    def __init__(self, i2c):
+        self.i2c = i2c
+
+    def __enter__(self):
+        while not self.i2c.try_lock():
+            pass
+        return self.i2c
+
+    def __exit__(self, *exc):
+        self.i2c.unlock()
+
+
+def _select(i2c, mux, mask):
+    """Setzt die Kanal-Maske eines Multiplexers; False, wenn er nicht antwortet."""
+    try:
+        i2c.writeto(mux, bytes([mask]))
+        return True
+    except OSError:
+        return False
+
+
+def _chip_id(i2c, address):
+    """Chip-ID am Register 0x00 oder None (NAK / kein Geraet)."""
+    buf = bytearray(1)
+    try:
+        i2c.writeto_then_readfrom(address, bytes([REG_CHIP_ID]), buf)
+    except OSError:
+        return None
+    return buf[0]
+
+
+def _probe_sensors(i2c, bus, mux, channel, skip=()):
+    found = []
+    for address in BNO055_ADDRESSES:
+        if address in skip:
+            continue
+        chip = _chip_id(i2c, address)
+        if chip == BNO055_CHIP_ID:
+            found.append({"bus": bus, "mux": mux, "channel": channel, "address": address})
+    return found
+
+
+def scan_bus(i2c, bus, mux_addresses=DISCOVERY_MUX_ADDRESSES):
+    """
+    Voller Scan eines Busses. Rueckgabe: (Multiplexer-Adressen, Sensor-Liste).
+    Sensoren direkt am Bus haben mux/channel = None.
+    """
+    with _Locked(i2c):
+        muxes = [mux for mux in mux_addresses if _select(i2c, mux, 0)]
+        # Erst direkt am Bus (alle Multiplexer-Kanaele aus), dann Kanal fuer Kanal
+        sensors = _probe_sensors(i2c, bus, None, None)
+        # Sensoren direkt am Bus antworten auf jedem Kanal: diese Adressen hinter dem Mux nicht pruefen
+        direct = {sensor["address"] for sensor in sensors}
+        for mux in muxes:
+            for channel in range(MUX_CHANNELS):
+                _select(i2c, mux, 1 << channel)
+                sensors += _probe_sensors(i2c, bus, mux, channel, direct)
+            _select(i2c, mux, 0)
+    return muxes, sensors
+
+
+def verify(buses, topology):
+    """Prueft nur die gecachten Positionen; True, wenn alle Multiplexer und Sensoren antworten."""
+    for bus, i2c in buses.items():
+        muxes = [m["address"] for m in topology["muxes"] if m["bus"] == bus]
+        sensors = sorted((s for s in topology["sensors"] if s["bus"] == bus),
+                         key=lambda s: (s["mux"] or 0, s["channel"] if s["channel"] is not None else -1))
+        with _Locked(i2c):
+            if not all(_select(i2c, mux, 0) for mux in muxes):
+                return False
+            selected = None  # (mux, kanal): ein Kanalwechsel pro Kanal, nicht pro Sensor
+            for sensor in sensors:
+                where = (sensor["mux"], sensor["channel"])
+                if sensor["mux"] is not None and where != selected:
+                    if selected and selected[0] != sensor["mux"]:
+                        _select(i2c, selected[0], 0)
+                    _select(i2c, sensor["mux"], 1 << sensor["channel"])
+                    selected = where
+                if _chip_id(i2c, sensor["address"]) != BNO055_CHIP_ID:
+                    return False
+            if selected:
+                _select(i2c, selected[0], 0)
+    # Busse aus dem Cache, die es nicht mehr gibt, zaehlen als Abweichung
+    return {s["bus"] for s in topology["sensors"]} <= set(buses)
+
+
+def fingerprint(muxes, sensors):
+    """Kurzer Hash ueber Multiplexer und Sensor-Positionen (unabhaengig von der Reihenfolge)."""
+    key = json.dumps({"muxes": sorted((m["bus"], m["address"]) for m in muxes),
+                      "sensors": sorted((s["bus"], s["mux"] or 0, s["channel"] if s["channel"] is not None else -1,
+                                         s["address"]) for s in sensors)})
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def scan(buses, mux_addresses=DISCOVERY_MUX_ADDRESSES):
+    """Voller Scan aller Busse {bus_id: i2c}, parallel. Rueckgabe: Topologie-Dict."""
+    with ThreadPoolExecutor(max_workers=max(1, len(buses))) as pool:
+        results = list(pool.map(lambda item: (item[0],) + scan_bus(item[1], item[0], mux_addresses), buses.items()))
+    muxes, sensors = [], []
+    for bus, bus_muxes, bus_sensors in sorted(results, key=lambda r: str(r[0])):
+        muxes += [{"bus": bus, "address": mux} for mux in bus_muxes]
+        sensors += bus_sensors
+    return {"version": CACHE_VERSION, "fingerprint": fingerprint(muxes, sensors),
+            "muxes": muxes, "sensors": sensors}
+
+
+def load_cache(path):
+    try:
+        with open(path) as f:
+            topology = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if topology.get("version") != CACHE_VERSION:
+        return None
+    # Manipulierte oder unvollstaendige Datei -> wie kein Cache
+    if topology.get("fingerprint") != fingerprint(topology.get("muxes", []), topology.get("sensors", [])):
+        return None
+    return topology
+
+
+def save_cache(path, topology):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(topology, f, indent=1)
+    os.replace(tmp, path)
+
+
+def discover(buses, cache_path=DISCOVERY_CACHE, mux_addresses=DISCOVERY_MUX_ADDRESSES, rescan=False,
+             required=()):
+    """
+    Topologie fuer die Busse {bus_id: i2c}: gecachte Topologie, wenn sie sich bestaetigt,
+    sonst voller Scan (Ergebnis wird gecacht, ausser er findet gar keinen Sensor).
+    required: (mux, kanal)-Positionen (SENSOR_MAPPING), die im Cache stehen muessen; fehlt eine,
+    wird neu gescannt, auch an Multiplexern ausserhalb von mux_addresses.
+    """
+    t_start = time.perf_counter()
+    required = set(required)
+    mux_addresses = sorted(set(mux_addresses) | {mux for mux, _ in required if mux is not None})
+    cache_path = os.path.expanduser(cache_path) if cache_path else None
+    cached = None if rescan or not cache_path else load_cache(cache_path)
+    if cached and required - {(s["mux"], s["channel"]) for s in cached["sensors"]}:
+        print("[I2C] Topologie-Cache ohne alle Positionen aus SENSOR_MAPPING")
+    elif cached and verify(buses, cached):
+        cached["source"] = "cache"
+        print(f"[I2C] Topologie aus Cache bestaetigt: {len(cached['sensors'])} Sensoren "
+              f"({(time.perf_counter() - t_start) * 1000:.0f} ms)")
+        return cached
+
+    topology = scan(buses, mux_addresses)
+    # Ein leerer Scan (Bus tot, Kabel ab) darf keinen brauchbaren Cache ersetzen
+    if cache_path and topology["sensors"]:
+        try:
+            save_cache(cache_path, topology)
+        except OSError as e:
+            print(f"[I2C] Topologie-Cache nicht geschrieben: {e}")
+    topology["source"] = "scan"
+    reason = "Cache weicht ab" if cached else "kein Cache"
+    print(f"[I2C] Voller Scan ({reason}): {len(topology['sensors'])} Sensoren an "
+          f"{len(topology['muxes'])} Multiplexern ({(time.perf_counter() - t_start) * 1000:.0f} ms)")
+    return topology
+
+
+def position(value):
+    """SENSOR_MAPPING-Eintrag -> (Multiplexer, Kanal). Eine reine Kanalnummer gilt fuer MUX_ADDRESS."""
+    if isinstance(value, (tuple, list)):
+        mux, channel = value
+        return mux, channel
+    return MUX_ADDRESS, value
+
+
+def where(mux, channel):
+    return "direkt" if mux is None else f"Mux 0x{mux:02X} Kanal {channel}"
+
+
+def find(topology, channel, mux=MUX_ADDRESS):
+    """Sensor-Eintrag an einem Multiplexer-Kanal (fuer SENSOR_MAPPING) oder None."""
+    for sensor in topology["sensors"]:
+        if sensor["mux"] == mux and sensor["channel"] == channel:
+            return sensor
+    return None
+
+
+def unmapped(topology, mapping=SENSOR_MAPPING):
+    """Sensoren hinter einem Multiplexer (auch anderen als MUX_ADDRESS), die in mapping fehlen."""
+    mapped = {position(value) for value in mapping.values()}
+    return [sensor for sensor in topology["sensors"]
+            if sensor["mux"] is not None and (sensor["mux"], sensor["channel"]) not in mapped]
+
+
+def describe(topology):
+    lines = []
+    for sensor in topology["sensors"]:
+        lines.append(f"  Bus {sensor['bus']}: {where(sensor['mux'], sensor['channel'])} -> BNO055 @ 0x{sensor['address']:02X}")
+    return "\n".join(lines) or "  (keine BNO055 gefunden)"
+
+
+def main():
+    import backends
+    parser = argparse.ArgumentParser(description="ArmSense Bus-Topologie")
+    parser.add_argument("--rescan", action="store_true", help="Cache ignorieren und voll scannen")
+    parser.add_argument("--cache", default=DISCOVERY_CACHE, help="Pfad des Topologie-Caches")
+    parser.add_argument("--bus", type=int, action="append",
+                        help="/dev/i2c-N direkt scannen (mehrfach moeglich, parallel); sonst Blinka")
+    args = parser.parse_args()
+
+    if args.bus:
+        from hardware.i2cdev import I2CDev
+        buses = {bus: I2CDev(bus) for bus in args.bus}
+    else:
+        hw = backends.get("hardware", "blinka")
+        buses = {I2C_BUS: hw.busio.I2C(hw.board.SCL, hw.board.SDA, frequency=I2C_FREQ)}
+    topology = discover(buses, args.cache, DISCOVERY_MUX_ADDRESSES, rescan=args.rescan,
+                        required=[position(value) for value in SENSOR_MAPPING.values()])
+    print(describe(topology))
+    for name, value in SENSOR_MAPPING.items():
+        mux, channel = position(value)
+        state = "ok" if find(topology, channel, mux) else "FEHLT"
+        print(f"  SENSOR_MAPPING {name} ({where(mux, channel)}): {state}")
+    for sensor in unmapped(topology):
+        print(f"  Nicht in SENSOR_MAPPING: {where(sensor['mux'], sensor['channel'])} (z.B. \"name\": "
+              f"(0x{sensor['mux']:02X}, {sensor['channel']}))")
+
+
+if __name__ == "__main__":
+    main()
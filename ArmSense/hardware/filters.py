@@ -0,0 +1,281 @@
+# hardware/filters.py
+"""
+Filter-Kette pro Sensor (FILTER_CHAIN / FILTER_CHAINS in config.py).
+
+Jede Stufe bekommt die Quaternion nach Nullpunkt/Ausrichtung und liefert eine Quaternion;
+Zeit und Speicher pro Sample sind konstant. Stufen:
+
+    jump      Glitch-Filter (MAX_ANGLE_JUMP / MAX_OUTLIERS, bisheriges Verhalten)
+    median    Medoid der letzten window Rotationen (entfernt einzelne Spikes, window//2 Frames Latenz)
+    one_euro  One-Euro-Tiefpass auf der Quaternion: ruhig bei Stillstand, wenig Latenz bei Bewegung
+    slerp     Exponentielle Glaettung per SLERP mit Zeitkonstante tau
+
+Kosten pro Sample messen:
+
+    python hardware/filters.py
+"""
+import sys
+import os
+import math
+import time
+import argparse
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MAX_ANGLE_JUMP, MAX_OUTLIERS, ACQ_RATE
+from utils import q_slerp, q_angle_between
+
+IDENTITY = (1, 0, 0, 0)
+# dt ausserhalb (0, MAX_DT] (erstes Sample, Zeitbasis gewechselt, Pause) -> nominelles dt
+MAX_DT = 0.5
+
+
+def _dt(t, t_prev):
+    if t is None or t_prev is None or not 0.0 < t - t_prev <= MAX_DT:
+        return 1.0 / ACQ_RATE
+    return t - t_prev
+
+
+class JumpFilter:
+    """
+    Verwirft Spruenge > limit Grad, bis sie max_outliers Frames in Folge auftreten.
+    limit gilt pro Frame bei ACQ_RATE. Liest der PollScheduler den Sensor seltener (interval,
+    z.B. 0.2 s bei POLL_MIN_RATE), waechst es mit der Zeit seit dem letzten akzeptierten Wert,
+    hoechstens bis interval bzw. MAX_DT. Ohne interval (jeder Frame gelesen) gilt limit fest.
+    """
+    __slots__ = ("limit", "max_outliers", "last", "t_last", "interval", "outliers", "on_reject", "on_forced")
+
+    def __init__(self, limit=MAX_ANGLE_JUMP, max_outliers=MAX_OUTLIERS, on_reject=None, on_forced=None):
+        self.limit = limit
+        self.max_outliers = max_outliers
+        self.on_reject = on_reject  # Metrik-Hooks (SensorMetrics)
+        self.on_forced = on_forced
+        self.last = IDENTITY
+        self.t_last = None    # Zeitpunkt des letzten akzeptierten Werts (Zeitbasis von apply())
+        self.interval = None  # Vom PollScheduler geplanter Leseabstand (SensorManager setzt ihn)
+        self.outliers = 0
+
+    def apply(self, q, t=None):
+        limit = self.limit
+        if self.interval and t is not None and self.t_last is not None:
+            limit *= max(1.0, min(t - self.t_last, self.interval, MAX_DT) * ACQ_RATE)
+        diff_angle = q_angle_between(q, self.last)
+        if diff_angle > limit:
+            if self.outliers < self.max_outliers:
+                # Sprung ist zu gross -> alten Wert behalten
+                self.outliers += 1
+                if self.on_reject: self.on_reject()
+                return self.last
+            # Limit fuer Ausreisser erreicht -> akzeptieren
+            if self.on_forced: self.on_forced()
+        self.last = q
+        self.t_last = t
+        self.outliers = 0
+        return q
+
+    def restart(self):
+        # Sprung durch neue Kalibrierung nicht als Glitch verwerfen
+        self.outliers = self.max_outliers
+
+    def get_state(self):
+        return {"last": list(self.last), "outliers": self.outliers}
+
+    def set_state(self, state):
+        self.last = tuple(state["last"])
+        self.t_last = None  # Replay/Reprocessing laufen auf einer anderen Zeitbasis als die Aufnahme
+        self.outliers = state["outliers"]
+
+
+class MedianDespiker:
+    """Medoid (kleinste Winkelsumme zu den anderen) der letzten window Rotationen."""
+    __slots__ = ("window", "samples")
+
+    def __init__(self, window=3):
+        if window < 1:
+            raise ValueError("window muss >= 1 sein")
+        self.window = window
+        self.samples = deque(maxlen=window)
+
+    def apply(self, q, t=None):
+        samples = self.samples
+        samples.append(q)
+        if len(samples) < 3:
+            return q
+        best, best_cost = q, None
+        for a in samples:
+            cost = 0.0
+            for b in samples:
+                # 1 - |<a,b>| ist monoton im Winkel und spart acos
+                cost += 1.0 - abs(a[0] * b[0] + a[1] * b[1] + a[2] * b[2] + a[3] * b[3])
+            if best_cost is None or cost < best_cost:
+                best, best_cost = a, cost
+        return best
+
+    def restart(self):
+        self.samples.clear()
+
+    def get_state(self):
+        return {"samples": [list(q) for q in self.samples]}
+
+    def set_state(self, state):
+        self.samples = deque((tuple(q) for q in state["samples"]), maxlen=self.window)
+
+
+class OneEuroFilter:
+    """
+    One-Euro-Filter (Casiez et al.) auf der Quaternion: SLERP zum neuen Wert mit einer
+    Grenzfrequenz, die mit der geglaetteten Winkelgeschwindigkeit (rad/s) steigt.
+    """
+    __slots__ = ("min_cutoff", "beta", "d_cutoff", "q", "speed", "t")
+
+    def __init__(self, min_cutoff=1.0, beta=1.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff  # Hz bei Stillstand (kleiner = ruhiger)
+        self.beta = beta              # Zuwachs der Grenzfrequenz pro rad/s (groesser = weniger Latenz)
+        self.d_cutoff = d_cutoff      # Hz fuer die Glaettung der Geschwindigkeit
+        self.q = None
+        self.speed = 0.0
+        self.t = None
+
+    @staticmethod
+    def _alpha(dt, cutoff):
+        return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+    def apply(self, q, t=None):
+        if self.q is None:
+            self.q, self.t = q, t
+            return q
+        dt = _dt(t, self.t)
+        self.t = t
+        speed = math.radians(q_angle_between(q, self.q)) / dt
+        self.speed += self._alpha(dt, self.d_cutoff) * (speed - self.speed)
+        cutoff = self.min_cutoff + self.beta * self.speed
+        self.q = q_slerp(self.q, q, self._alpha(dt, cutoff))
+        return self.q
+
+    def restart(self):
+        self.q, self.speed, self.t = None, 0.0, None
+
+    def get_state(self):
+        return {"q": list(self.q) if self.q else None, "speed": self.speed, "t": self.t}
+
+    def set_state(self, state):
+        self.q = tuple(state["q"]) if state["q"] else None
+        self.speed = state["speed"]
+        self.t = state["t"]
+
+
+class SlerpSmoother:
+    """Exponentielle Glaettung: q += (1 - exp(-dt / tau)) des Wegs zum neuen Wert."""
+    __slots__ = ("tau", "q", "t")
+
+    def __init__(self, tau=0.05):
+        self.tau = tau  # Zeitkonstante in Sekunden
+        self.q = None
+        self.t = None
+
+    def apply(self, q, t=None):
+        if self.q is None:
+            self.q, self.t = q, t
+            return q
+        dt = _dt(t, self.t)
+        self.t = t
+        self.q = q_slerp(self.q, q, 1.0 - math.exp(-dt / self.tau))
+        return self.q
+
+    def restart(self):
+        self.q, self.t = None, None
+
+    def get_state(self):
+        return {"q": list(self.q) if self.q else None, "t": self.t}
+
+    def set_state(self, state):
+        self.q = tuple(state["q"]) if state["q"] else None
+        self.t = state["t"]
+
+
+STAGES = {
+    "jump": JumpFilter,
+    "median": MedianDespiker,
+    "one_euro": OneEuroFilter,
+    "slerp": SlerpSmoother,
+}
+
+
+class FilterChain:
+    """Stufen nacheinander; Zustand als JSON-taugliche Liste (Keyframes in Aufzeichnungen)."""
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    def apply(self, q, t=None):
+        for stage in self.stages:
+            q = stage.apply(q, t)
+        return q
+
+    def restart(self):
+        """Nach neuer Kalibrierung: Sprung akzeptieren, Glaettung neu beginnen."""
+        for stage in self.stages:
+            stage.restart()
+
+    def stage(self, cls):
+        """Erste Stufe eines Typs oder None."""
+        for stage in self.stages:
+            if isinstance(stage, cls):
+                return stage
+        return None
+
+    def get_state(self):
+        return [stage.get_state() for stage in self.stages]
+
+    def set_state(self, state):
+        for stage, stage_state in zip(self.stages, state):
+            stage.set_state(stage_state)
+
+
+def build_chain(spec, on_reject=None, on_forced=None):
+    """spec: [(stufe, {parameter}), ...] wie in FILTER_CHAIN. Die Metrik-Hooks gehen an den Jump-Filter."""
+    stages = []
+    for kind, params in spec:
+        if kind not in STAGES:
+            raise ValueError(f"Unbekannte Filter-Stufe '{kind}' (erlaubt: {', '.join(STAGES)})")
+        params = dict(params)
+        if kind == "jump":
+            params.setdefault("on_reject", on_reject)
+            params.setdefault("on_forced", on_forced)
+        stages.append(STAGES[kind](**params))
+    return FilterChain(stages)
+
+
+def benchmark(spec, samples=20000, rate=ACQ_RATE):
+    """Mittlere Kosten pro Sample in Mikrosekunden fuer jede Stufe einzeln und die ganze Kette."""
+    # Langsame Drehung mit Rauschen und einem Spike alle 100 Samples
+    stream = []
+    for i in range(samples):
+        angle = 0.002 * i + (0.6 if i % 100 == 50 else 0.001 * ((i * 7919) % 13 - 6))
+        stream.append((math.cos(angle / 2), math.sin(angle / 2), 0.0, 0.0))
+    results = {}
+    for label, chain_spec in [(kind, [(kind, params)]) for kind, params in spec] + [("kette", spec)]:
+        chain = build_chain(chain_spec)
+        t0 = time.perf_counter()
+        for i, q in enumerate(stream):
+            chain.apply(q, i / rate)
+        results[label] = (time.perf_counter() - t0) / samples * 1e6
+    return results
+
+
+def main():
+    from config import FILTER_CHAIN, FILTER_CHAINS
+    parser = argparse.ArgumentParser(description="Kosten der Filter-Stufen pro Sample")
+    parser.add_argument("--samples", type=int, default=20000)
+    args = parser.parse_args()
+
+    chains = {"(alle Stufen)": [(kind, {}) for kind in STAGES], "FILTER_CHAIN": FILTER_CHAIN}
+    chains.update(FILTER_CHAINS)
+    for name, spec in chains.items():
+        print(f"{name}:")
+        for label, us in benchmark(spec, args.samples).items():
+            print(f"  {label:10s} {us:6.2f} us/Sample")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# hardware/fusion.py
+"""
+Sensorfusion auf dem Host (FUSION_MODE = "host").
+
+Die BNO055 laufen im AMG-Modus (nur Rohdaten, keine Onboard-Fusion). Pro Sweep
+werden Beschleunigung, Magnetfeld und Drehrate jedes Sensors in einem Burst gelesen
+und ein vektorisierter Madgwick-Filter aktualisiert alle Sensoren gleichzeitig.
+Derselbe Filter laeuft offline auf aufgezeichneten Rohdaten (.npz), damit sich
+die Gains ohne neue Aufnahme nachjustieren lassen:
+
+    python hardware/fusion.py aufnahme.npz --beta 0.05 --gain arm=0.1
+"""
+import sys
+import os
+import argparse
+import numpy as np
+
+# --- BNO055 Register (Datenblatt, Kap. 4.3) ---
+REG_DATA_START = 0x08   # ACC_DATA_X_LSB, danach MAG_DATA und GYR_DATA
+DATA_LEN = 18           # 3 Vektoren x 3 Achsen x int16
+MODE_AMG = 0x07         # Nur Rohdaten, keine Fusion
+
+# Skalierung bei Default-Einheiten (UNIT_SEL = 0)
+ACC_SCALE = 1.0 / 100.0                 # LSB -> m/s^2
+MAG_SCALE = 1.0 / 16.0                  # LSB -> uT
+GYR_SCALE = np.radians(1.0 / 16.0)      # LSB -> rad/s
+
+# Waehrend der Anlaufzeit wird mit hohem Gain gegen Gravitation/Magnetfeld konvergiert
+INIT_BETA = 2.5
+INIT_TIME = 1.0
+
+
+def unit_scales(unit_sel=0):
+    """Skalierung (acc, mag, gyr) nach SI fuer ein UNIT_SEL (BNO055_SETUP "units")."""
+    acc = 9.80665e-3 if unit_sel & 0x01 else ACC_SCALE   # mg
+    gyr = 1.0 / 900.0 if unit_sel & 0x02 else GYR_SCALE  # rad/s: 900 LSB
+    return acc, MAG_SCALE, gyr
+
+
+DEFAULT_SCALES = unit_scales()
+
+
+def decode_burst(buf, scales=DEFAULT_SCALES):
+    """18-Byte Burst (ACC, MAG, GYR je x/y/z, little endian int16) -> (acc, mag, gyr) in SI."""
+    raw = np.frombuffer(bytes(buf), dtype="<i2", count=9).astype(np.float64).reshape(3, 3)
+    return raw[0] * scales[0], raw[1] * scales[1], raw[2] * scales[2]
+
+
+def read_burst(sensor, buf=None, scales=DEFAULT_SCALES):
+    """Liest ACC/MAG/GYR eines BNO055 (adafruit BNO055_I2C) in einer I2C-Transaktion."""
+    if buf is None:
+        buf = bytearray(DATA_LEN)
+    with sensor.i2c_device as dev:
+        dev.write_then_readinto(bytes([REG_DATA_START]), buf)
+    return decode_burst(buf, scales)
+
+
+def _qmul(a, b):
+    """Hamilton-Produkt zeilenweise fuer (n, 4) Arrays."""
+    aw, ax, ay, az = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+    bw, bx, by, bz = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=1)
+
+
+def _conj(q):
+    return q * np.array([1.0, -1.0, -1.0, -1.0])
+
+
+def _pure(v):
+    return np.concatenate((np.zeros((len(v), 1)), v), axis=1)
+
+
+def _unit(v):
+    """Normiert zeilenweise; Nullvektoren bleiben Null."""
+    norm = np.linalg.norm(v, axis=1, keepdims=True)
+    return np.divide(v, norm, out=np.zeros_like(v), where=norm > 0)
+
+
+def _gradient(q, d, s):
+    """
+    Gradient von 1/2 |q* d q - s|^2 nach q (Madgwick, Gl. 20):
+    Referenz d (Erd-System) gegen Messung s (Sensor-System), beide als reine Quaternionen.
+    """
+    err = _qmul(_qmul(_conj(q), d), q) - s
+    return -2.0 * _qmul(_qmul(d, q), err)
+
+
+class MadgwickBank:
+    """
+    Madgwick-Filter (MARG) fuer mehrere Sensoren als ein NumPy-Batch.
+    Quaternion-Konvention wie die BNO055-Onboard-Fusion: q dreht vom Sensor- ins Erd-System
+    (z nach oben, x Richtung magnetisch Nord). Ohne Magnetometer (use_mag=False oder
+    Messwert 0) wird nur gegen die Gravitation korrigiert, die Blickrichtung driftet dann.
+    """
+
+    def __init__(self, names, beta=0.1, gains=None, use_mag=True, init_beta=INIT_BETA, init_time=INIT_TIME):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.beta = np.full(len(self.names), float(beta))
+        for name, gain in (gains or {}).items():
+            self.set_gain(name, gain)
+        self.use_mag = use_mag
+        self.init_beta = init_beta
+        self.init_time = init_time
+        self.reset()
+
+    def reset(self):
+        n = len(self.names)
+        self.q = np.tile(np.array([1.0, 0.0, 0.0, 0.0]), (n, 1))
+        self.elapsed = np.zeros(n)
+        self.last_t = np.full(n, np.nan)  # Zeitpunkt der letzten gueltigen Messung pro Sensor
+
+    def set_gain(self, name, beta):
+        self.beta[self.index[name]] = float(beta)
+
+    def update(self, gyr, acc, mag, dt, valid=None):
+        """
+        Ein Filterschritt fuer alle Sensoren.
+        gyr (rad/s), acc, mag: (n, 3) Arrays. dt: Sekunden (Skalar oder pro Sensor).
+        valid: Bool-Maske; Sensoren ohne gueltige Messung behalten ihre Orientierung.
+        """
+        gyr = np.asarray(gyr, dtype=np.float64)
+        acc = np.asarray(acc, dtype=np.float64)
+        mag = np.asarray(mag, dtype=np.float64)
+        dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (len(self.names),))
+        if valid is None:
+            valid = np.ones(len(self.names), dtype=bool)
+
+        q = self.q
+        q_dot = 0.5 * _qmul(q, _pure(gyr))
+
+        # Korrektur gegen Gravitation (Erd-Referenz z = oben)
+        a = _unit(acc)
+        has_acc = np.any(a != 0.0, axis=1)
+        d_grav = np.tile(np.array([0.0, 0.0, 0.0, 1.0]), (len(q), 1))
+        step = _gradient(q, d_grav, _pure(a))
+
+        # Korrektur gegen Magnetfeld: Referenz aus der aktuellen Schaetzung (nur Inklination)
+        if self.use_mag:
+            m = _unit(mag)
+            has_mag = np.any(m != 0.0, axis=1)
+            h = _qmul(_qmul(q, _pure(m)), _conj(q))
+            d_mag = np.zeros_like(q)
+            d_mag[:, 1] = np.hypot(h[:, 1], h[:, 2])
+            d_mag[:, 3] = h[:, 3]
+            step += np.where(has_mag[:, None], _gradient(q, d_mag, _pure(m)), 0.0)
+
+        beta = np.where(self.elapsed < self.init_time, np.maximum(self.beta, self.init_beta), self.beta)
+        q_dot -= np.where(has_acc[:, None], beta[:, None] * _unit(step), 0.0)
+
+        q_new = _unit(q + q_dot * dt[:, None])
+        self.q = np.where(valid[:, None], q_new, q)
+        self.elapsed += np.where(valid, dt, 0.0)
+        return self.q
+
+    def advance(self, t, gyr, acc, mag, valid):
+        """Filterschritt mit Messzeitpunkten t (pro Sensor); dt ergibt sich aus der letzten Messung."""
+        t = np.broadcast_to(np.asarray(t, dtype=np.float64), (len(self.names),))
+        valid = np.asarray(valid, dtype=bool)
+        dt = np.where(valid & ~np.isnan(self.last_t), t - self.last_t, 0.0)
+        self.update(gyr, acc, mag, dt, valid)
+        self.last_t = np.where(valid, t, self.last_t)
+        return self.q
+
+    def step(self, samples, log=None):
+        """
+        Online-Schritt: samples = {name: (t, acc, mag, gyr)} mit den Rohdaten dieses Sweeps.
+        Sensoren ohne Sample behalten ihre Orientierung. Rueckgabe: {name: (w, x, y, z)}.
+        """
+        n = len(self.names)
+        t = np.full(n, np.nan)
+        acc, mag, gyr = np.zeros((n, 3)), np.zeros((n, 3)), np.zeros((n, 3))
+        for name, (ts, a, m, g) in samples.items():
+            i = self.index.get(name)
+            if i is not None:
+                t[i], acc[i], mag[i], gyr[i] = ts, a, m, g
+        valid = ~np.isnan(t)
+
+        self.advance(t, gyr, acc, mag, valid)
+        if log is not None:
+            log.append(t, acc, mag, gyr, valid)
+        return {name: self.quaternion(name) for name in samples if name in self.index}
+
+    def quaternion(self, name):
+        """Aktuelle Orientierung als (w, x, y, z) Tuple wie sensor.quaternion."""
+        return tuple(float(c) for c in self.q[self.index[name]])
+
+
+class RawLog:
+    """Sammelt Rohdaten-Sweeps fuer die Offline-Fusion und speichert sie als .npz."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.t, self.acc, self.mag, self.gyr, self.valid = [], [], [], [], []
+
+    def append(self, t, acc, mag, gyr, valid):
+        self.t.append(np.array(t, dtype=np.float64))
+        self.acc.append(np.array(acc, dtype=np.float32))
+        self.mag.append(np.array(mag, dtype=np.float32))
+        self.gyr.append(np.array(gyr, dtype=np.float32))
+        self.valid.append(np.array(valid, dtype=bool))
+
+    def __len__(self):
+        return len(self.t)
+
+    def save(self, path):
+        np.savez_compressed(path, names=np.array(self.names), t=np.array(self.t),
+                            acc=np.stack(self.acc), mag=np.stack(self.mag),
+                            gyr=np.stack(self.gyr), valid=np.stack(self.valid))
+
+
+def fuse_recording(rec, beta=0.1, gains=None, use_mag=True):
+    """
+    Fusioniert eine Rohdaten-Aufnahme (dict oder np.load Ergebnis mit names, t, acc, mag, gyr
+    und optional valid) und liefert die Quaternionen als (T, N, 4) Array.
+    t ist entweder ein Zeitstempel pro Sweep (T,) oder pro Sensor-Read (T, N).
+    """
+    names = [str(n) for n in rec["names"]]
+    t, acc, mag, gyr = rec["t"], rec["acc"], rec["mag"], rec["gyr"]
+    valid = rec["valid"] if "valid" in rec else np.ones(acc.shape[:2], dtype=bool)
+
+    bank = MadgwickBank(names, beta, gains, use_mag=use_mag)
+    out = np.empty((len(t), len(names), 4))
+    for i in range(len(t)):
+        out[i] = bank.advance(t[i], gyr[i], acc[i], mag[i], valid[i])
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ArmSense Offline-Fusion fuer aufgezeichnete Rohdaten")
+    parser.add_argument("recording", help="Rohdaten-Aufnahme (.npz, main.py --record-raw)")
+    parser.add_argument("--beta", type=float, default=None, help="Gain fuer alle Sensoren (Default: FUSION_BETA)")
+    parser.add_argument("--gain", action="append", default=[], metavar="NAME=BETA",
+                        help="Gain fuer einen einzelnen Sensor, mehrfach moeglich")
+    parser.add_argument("--no-mag", action="store_true", help="Nur Gyro + Beschleunigung (6-DOF)")
+    parser.add_argument("-o", "--output", help="Ziel-Datei (Default: <aufnahme>_fused.npz)")
+    args = parser.parse_args()
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config import FUSION_BETA, FUSION_GAINS
+
+    gains = dict(FUSION_GAINS)
+    for item in args.gain:
+        name, value = item.split("=", 1)
+        gains[name] = float(value)
+
+    rec = np.load(args.recording)
+    q = fuse_recording(rec, FUSION_BETA if args.beta is None else args.beta, gains, use_mag=not args.no_mag)
+
+    output = args.output or os.path.splitext(args.recording)[0] + "_fused.npz"
+    np.savez_compressed(output, names=rec["names"], t=rec["t"], q=q)
+    print(f"[FUSION] {len(rec['t'])} Sweeps, {len(rec['names'])} Sensoren -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# hardware/i2cdev.py
+"""
+Direkter Zugriff auf /dev/i2c-N (Linux i2c-dev) ohne Blinka/Adafruit-Schichten.
+
+Ein Lesezugriff ist eine I2C_RDWR-ioctl mit [Register schreiben, Daten lesen];
+kann der Bus-Treiber mehrere Lese-Nachrichten pro ioctl (nicht bcm2835), werden
+alle Sensoren eines Kanals in einer ioctl gelesen. Der Multiplexer wird nur
+umgeschaltet, wenn sich der Kanal aendert. Die Kanalwahl ist immer eine eigene
+ioctl: Der TCA9548A uebernimmt die Auswahl erst mit der STOP-Bedingung, die
+I2C_RDWR nur am Ende einer Nachrichtenliste erzeugt.
+
+Mit I2C_DEV_GROUP_CHANNELS werden Kanaele, deren Sensoren unterschiedliche Adressen
+haben (0x28/0x29), gemeinsam geschaltet und zusammen gelesen.
+"""
+import os
+import time
+import ctypes
+import fcntl
+
+# --- linux/i2c-dev.h, linux/i2c.h ---
+I2C_FUNCS = 0x0705
+I2C_RDWR = 0x0707
+I2C_M_RD = 0x0001
+I2C_FUNC_I2C = 0x00000001
+I2C_RDWR_MAX_MSGS = 42   # I2C_RDWR_IOCTL_MAX_MSGS im Kernel
+
+# --- BNO055 ---
+REG_QUATERNION = 0x20    # QUA_DATA_W_LSB, 4 x int16
+QUATERNION_LEN = 8
+QUATERNION_SCALE = 1.0 / (1 << 14)
+
+
+class _Msg(ctypes.Structure):
+    _fields_ = [("addr", ctypes.c_uint16), ("flags", ctypes.c_uint16),
+                ("len", ctypes.c_uint16), ("buf", ctypes.POINTER(ctypes.c_uint8))]
+
+
+class _RdwrData(ctypes.Structure):
+    _fields_ = [("msgs", ctypes.POINTER(_Msg)), ("nmsgs", ctypes.c_uint32)]
+
+
+def decode_quaternion(buf):
+    """8 Byte (w, x, y, z als int16 little endian) -> (w, x, y, z) wie sensor.quaternion."""
+    return tuple(int.from_bytes(buf[i:i + 2], "little", signed=True) * QUATERNION_SCALE for i in range(0, 8, 2))
+
+
+def _adapter_name(bus):
+    try:
+        with open(f"/sys/class/i2c-dev/i2c-{bus}/name") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+class I2CDev:
+    """
+    Ein /dev/i2c-N Bus. transfer() schickt eine Nachrichtenliste in einer ioctl;
+    writeto/writeto_then_readfrom/try_lock/unlock wie busio.I2C (fuer hardware/discovery.py).
+
+    ioctl und path sind austauschbar (Tests mit Fake-Geraet statt Kernel-Treiber).
+    """
+
+    def __init__(self, bus, max_reads=None, ioctl=fcntl.ioctl, path=None):
+        self.bus = bus
+        self._ioctl = ioctl
+        self.fd = os.open(path or f"/dev/i2c-{bus}", os.O_RDWR)
+        try:
+            funcs = ctypes.c_ulong()
+            self._ioctl(self.fd, I2C_FUNCS, ctypes.addressof(funcs))
+        except OSError:
+            os.close(self.fd)
+            raise
+        if not funcs.value & I2C_FUNC_I2C:
+            os.close(self.fd)
+            # z.B. i2c-stub: nur SMBus, kein I2C_RDWR
+            raise OSError(f"/dev/i2c-{bus} unterstuetzt kein I2C_RDWR (nur SMBus)")
+        if max_reads is None:
+            # bcm2835 (Raspberry Pi) akzeptiert nur eine Lese-Nachricht, und nur als letzte
+            max_reads = 1 if "bcm2835" in _adapter_name(bus) else I2C_RDWR_MAX_MSGS // 2
+        self.max_reads = max(1, min(max_reads, I2C_RDWR_MAX_MSGS // 2))
+        self.transfers = 0   # Anzahl ioctl-Aufrufe (Statistik)
+
+    def transfer(self, messages):
+        """messages: Liste (Adresse, lesen, bytearray). Lese-Puffer werden gefuellt."""
+        msgs = (_Msg * len(messages))()
+        keep = []
+        for msg, (address, read, buf) in zip(msgs, messages):
+            cbuf = (ctypes.c_uint8 * len(buf)).from_buffer(buf)
+            keep.append(cbuf)
+            msg.addr = address
+            msg.flags = I2C_M_RD if read else 0
+            msg.len = len(buf)
+            msg.buf = ctypes.cast(cbuf, ctypes.POINTER(ctypes.c_uint8))
+        data = _RdwrData(msgs, len(messages))
+        self.transfers += 1
+        self._ioctl(self.fd, I2C_RDWR, ctypes.addressof(data))
+
+    # --- busio.I2C-kompatibel ---
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def writeto(self, address, buf):
+        self.transfer([(address, False, bytearray(buf))])
+
+    def writeto_then_readfrom(self, address, out_buf, in_buf):
+        self.transfer([(address, False, bytearray(out_buf)), (address, True, in_buf)])
+
+    def deinit(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class BNO055Bank:
+    """
+    Alle BNO055 hinter einem Multiplexer auf einem I2CDev.
+    sensors: {name: (kanal, adresse)}; kanal None = direkt am Bus.
+    """
+
+    def __init__(self, dev, mux, sensors, group_channels=False):
+        self.dev = dev
+        self.mux = mux
+        self.selected = None          # Aktuelle Kanal-Maske des Multiplexers (None = unbekannt)
+        self.groups = self._plan(sensors, group_channels)
+        self._buffers = {}
+
+    @staticmethod
+    def _plan(sensors, group_channels):
+        """
+        Gruppen {"mask": Kanal-Maske, "where": {name: adresse}}. Mit group_channels teilen sich
+        Kanaele eine Gruppe, wenn keine Adresse doppelt sichtbar wird (0x28 an Kanal 2 + 0x29 an 7).
+        """
+        by_channel = {}
+        for name, (channel, address) in sensors.items():
+            by_channel.setdefault(channel, {})[name] = address
+        groups = []
+        for channel in sorted(by_channel, key=lambda c: -1 if c is None else c):
+            where = by_channel[channel]
+            mask = 0 if channel is None else 1 << channel
+            target = None
+            if group_channels and mask:
+                for group in groups:
+                    if group["mask"] and not set(group["where"].values()) & set(where.values()):
+                        target = group
+                        break
+            if target is None:
+                target = {"mask": 0, "where": {}}
+                groups.append(target)
+            target["mask"] |= mask
+            target["where"].update(where)
+        return groups
+
+    def _select(self, mask):
+        if self.mux is None or mask == self.selected:
+            return
+        self.selected = None
+        self.dev.writeto(self.mux, bytes([mask]))
+        self.selected = mask
+
+    def _buffer(self, name, length):
+        buf = self._buffers.get(name)
+        if buf is None or len(buf) != length:
+            buf = self._buffers[name] = bytearray(length)
+        return buf
+
+    def _read_chunk(self, group, names, reg, length, results, t_start):
+        pointer = bytearray([reg])
+        messages = []
+        for name in names:
+            address = group["where"][name]
+            messages += [(address, False, pointer), (address, True, self._buffer(name, length))]
+        try:
+            self.dev.transfer(messages)
+        except OSError as e:
+            if len(names) > 1:
+                # Ein NAK bricht die ganze Liste ab: einzeln wiederholen, um den Sensor zu finden
+                for name in names:
+                    self._read_chunk(group, [name], reg, length, results, time.perf_counter())
+                return
+            t_end = time.perf_counter()
+            results[names[0]] = (e, t_end, t_end - t_start)
+            return
+        t_end = time.perf_counter()
+        cost = (t_end - t_start) / len(names)
+        for name in names:
+            results[name] = (bytes(self._buffers[name]), t_end, cost)
+
+    def read(self, names, reg=REG_QUATERNION, length=QUATERNION_LEN):
+        """Liest length Bytes ab reg fuer alle names; {name: (bytes oder Exception, Zeitpunkt, Dauer)}."""
+        wanted = set(names)
+        results = {}
+        for group in self.groups:
+            todo = [name for name in group["where"] if name in wanted]
+            if not todo:
+                continue
+            t_start = time.perf_counter()
+            try:
+                self._select(group["mask"])
+            except OSError as e:
+                t_end = time.perf_counter()
+                for name in todo:
+                    results[name] = (e, t_end, (t_end - t_start) / len(todo))
+                continue
+            step = self.dev.max_reads
+            for i in range(0, len(todo), step):
+                self._read_chunk(group, todo[i:i + step], reg, length, results, t_start)
+                t_start = time.perf_counter()
+        return results
+
+    def write_register(self, name, reg, value):
+        for group in self.groups:
+            if name in group["where"]:
+                self._select(group["mask"])
+                self.dev.writeto(group["where"][name], bytes([reg, value]))
+                return
+        raise KeyError(name)
+
+    def writer(self, name):
+        """write(register, wert) fuer einen Sensor (hardware/bno055_config.apply)."""
+        return lambda reg, value: self.write_register(name, reg, value)
+
+    def sensor(self, name):
+        return BNO055Dev(self, name)
+
+
+class BNO055Dev:
+    """Ein Sensor der Bank mit der Schnittstelle des Adafruit-Treibers (quaternion, i2c_device)."""
+
+    def __init__(self, bank, name):
+        self.bank = bank
+        self.name = name
+
+    def _read(self, reg, length):
+        value = self.bank.read([self.name], reg, length)[self.name][0]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    @property
+    def quaternion(self):
+        return decode_quaternion(self._read(REG_QUATERNION, QUATERNION_LEN))
+
+    @property
+    def i2c_device(self):
+        # Fuer hardware/fusion.read_burst: "with sensor.i2c_device as dev: dev.write_then_readinto(...)"
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def write_then_readinto(self, out_buf, in_buf):
+        in_buf[:] = self._read(out_buf[0], len(in_buf))
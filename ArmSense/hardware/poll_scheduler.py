@@ -0,0 +1,109 @@
+# hardware/poll_scheduler.py
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import q_angle_between
+
+# Ein Sensor gilt schon kurz vor Ablauf seines Intervalls als faellig. Sonst wuerde
+# Sweep-Jitter (Intervall knapp nicht erreicht) die effektive Rate halbieren.
+DUE_THRESHOLD = 0.9
+
+
+class _SensorState:
+    __slots__ = ("velocity", "last_poll", "last_q", "cost", "interval", "max_interval")
+
+    def __init__(self, default_cost, max_interval):
+        self.velocity = 0.0        # geglaettete Winkelgeschwindigkeit in Grad/s
+        self.last_poll = None      # Zeitpunkt des letzten Reads
+        self.last_q = None
+        self.cost = default_cost   # geglaettete Dauer eines Reads in Sekunden
+        self.interval = None       # geglaetteter Abstand zwischen zwei Reads
+        self.max_interval = max_interval  # Kuerzestes Intervall (1 / Obergrenze der Rate)
+
+
+class PollScheduler:
+    """
+    Entscheidet pro Sweep, welche Sensoren gelesen werden.
+
+    Jeder Sensor bekommt ein Ziel-Intervall aus seiner Winkelgeschwindigkeit:
+        intervall = resolution / velocity   (begrenzt auf 1/max_rate .. 1/min_rate)
+    Faellige Sensoren werden nach Dringlichkeit (wie weit ueberfaellig) sortiert
+    und so lange eingeplant, bis das I2C-Zeitbudget des Sweeps verbraucht ist.
+    """
+
+    def __init__(self, names, budget, min_rate, max_rate, resolution, smoothing=0.3, default_cost=0.002):
+        self.budget = budget
+        self.min_interval = 1.0 / min_rate
+        self.max_interval = 1.0 / max_rate
+        self.resolution = resolution
+        self.smoothing = smoothing
+        self.state = {name: _SensorState(default_cost, self.max_interval) for name in names}
+
+    def limit_rate(self, name, rate):
+        """Niedrigere Obergrenze fuer einen Sensor (z.B. Fusionsrate seines BNO055-Modus)."""
+        st = self.state[name]
+        st.max_interval = min(self.min_interval, max(self.max_interval, 1.0 / rate))
+
+    def target_interval(self, name):
+        st = self.state[name]
+        if st.velocity <= 0.0:
+            return self.min_interval
+        return max(st.max_interval, min(self.min_interval, self.resolution / st.velocity))
+
+    def select(self, now):
+        """Liste der Sensoren, die in diesem Sweep gelesen werden sollen."""
+        due = []
+        for name, st in self.state.items():
+            if st.last_poll is None:
+                urgency = float("inf")  # Noch nie gelesen
+            else:
+                urgency = (now - st.last_poll) / self.target_interval(name)
+            if urgency >= DUE_THRESHOLD:
+                due.append((urgency, name))
+        due.sort(reverse=True)
+
+        selected, spent = [], 0.0
+        for urgency, name in due:
+            cost = self.state[name].cost
+            # Der dringendste Sensor wird immer gelesen, sonst verhungert er bei zu kleinem Budget
+            if selected and spent + cost > self.budget:
+                continue
+            selected.append(name)
+            spent += cost
+        return selected
+
+    def update(self, name, q, now, cost):
+        """Meldet einen erfolgreichen Read (Quaternion, Zeitpunkt, Dauer)."""
+        st = self.state[name]
+        a = self.smoothing
+        st.cost += a * (cost - st.cost)
+
+        if st.last_poll is not None:
+            dt = now - st.last_poll
+            if dt > 0:
+                st.interval = dt if st.interval is None else st.interval + a * (dt - st.interval)
+                if st.last_q is not None:
+                    velocity = q_angle_between(q, st.last_q) / dt
+                    st.velocity += a * (velocity - st.velocity)
+        st.last_poll = now
+        st.last_q = q
+
+    def mark_failed(self, name, now, cost):
+        """Fehlgeschlagener Read: Zeit zaehlt, Geschwindigkeit bleibt unveraendert."""
+        st = self.state[name]
+        st.cost += self.smoothing * (cost - st.cost)
+        st.last_poll = now
+
+    def next_due(self, now):
+        """Sekunden bis der naechste Sensor faellig wird (0 = jetzt)."""
+        wait = float("inf")
+        for name, st in self.state.items():
+            if st.last_poll is None:
+                return 0.0
+            wait = min(wait, st.last_poll + DUE_THRESHOLD * self.target_interval(name) - now)
+        return max(0.0, wait) if self.state else 0.0
+
+    def rates(self):
+        """Effektive Leserate pro Sensor in Hz (geglaettet)."""
+        return {name: (1.0 / st.interval if st.interval else 0.0) for name, st in self.state.items()}
@@ -2,160 +2,542 @@
 import time
 import sys
 import os
-import board
-import busio
-import adafruit_bno055
-import adafruit_tca9548a
-import math  # Neu für die Berechnung des Differenzwinkels
+from functools import partial
+from collections import deque
 
 # Pfad-Fix
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import *
+import backends
+from metrics import SensorMetrics
 from utils import q_mult, q_conjugate
+from hardware.filters import build_chain, JumpFilter
+from frame import SensorFrame, DEFAULT_LAYOUT, FRESH, HELD, ERROR
+from hardware.bus_tuner import BusTuner, is_glitch
+from hardware.poll_scheduler import PollScheduler
+from hardware.calibration import CalibrationJob
+from hardware.deadline import DeadlineSweep
+from hardware.skew import SkewResampler
+from hardware import bno055_config, discovery
 
-try: JUMP_LIMIT = MAX_ANGLE_JUMP
-except NameError: JUMP_LIMIT = 20.0 
+IDENTITY = (1, 0, 0, 0)
 
 class SensorManager:
-    def __init__(self):
+    def __init__(self, use_hardware=True):
+        """use_hardware=False: Reiner Filter ohne Bus-Zugriff (Replay, Reprocessing, Tests)."""
+        self.use_hardware = use_hardware
         self.sensors = {}
         self.offsets = {}
         self.alignments = {} 
         self.dummy_mode = False
-        self.test_data_queue = [] # Neu: Warteschlange für hardcodierte Sensordaten im Test
+        self.test_data_queue = deque() # Warteschlange für hardcodierte Sensordaten (Tests, Reprocessing)
         
         # --- Speicher für Filterung ---
-        self.last_valid_data = {}
-        self.outlier_count = {}
+        self.last_valid_data = {}  # Letzte Ausgabe der Filter-Kette (fuer Sensoren ohne frischen Wert)
+        self.filters = {}          # Filter-Kette pro Sensor (FILTER_CHAIN / FILTER_CHAINS)
+        self.last_raw = {}  # Rohdaten des letzten get_data() (vor Nullpunkt/Filter, fuer Aufzeichnung)
+        self.last_read = {}  # Zeitpunkt (perf_counter) des letzten frischen Werts pro Sensor
+        self.stale = {}      # Sensoren, deren faelliger Read keinen Wert lieferte -> Alter in Sekunden
+        self._missed = set() # ... bis zum naechsten frischen Wert (Scheduler-Pausen zaehlen nicht)
+        self.sample_times = {}  # Read-Zeitpunkt (perf_counter) jedes frischen Rohwerts im letzten Frame
+        self.frame_time = None  # Gemeinsamer Zeitpunkt des letzten Frames (mit SKEW_COMPENSATION)
+        self.resampler = SkewResampler(SENSOR_MAPPING.keys(), SKEW_HISTORY) if SKEW_COMPENSATION else None
         
         self.calib_cycle = 0 
+        self.calibration_version = 0  # Zaehlt jede Aenderung von Nullpunkt/Ausrichtung (Keyframes der Aufnahme)
+        self.calib_job = None  # Laufende Kalibrierung (sammelt Samples aus get_data)
+        self.hw = None  # Hardware-Backend (Blinka), wird erst beim Start geladen
+        self.i2c = None
+        self.muxes = {}  # TCA9548A pro Multiplexer-Adresse (Blinka)
+        self.bus_frequency = None
+        self.tuner = None
+        self.bank = None      # BNO055Bank beim i2cdev-Backend (Reads als I2C_RDWR-ioctl)
+        self.topology = None  # Gefundene Sensoren (hardware/discovery.py), einmal pro Start
+        self.scheduler = None
+        self.sweeper = None
+        self.fusion = None
+        self.raw_log = None
+        # Metriken nur fuer echte Akquisition (Replay/Reprocessing verfaelschen sonst die Zaehler)
+        self.metrics = SensorMetrics(SENSOR_MAPPING.keys()) if use_hardware else None
+        # Modus, Achsen-Remap und Einheiten pro Sensor (BNO055_SETUP). Montagen, die der Chip
+        # nicht abbilden kann, rechnet get_data() auf dem Host (host_mounts).
+        self.setups = bno055_config.resolve_all(SENSOR_MAPPING, BNO055_SETUP, FUSION_MODE == "host", BNO055_MODE)
+        self.host_mounts = {name: s.host_mount for name, s in self.setups.items() if s.host_mount}
+        if FUSION_MODE == "host":
+            # Lazy Import: numpy wird nur fuer die Host-Fusion gebraucht
+            from hardware.fusion import MadgwickBank, DATA_LEN, read_burst, decode_burst, unit_scales
+            self.fusion = MadgwickBank(SENSOR_MAPPING.keys(), FUSION_BETA, FUSION_GAINS, use_mag=FUSION_USE_MAG)
+            self._read_burst = read_burst
+            self._decode_burst = decode_burst
+            self._burst_buf = bytearray(DATA_LEN)
+            self._burst_scales = {name: unit_scales(s.unit_sel) for name, s in self.setups.items()}
+        if POLL_SCHEDULER:
+            self.scheduler = PollScheduler(SENSOR_MAPPING.keys(), POLL_SWEEP_BUDGET, POLL_MIN_RATE,
+                                           POLL_MAX_RATE, POLL_RESOLUTION)
+            for name, setup in self.setups.items():
+                # Schneller als die Fusionsrate des Modus (z.B. COMPASS 20 Hz) gibt es nichts Neues
+                if setup.fusion_rate:
+                    self.scheduler.limit_rate(name, setup.fusion_rate)
         
         for name in SENSOR_MAPPING.keys():
             self.offsets[name] = (1, 0, 0, 0)
             self.alignments[name] = (1, 0, 0, 0)
             self.last_valid_data[name] = (1, 0, 0, 0)
-            self.outlier_count[name] = 0
+            self.filters[name] = build_chain(FILTER_CHAINS.get(name, FILTER_CHAIN),
+                                             on_reject=partial(self._count, "rejects", name),
+                                             on_forced=partial(self._count, "forced", name))
         
+        if not use_hardware:
+            self.dummy_mode = True
+            return
+
         try:
-            # I2C Initialisierung (10kHz für Stabilität)
-            self.i2c = busio.I2C(board.SCL, board.SDA, frequency=10000)
-            self.tca = adafruit_tca9548a.TCA9548A(self.i2c, address=MUX_ADDRESS)
-            self._init_sensors()
+            # Blinka erst hier laden: Ohne Pi-Bibliotheken direkt in den Dummy-Modus
+            self.hw = backends.get("hardware", HARDWARE_BACKEND)
+
+            # I2C Initialisierung (I2C_FREQ, optional automatisch getunt)
+            # Mit Tuning: Sensoren einmal initialisieren, danach wechselt der Tuner nur noch den Bus-Takt
+            self._open_bus(min(I2C_FREQ_CANDIDATES) if I2C_AUTOTUNE else I2C_FREQ)
+            if I2C_AUTOTUNE and hasattr(self.hw, "i2cdev"):
+                # /dev/i2c-N hat keinen Takt-Parameter: gemessene Stufen waeren nie gesetzt worden
+                print("[I2C] Auto-Tuning aus: Takt legt der Kernel-Treiber fest (dtparam=i2c_arm_baudrate)")
+            elif I2C_AUTOTUNE:
+                self.tuner = BusTuner(self._set_frequency, self._read_all, I2C_FREQ_CANDIDATES,
+                                      error_budget=I2C_ERROR_BUDGET, samples=I2C_TUNE_SAMPLES,
+                                      window=I2C_ERROR_WINDOW, retune_interval=I2C_RETUNE_INTERVAL)
+                self.tuner.tune()
         except Exception as e:
             print(f"[HAL] Hardware Fehler: {e}")
             self.dummy_mode = True
 
+        if not self.dummy_mode and SWEEP_DEADLINE:
+            # Ab hier laufen alle Reads im Bus-Worker (nach dem Tuning, das selbst liest)
+            self.sweeper = DeadlineSweep(SWEEP_DEADLINE)
+
         if not self.dummy_mode:
             print("[HAL] Warte auf Sensoren...")
             time.sleep(1.0)
             self.calibrate_zero()
 
+    def _count(self, counter, name):
+        """Metrik-Hook der Filter-Kette (Jump-Filter verwirft / erzwingt einen Wert)."""
+        if self.metrics: getattr(self.metrics, counter)[name].inc()
+
+    def _open_bus(self, frequency):
+        """Initialisiert I2C-Bus, Multiplexer und Sensoren mit der angegebenen Frequenz."""
+        hw = self.hw
+        if hasattr(hw, "i2cdev"):
+            # Frequenz legt hier der Kernel-Treiber fest (dtparam=i2c_arm_baudrate)
+            try:
+                self.i2c = hw.i2cdev.I2CDev(I2C_BUS, max_reads=I2C_DEV_MAX_READS)
+            except OSError as e:
+                print(f"[HAL] /dev/i2c-{I2C_BUS} nicht nutzbar ({e}), weiter mit Blinka")
+                self.hw = hw = backends.get("hardware", "blinka")
+        if not hasattr(hw, "i2cdev"):
+            self.i2c = hw.busio.I2C(hw.board.SCL, hw.board.SDA, frequency=frequency)
+            self.bus_frequency = frequency
+            # Ein TCA9548A pro Adresse in SENSOR_MAPPING; ein Kanal schaltet beim Freigeben
+            # seinen Mux wieder ab, gleiche Sensor-Adressen an zwei Muxen stoeren sich nicht
+            muxes = {discovery.position(value)[0] for value in SENSOR_MAPPING.values()}
+            self.muxes = {mux: hw.mux.TCA9548A(self.i2c, address=mux) for mux in sorted(muxes)}
+        if DISCOVERY and self.topology is None:
+            self.topology = discovery.discover({I2C_BUS: self.i2c}, DISCOVERY_CACHE,
+                                               required=[discovery.position(v) for v in SENSOR_MAPPING.values()])
+        self.sensors = {}
+        self._init_sensors()
+
+    def _set_frequency(self, frequency):
+        """
+        Aendert nur den Bus-Takt (BusTuner). Multiplexer und BNO055-Objekte bleiben bestehen:
+        kein Chip-Reset, Onboard-Fusion und Kalibrierung bleiben gueltig.
+        """
+        hw = self.hw
+        self.i2c.deinit()  # Gleiche Pins: alten Bus zuerst freigeben
+        try:
+            i2c = hw.busio.I2C(hw.board.SCL, hw.board.SDA, frequency=frequency)
+        except Exception:
+            # Bisherigen Takt wiederherstellen, damit die Sensoren erreichbar bleiben
+            i2c = self.i2c = hw.busio.I2C(hw.board.SCL, hw.board.SDA, frequency=self.bus_frequency)
+            for tca in self.muxes.values():
+                tca.i2c = i2c
+            raise
+        # Die TCA9548A-Kanaele (und damit alle Sensoren) greifen ueber tca.i2c auf den Bus zu
+        self.i2c = i2c
+        for tca in self.muxes.values():
+            tca.i2c = i2c
+        self.bus_frequency = frequency
+
+    def _read_all(self):
+        """Liest jeden Sensor einmal (fuer den BusTuner). Fehler werden als Exception zurueckgegeben."""
+        values = []
+        for name in self.sensors:
+            try:
+                value = self._read_sensor(name)
+                # Host-Fusion: Sensoren laufen im AMG-Modus (Quaternion-Register = 0), der Burst zaehlt als OK
+                values.append(IDENTITY if self.fusion else value)
+            except Exception as e:
+                values.append(e)
+        return values
+
     def _init_sensors(self):
-        for name, channel in SENSOR_MAPPING.items():
+        positions = {name: discovery.position(value) for name, value in SENSOR_MAPPING.items()}
+        address = {name: BNO_ADDRESS for name in SENSOR_MAPPING}
+        if self.topology is not None:
+            for name, (mux, channel) in positions.items():
+                entry = discovery.find(self.topology, channel, mux)
+                if entry is None:
+                    print(f"[HAL] Sensor '{name}' nicht gefunden ({discovery.where(mux, channel)})")
+                    del address[name]
+                else:
+                    address[name] = entry["address"]
+            for entry in discovery.unmapped(self.topology):
+                print(f"[HAL] BNO055 an {discovery.where(entry['mux'], entry['channel'])} "
+                      f"ist nicht in SENSOR_MAPPING eingetragen")
+
+        if hasattr(self.hw, "i2cdev"):
+            self._init_bank(address, positions)
+            return
+
+        for name, (mux, channel) in positions.items():
+            if name not in address:
+                continue
             try:
-                bno = adafruit_bno055.BNO055_I2C(self.tca[channel], address=BNO_ADDRESS)
+                bno = self.hw.bno055.BNO055_I2C(self.muxes[mux][channel], address=address[name])
+                # Remap/Einheiten haben im Adafruit-Treiber keine Properties: direkt ins Register
+                bno055_config.apply(bno._write_register, self.setups[name])
                 self.sensors[name] = bno
-            except: pass
+            except Exception as e:
+                print(f"[HAL] Sensor '{name}' ({discovery.where(mux, channel)}) nicht initialisiert: {e}")
+
+    def _init_bank(self, address, positions):
+        """i2cdev-Backend: Alle Sensoren als Bank am Multiplexer."""
+        i2cdev = self.hw.i2cdev
+        for name in list(address):
+            if positions[name][0] != MUX_ADDRESS:
+                print(f"[HAL] Sensor '{name}' ({discovery.where(*positions[name])}) nicht initialisiert: "
+                      f"i2cdev-Backend nur an MUX_ADDRESS 0x{MUX_ADDRESS:02X}")
+                del address[name]
+        self.bank = i2cdev.BNO055Bank(self.i2c, MUX_ADDRESS,
+                                      {name: (positions[name][1], address[name]) for name in address},
+                                      group_channels=I2C_DEV_GROUP_CHANNELS)
+        if self.fusion:
+            from hardware.fusion import REG_DATA_START, DATA_LEN
+            self._bank_register = (REG_DATA_START, DATA_LEN)
+        else:
+            self._bank_register = (i2cdev.REG_QUATERNION, i2cdev.QUATERNION_LEN)
+            self._decode_quaternion = i2cdev.decode_quaternion
+        for name in address:
+            try:
+                bno055_config.apply(self.bank.writer(name), self.setups[name])
+                self.sensors[name] = self.bank.sensor(name)
+            except OSError as e:
+                print(f"[HAL] Sensor '{name}' ({discovery.where(*positions[name])}) nicht initialisiert: {e}")
+
+    def _start_calibration(self, kind, samples):
+        running = self.calib_job
+        if running:
+            # Nicht ueberschreiben: die Vorwaerts-Ausrichtung braucht den fertigen Nullpunkt,
+            # und ein Nachholen wuerde Samples der falschen Haltung sammeln
+            print(f"[HAL] Kalibrierung '{kind}' abgelehnt: '{running.kind}' laeuft noch ({running.progress:.0%})")
+            return False
+        # Ohne Hardware und ohne Testdaten gibt es nichts zu kalibrieren (Replay liefert Daten ueber process())
+        if self.dummy_mode and self.use_hardware and not self.test_data_queue: return False
+        names = list(SENSOR_MAPPING.keys()) if self.dummy_mode else list(self.sensors.keys())
+        self.calib_job = CalibrationJob(kind, names, samples or CALIB_SAMPLES, CALIB_MAX_DEVIATION)
+        return True
 
-    def calibrate_zero(self):
-        """Schritt 1: Arm hängt entspannt (Gravitations-Referenz)"""
+    def calibrate_zero(self, samples=None):
+        """
+        Schritt 1: Arm hängt entspannt (Gravitations-Referenz)
+        Startet die Kalibrierung nur; die Samples kommen aus den naechsten get_data() Aufrufen.
+        False, wenn noch eine andere Kalibrierung laeuft (sie wird nicht ersetzt).
+        """
         print("[HAL] Kalibriere Nullpunkt (Arm haengt)...")
-        if self.dummy_mode: return
+        return self._start_calibration("zero", samples)
 
-        for name, sensor in self.sensors.items():
-            try:
-                q = sensor.quaternion
-                if q and q[0] is not None:
-                    # Speichert die Inverse als Nullpunkt-Offset
-                    self.offsets[name] = q_conjugate(q)
-                    self.alignments[name] = (1, 0, 0, 0) 
-            except: pass
-        print("[HAL] Nullpunkt gesetzt.")
-
-    def calibrate_forward(self):
-        """Schritt 2: Arm zeigt 90° nach vorne (Kompensiert schräge Montage)"""
-        if self.dummy_mode: return
+    def calibrate_forward(self, samples=None):
+        """Schritt 2: Arm zeigt 90° nach vorne (Kompensiert schräge Montage). Ebenfalls asynchron."""
         print("[HAL] Kalibriere Vorwärts-Ausrichtung...")
-        
-        # Aktuelle Daten ohne Alignment holen
-        current_data = self.get_data(raw_align=True)
-        # Ziel: Arm zeigt waagerecht nach vorne (90° um Y-Achse)
-        q_target = (0.7071, 0.0, 0.7071, 0.0) 
-        
-        for name_key in self.sensors.keys():
-            q_measured = current_data.get(name_key, (1,0,0,0))
-            # Alignment berechnen: q_align = q_target * inv(q_measured)
-            q_inv = q_conjugate(q_measured)
-            self.alignments[name_key] = q_mult(q_target, q_inv)
+        return self._start_calibration("forward", samples)
+
+    def calibration_status(self):
+        """(Art, Fortschritt 0..1) der laufenden Kalibrierung oder None."""
+        job = self.calib_job
+        return (job.kind, job.progress) if job else None
+
+    def _finish_calibration(self, job):
+        """Berechnet die robusten Mittelwerte und setzt die Kalibrierung atomar."""
+        means = job.result()
+        offsets = dict(self.offsets)
+        alignments = dict(self.alignments)
+
+        for name, (q_mean, used) in means.items():
+            if job.kind == "zero":
+                # Speichert die Inverse als Nullpunkt-Offset
+                offsets[name] = q_conjugate(q_mean)
+                alignments[name] = (1, 0, 0, 0)
+            else:
+                # Ziel: Arm zeigt waagerecht nach vorne (90° um Y-Achse)
+                q_target = (0.7071, 0.0, 0.7071, 0.0)
+                # Alignment berechnen: q_align = q_target * inv(q_measured)
+                alignments[name] = q_mult(q_target, q_conjugate(q_mean))
+            # Sprung durch neue Kalibrierung nicht als Glitch verwerfen, Glaettung neu beginnen
+            self.filters[name].restart()
+
+        self.set_calibration(offsets, alignments)
 
-        print("[HAL] Ausrichtung für ungenaue Montage kompensiert.")
+        skipped = [name for name in job.samples if name not in means]
+        if skipped:
+            print(f"[HAL] Nicht kalibriert (Arm unruhig / keine Daten): {', '.join(skipped)}")
+        if job.kind == "zero":
+            print("[HAL] Nullpunkt gesetzt.")
+        else:
+            print("[HAL] Ausrichtung für ungenaue Montage kompensiert.")
+
+    def get_filter_state(self):
+        """Kopie des Filter-Zustands (JSON-tauglich) fuer Keyframes in Aufzeichnungen."""
+        return {
+            "last_valid": {name: list(q) for name, q in self.last_valid_data.items()},
+            "filters": {name: chain.get_state() for name, chain in self.filters.items()},
+            "offsets": {name: list(q) for name, q in self.offsets.items()},
+            "alignments": {name: list(q) for name, q in self.alignments.items()},
+        }
+
+    def set_filter_state(self, state):
+        """Stellt einen mit get_filter_state() gesicherten Zustand wieder her."""
+        self.last_valid_data = {name: tuple(q) for name, q in state["last_valid"].items()}
+        if "filters" in state:
+            for name, chain_state in state["filters"].items():
+                if name in self.filters:
+                    self.filters[name].set_state(chain_state)
+        else:
+            # Keyframes aus Aufzeichnungen vor der Filter-Kette: nur Jump-Filter-Zustand
+            for name, chain in self.filters.items():
+                chain.restart()
+                jump = chain.stage(JumpFilter)
+                if jump and name in state["outliers"]:
+                    jump.set_state({"last": self.last_valid_data[name], "outliers": state["outliers"][name]})
+        self.set_calibration({name: tuple(q) for name, q in state["offsets"].items()},
+                             {name: tuple(q) for name, q in state["alignments"].items()})
+        self.calib_job = None
+
+    def set_calibration(self, offsets, alignments):
+        """Setzt Nullpunkt und Ausrichtung (neue Dicts) und erhoeht calibration_version."""
+        # Ein Zuweisungsschritt: Leser sehen entweder alte oder neue Kalibrierung
+        self.offsets, self.alignments = offsets, alignments
+        self.calibration_version += 1
+
+    def get_calibration_version(self):
+        """Aendert sich mit jeder Kalibrierung (SessionWriter schreibt dann einen Keyframe)."""
+        return self.calibration_version
 
     def inject_test_data(self, data_list):
-        """Injiziert eine Liste von Dictionaries mit Sensordaten für den Dummy-Modus."""
-        self.test_data_queue = data_list
+        """Injiziert eine Liste von Dictionaries mit Sensordaten für den Dummy-Modus (wird kopiert)."""
+        self.test_data_queue = deque(data_list)  # popleft() statt pop(0): O(1) pro Frame
+        self.calib_job = None  # Kalibrierung der vorherigen Quelle verwerfen
         # Wichtig: Wir aktivieren den Dummy-Modus, damit keine Hardware gepollt wird
         self.dummy_mode = True
 
+    def start_raw_log(self):
+        """Zeichnet ab jetzt die Rohdaten jedes Sweeps auf (nur FUSION_MODE = "host")."""
+        if not self.fusion:
+            print("[HAL] Rohdaten-Aufnahme nur mit FUSION_MODE = 'host' moeglich.")
+            return
+        from hardware.fusion import RawLog
+        self.raw_log = RawLog(self.fusion.names)
+
+    def save_raw_log(self, path):
+        """Speichert die Rohdaten-Aufnahme als .npz (fuer python hardware/fusion.py)."""
+        log, self.raw_log = self.raw_log, None
+        if log is None or not len(log):
+            return
+        log.save(path)
+        print(f"[HAL] {len(log)} Rohdaten-Sweeps gespeichert: {path}")
+
+    def get_poll_rates(self):
+        """Effektive Leserate pro Sensor in Hz (nur mit POLL_SCHEDULER, sonst leer)."""
+        return self.scheduler.rates() if self.scheduler else {}
+
+    def next_poll_delay(self):
+        """Sekunden, bis der PollScheduler wieder einen Sensor lesen will (ohne Scheduler 0)."""
+        if self.scheduler and not self.dummy_mode:
+            return self.scheduler.next_due(time.perf_counter())
+        return 0.0
+
+    def get_stale(self):
+        """Sensoren, deren faelliger Read (noch) keinen frischen Wert lieferte -> Alter in Sekunden."""
+        return dict(self.stale)
+
+    def get_sample_times(self):
+        """Read-Zeitpunkt (perf_counter) jedes frisch gelesenen Sensors im letzten Frame."""
+        return dict(self.sample_times)
+
+    def get_sweep_stats(self):
+        """Deadline-Statistik (Sweeps, gerissene Deadlines, verschobene Reads), nur mit SWEEP_DEADLINE."""
+        return self.sweeper.stats() if self.sweeper else {}
+
+    def _read_sensor(self, name):
+        sensor = self.sensors[name]
+        if self.fusion:
+            # Host-Fusion: ACC/MAG/GYR in einer Transaktion, Zeitstempel fuer dt
+            return (time.perf_counter(),) + self._read_burst(sensor, self._burst_buf, self._burst_scales[name])
+        return sensor.quaternion
+
+    def _sweep(self, names):
+        """Liest die Sensoren; {name: (Wert oder Exception, Zeitpunkt, Dauer)}."""
+        if self.sweeper:
+            # Mit Zeitbudget: Verschobene/haengende Sensoren fehlen im Ergebnis
+            return self.sweeper.run({name: lambda n=name: self._read_sensor(n) for name in names})
+        if self.bank:
+            # i2cdev: Kanalwahl nur bei Wechsel, Reads eines Kanals gebuendelt
+            results = {}
+            for name, (value, t_end, cost) in self.bank.read(names, *self._bank_register).items():
+                if not isinstance(value, Exception):
+                    if self.fusion:
+                        value = (t_end - cost,) + self._decode_burst(value, self._burst_scales[name])
+                    else:
+                        value = self._decode_quaternion(value)
+                results[name] = (value, t_end, cost)
+            return results
+        results = {}
+        for name in names:
+            t_start = time.perf_counter()
+            try:
+                value = self._read_sensor(name)
+            except Exception as e:
+                value = e
+            t_end = time.perf_counter()
+            results[name] = (value, t_end, t_end - t_start)
+        return results
+
     def get_data(self, raw_align=False):
-        data = {}
-        
         # 1. Rohdaten sammeln (Entweder aus Test-Queue oder echter Hardware)
         raw_sensor_data = {}
+        skipped = ()  # Vom PollScheduler bewusst nicht gelesen (nicht faellig)
         if self.dummy_mode: 
             if self.test_data_queue:
                 # Nimm das nächste Element aus der Warteschlange
-                raw_sensor_data = self.test_data_queue.pop(0)
+                raw_sensor_data = self.test_data_queue.popleft()
             else:
                 raw_sensor_data = {"base": (1,0,0,0), "arm": (1,0,0,0)}
         else:
-            for name, sensor in self.sensors.items():
-                try:
-                    q_raw = sensor.quaternion
-                    if q_raw and q_raw[0] is not None:
-                        raw_sensor_data[name] = q_raw
-                except: pass
-        
+            if self.scheduler:
+                # Nur faellige Sensoren lesen, Rest behaelt den letzten gueltigen Wert
+                now = time.perf_counter()
+                poll_names = [n for n in self.scheduler.select(now) if n in self.sensors]
+                skipped = self.sensors.keys() - set(poll_names)
+            else:
+                poll_names = self.sensors.keys()
+
+            timing = {}
+            bursts = {}
+            m = self.metrics
+            for name, (value, t_end, cost) in self._sweep(poll_names).items():
+                timing[name] = (t_end, cost)
+                if isinstance(value, Exception):
+                    ok = False
+                elif self.fusion:
+                    bursts[name] = value
+                    ok = True
+                else:
+                    if value and value[0] is not None:
+                        raw_sensor_data[name] = value
+                    ok = not is_glitch(value)
+                if self.tuner: self.tuner.record(ok)
+                if m:
+                    m.reads[name].inc()
+                    m.latency[name].observe(cost)
+                    if not ok: m.errors[name].inc()
+            # Waehrend ein haengender Read den Bus belegt, wird er nicht neu initialisiert
+            if self.tuner and not (self.sweeper and self.sweeper.busy): self.tuner.maintain()
+            if m:
+                if self.tuner: m.bus_frequency.set(self.tuner.frequency)
+                if self.sweeper: m.deadline_misses.labels().value = self.sweeper.misses
+
+            if self.fusion:
+                # Ein vektorisierter Filterschritt fuer alle gelesenen Sensoren
+                raw_sensor_data = self.fusion.step(bursts, self.raw_log)
+
+            for name, mount in self.host_mounts.items():
+                # Montage ohne passenden Chip-Remap: q_segment = q_sensor * mount
+                if name in raw_sensor_data:
+                    raw_sensor_data[name] = q_mult(raw_sensor_data[name], mount)
+
+            # Zeitpunkt jedes Reads: Mitte der Transaktion
+            self.sample_times = {name: timing[name][0] - timing[name][1] / 2 for name in raw_sensor_data}
+
+            if self.scheduler:
+                for name, (t_end, cost) in timing.items():
+                    if name in raw_sensor_data:
+                        # Geplanter Leseabstand (vor update): so weit darf der Jump-Filter das Limit oeffnen
+                        jump = self.filters[name].stage(JumpFilter)
+                        if jump: jump.interval = self.scheduler.target_interval(name)
+                        self.scheduler.update(name, raw_sensor_data[name], t_end, cost)
+                    else:
+                        self.scheduler.mark_failed(name, t_end, cost)
+
+            if self.resampler:
+                # Alle Sensoren auf einen gemeinsamen Zeitpunkt (statt nacheinander gelesen)
+                self.frame_time, raw_sensor_data = self.resampler.resample(self.sample_times, raw_sensor_data)
+
+        # Veraltet ist ein Sensor erst, wenn ein faelliger Read fehlschlug, verschoben oder
+        # abgebrochen wurde - nicht, weil der Scheduler ihn (ruhig) seltener liest
+        now = time.perf_counter()
+        for name in raw_sensor_data:
+            self.last_read[name] = now
+        self._missed.difference_update(raw_sensor_data)
+        self._missed.update(name for name in SENSOR_MAPPING if name not in raw_sensor_data and name not in skipped)
+        self.stale = {name: now - self.last_read.get(name, now) for name in SENSOR_MAPPING if name in self._missed}
+        if self.metrics:
+            self.metrics.frames.inc()
+            for name in self.stale:
+                self.metrics.stale[name].inc()
+
+        return self.process(raw_sensor_data, raw_align, self.frame_time if self.resampler else now)
+
+    def process(self, raw_sensor_data, raw_align=False, t=None):
+        """
+        Wendet Nullpunkt, Ausrichtung und Filter-Kette auf einen Satz Rohdaten an.
+        Wird von get_data() benutzt und vom Replay, das aufgezeichnete Rohdaten neu filtert.
+        t: Zeitpunkt des Frames in Sekunden (fuer zeitabhaengige Stufen; None = nominelle Rate).
+        """
+        data = SensorFrame(DEFAULT_LAYOUT, t)
+
         # 2. Filterung und Kalibrierung auf die gesammelten Rohdaten anwenden
-        for name in SENSOR_MAPPING.keys():
+        zeroed_data = {}
+        for i, name in enumerate(DEFAULT_LAYOUT.names):
             try:
                 if name in raw_sensor_data:
                     q_raw = raw_sensor_data[name]
                     
-                    # 1. Nullpunkt anwenden
-                    offset = self.offsets.get(name, (1,0,0,0))
-                    q_zeroed = q_mult(offset, q_raw)
+                    # 1. Nullpunkt anwenden (ohne Kalibrierung: Einheits-Quaternion, nichts zu rechnen)
+                    offset = self.offsets.get(name, IDENTITY)
+                    q_zeroed = q_raw if offset == IDENTITY else q_mult(offset, q_raw)
+                    zeroed_data[name] = q_zeroed
                     
                     # 2. Montage-Korrektur anwenden
-                    if raw_align:
-                        q_final = q_zeroed
-                    else:
-                        align = self.alignments.get(name, (1,0,0,0))
-                        q_final = q_mult(align, q_zeroed)
-                    
-                    # --- JUMP-FILTER (GLITCH PROTECTION) ---
-                    q_last = self.last_valid_data.get(name, q_final)
-                    
-                    # Berechne den Winkel-Unterschied zum letzten Frame
-                    # q_rel = q_final * inv(q_last)
-                    q_rel = q_mult(q_final, q_conjugate(q_last))
-                    # Clamp für mathematische Stabilität
-                    w = max(-1.0, min(1.0, q_rel[0]))
-                    diff_angle = 2.0 * math.degrees(math.acos(abs(w)))
+                    align = IDENTITY if raw_align else self.alignments.get(name, IDENTITY)
+                    q_final = q_zeroed if align == IDENTITY else q_mult(align, q_zeroed)
                     
-                    if diff_angle > JUMP_LIMIT and self.outlier_count[name] < MAX_OUTLIERS:
-                        # Sprung ist zu groß -> Behalte den alten Wert bei
-                        data[name] = q_last
-                        self.outlier_count[name] += 1
-                    else:
-                        # Normaler Wert oder Limit für Ausreißer erreicht -> Akzeptieren
-                        data[name] = q_final
-                        self.last_valid_data[name] = q_final
-                        self.outlier_count[name] = 0
+                    # --- FILTER-KETTE (Standard: Jump-Filter gegen Glitches) ---
+                    q_out = self.filters[name].apply(q_final, t)
+                    data.set(i, q_out, FRESH)
+                    self.last_valid_data[name] = q_out
                 else:
                     # Falls Sensor keine Daten liefert -> Letzten gültigen Wert nehmen
-                    data[name] = self.last_valid_data.get(name, (1,0,0,0))
+                    data.set(i, self.last_valid_data.get(name, IDENTITY), HELD)
             except Exception as e:
                 # Falls in der Mathe ein Fehler passiert -> Letzten gültigen Wert
-                data[name] = self.last_valid_data.get(name, (1,0,0,0))
-        
+                data.set(i, self.last_valid_data.get(name, IDENTITY), ERROR)
+                if self.metrics: self.metrics.filter_errors[name].inc()
+
+        # 3. Laufende Kalibrierung mit Samples aus diesem Frame fuettern
+        job = self.calib_job
+        if job:
+            job.add(raw_sensor_data if job.kind == "zero" else zeroed_data)
+            if job.done:
+                self.calib_job = None
+                self._finish_calibration(job)
+
+        self.last_raw = raw_sensor_data
         return data
\ No newline at end of file
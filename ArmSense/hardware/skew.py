@@ -0,0 +1,55 @@
+# hardware/skew.py
+import sys
+import os
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import q_slerp
+
+
+class SkewResampler:
+    """
+    Gleicht den Zeitversatz zwischen den Sensoren eines Sweeps aus (SKEW_COMPENSATION).
+
+    Die Sensoren werden nacheinander gelesen; bei 10 kHz liegen zwischen "base" und "arm"
+    mehrere Millisekunden. Jeder Read wird mit seinem eigenen Zeitpunkt in einer kurzen
+    Historie abgelegt und alle Sensoren werden per SLERP auf einen gemeinsamen Zeitpunkt
+    gebracht: den aeltesten frischen Read des Sweeps. So wird nur interpoliert, nie
+    extrapoliert; die Ausgabe ist dafuer bis zu einem Sweep alt.
+    """
+
+    def __init__(self, names, history=4):
+        self.history = {name: deque(maxlen=max(2, history)) for name in names}
+
+    def add(self, name, t, q):
+        h = self.history[name]
+        if h and t <= h[-1][0]:
+            return  # Nicht monoton (z.B. doppelt gemeldeter Read)
+        h.append((t, q))
+
+    def sample(self, name, t):
+        """Orientierung eines Sensors zum Zeitpunkt t aus seiner Historie (an den Raendern gehalten)."""
+        h = self.history[name]
+        if not h:
+            return None
+        t1, q1 = h[-1]
+        if t >= t1:
+            return q1
+        for i in range(len(h) - 2, -1, -1):
+            t0, q0 = h[i]
+            if t >= t0:
+                return q_slerp(q0, q1, (t - t0) / (t1 - t0))
+            t1, q1 = t0, q0
+        return q1
+
+    def resample(self, times, samples):
+        """
+        samples = {name: q} mit Read-Zeitpunkten times = {name: t}.
+        Rueckgabe: (gemeinsamer Zeitpunkt, {name: q zu diesem Zeitpunkt}).
+        """
+        for name, q in samples.items():
+            self.add(name, times[name], q)
+        if not samples:
+            return None, {}
+        t_common = min(times[name] for name in samples)
+        return t_common, {name: self.sample(name, t_common) for name in samples}
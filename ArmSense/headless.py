@@ -0,0 +1,295 @@
+# headless.py
+"""
+Headless-Betrieb (main.py --headless): Akquisition und Posen-Erkennung ohne Grafik.
+
+Der Loop laeuft ohne Taktbremse so schnell, wie SensorManager.get_data() Frames liefert.
+Frames und Posen-Ereignisse gehen als JSON-Zeilen oder binaer an stdout, eine Datei oder
+einen TCP-Socket; Kalibrier-Kommandos kommen zeilenweise ueber einen Steuer-Socket:
+
+    echo zero | nc 127.0.0.1 9106       # Nullpunkt (Arm haengt)
+    echo forward | nc 127.0.0.1 9106    # Ausrichtung (Arm vorne)
+    echo status | nc 127.0.0.1 9106     # JSON: Frames, Rate, Pose, Kalibrierung
+    echo rom | nc 127.0.0.1 9106        # JSON: Bewegungsumfang seit Start (rom_stats.py)
+
+Binaerformat: Pakete aus transport/net_stream.py (Namen, Frames, Ereignisse als JSON),
+jeweils mit 4 Byte Laenge (little endian) davor.
+"""
+import sys
+import os
+import json
+import time
+import queue
+import socket
+import struct
+import threading
+import socketserver
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config import *
+from frame import FRESH
+from pose_detector import POSES
+from rom_stats import RomStats
+from transport.net_stream import FrameEncoder
+
+_LENGTH = struct.Struct("<I")
+COMMANDS = ("zero", "forward", "status", "rom", "quit")
+
+
+def open_output(target):
+    """'-' = stdout, 'tcp://host:port' = Verbindung zu einem Empfaenger, sonst Dateipfad."""
+    if target in (None, "-"):
+        return sys.stdout.buffer
+    if target.startswith("tcp://"):
+        host, _, port = target[len("tcp://"):].rpartition(":")
+        sock = socket.create_connection((host or "127.0.0.1", int(port)))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock.makefile("wb")
+    return open(target, "ab")
+
+
+class JsonLinesSink:
+    """Ein JSON-Objekt pro Zeile: {"type": "frame" | "pose" | "command", "t": ..., ...}."""
+
+    def __init__(self, stream, sensor_names):
+        self.stream = stream
+        self.sensor_names = list(sensor_names)
+
+    def _write(self, obj):
+        self.stream.write(json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    def frame(self, data, timestamp, pose_id, angles):
+        obj = {"type": "frame", "t": timestamp, "pose": pose_id, "angles": [round(a, 2) for a in angles],
+               "q": {name: [round(v, 5) for v in data.get(name, (1.0, 0.0, 0.0, 0.0))] for name in self.sensor_names}}
+        flags = getattr(data, "flags", None)
+        if flags is not None:
+            held = [name for name, flag in zip(data.layout.names, flags) if flag != FRESH]
+            if held:
+                obj["held"] = held
+        self._write(obj)
+
+    def event(self, kind, timestamp, **fields):
+        self._write(dict(type=kind, t=timestamp, **fields))
+
+    def flush(self):
+        self.stream.flush()
+
+
+class BinarySink:
+    """net_stream-Pakete mit Laengen-Praefix; Sensornamen einmal am Anfang."""
+
+    def __init__(self, stream, sensor_names):
+        self.stream = stream
+        self.encoder = FrameEncoder(sensor_names)
+        self._write(self.encoder.encode_names())
+
+    def _write(self, packet):
+        self.stream.write(_LENGTH.pack(len(packet)) + packet)
+
+    def frame(self, data, timestamp, pose_id, angles):
+        self._write(self.encoder.encode(data, timestamp))
+
+    def event(self, kind, timestamp, **fields):
+        self._write(self.encoder.encode_event(dict(type=kind, **fields), timestamp))
+
+    def flush(self):
+        self.stream.flush()
+
+
+SINKS = {"json": JsonLinesSink, "binary": BinarySink}
+
+
+def read_binary(stream):
+    """Liest einen Binaer-Mitschnitt; liefert die Pakete (fuer net_stream.decode)."""
+    while True:
+        head = stream.read(_LENGTH.size)
+        if len(head) < _LENGTH.size:
+            return
+        yield stream.read(_LENGTH.unpack(head)[0])
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            cmd = line.decode("utf-8", "replace").strip().lower()
+            if not cmd:
+                continue
+            if cmd not in COMMANDS:
+                reply = {"ok": False, "error": f"Unbekanntes Kommando (erlaubt: {', '.join(COMMANDS)})"}
+            elif cmd == "status":
+                reply = dict(self.server.control.status, ok=True)
+            elif cmd == "rom":
+                # Statistik gehoert dem Loop-Thread: Abfrage dort beantworten lassen
+                answer = queue.Queue(1)
+                self.server.control.commands.put((cmd, answer))
+                try:
+                    reply = {"ok": True, "rom": answer.get(timeout=2.0)}
+                except queue.Empty:
+                    reply = {"ok": False, "error": "Keine Antwort vom Akquisitions-Loop"}
+            else:
+                self.server.control.commands.put((cmd, None))
+                reply = {"ok": True, "command": cmd}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class ControlServer:
+    """Zeilenbasierter Steuer-Socket. Kommandos werden im Akquisitions-Loop ausgefuehrt (nicht im Thread)."""
+
+    def __init__(self, port=HEADLESS_CONTROL_PORT, host=HEADLESS_CONTROL_HOST):
+        self.commands = queue.Queue()
+        self.status = {}  # Wird vom Loop pro Frame ersetzt (eine Zuweisung)
+        self.server = socketserver.ThreadingTCPServer((host, port), _ControlHandler, bind_and_activate=False)
+        self.server.allow_reuse_address = True
+        self.server.daemon_threads = True
+        self.server.control = self
+        self.server.server_bind()
+        self.server.server_activate()
+        self.address = self.server.server_address
+        threading.Thread(target=self.server.serve_forever, name="headless-control", daemon=True).start()
+
+    def poll(self):
+        """(Kommando, Antwort-Queue oder None) oder (None, None)."""
+        try:
+            return self.commands.get_nowait()
+        except queue.Empty:
+            return None, None
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _has_fresh(data):
+    """True, wenn mindestens ein Sensor in diesem Frame frisch gelesen wurde (dict: immer)."""
+    flags = getattr(data, "flags", None)
+    return flags is None or any(flag & FRESH for flag in flags)
+
+
+def headless_loop(sensors, detector, sink, control=None, every=1, min_pose=HEADLESS_POSE_MIN_DURATION,
+                  rom=None, on_frame=None, stop_event=None, max_frames=None, clock=time.time, rate=None):
+    """
+    Liest Frames ohne Taktbremse. Jeder every-te Frame geht an die Ausgabe (0 = nur Ereignisse);
+    eine neue Pose wird gemeldet, sobald sie min_pose Sekunden stabil anliegt.
+    Frames ohne frischen Sensorwert (PollScheduler: kein Sensor faellig) werden nicht ausgegeben;
+    der Loop wartet dann bis zum naechsten faelligen Read statt zu kreisen.
+    rate: Obergrenze in Hz fuer Quellen ohne Bus-Wartezeit (Dummy-Modus), None = ungebremst.
+    rom: RomStats, die jeden Frame aufnehmen (Abfrage ueber das Kommando "rom").
+    Rueckgabe: Anzahl Frames.
+    """
+    frames, t_start = 0, time.perf_counter()
+    pose, candidate, since = None, None, None
+    calibrating = None
+    next_tick = t_start
+    get_stale = getattr(sensors, "get_stale", dict)
+    next_poll_delay = getattr(sensors, "next_poll_delay", lambda: 0.0)
+    calibration_status = getattr(sensors, "calibration_status", lambda: None)
+
+    try:
+        while (stop_event is None or not stop_event.is_set()) and (max_frames is None or frames < max_frames):
+            cmd, answer = control.poll() if control else (None, None)
+            started = None
+            if cmd == "rom":
+                answer.put(rom.summary() if rom else {})
+                cmd = None
+            elif cmd == "zero":
+                started = sensors.calibrate_zero()
+            elif cmd == "forward":
+                started = sensors.calibrate_forward()
+            elif cmd == "quit":
+                break
+            if started is False:
+                sink.event("command", clock(), command=cmd, rejected="Kalibrierung laeuft noch")
+            elif cmd:
+                sink.event("command", clock(), command=cmd)
+
+            if rate:
+                next_tick += 1.0 / rate
+                time.sleep(max(0.0, next_tick - time.perf_counter()))
+            data = sensors.get_data()
+            if not _has_fresh(data):
+                # Nichts Neues gelesen: bis zum naechsten faelligen Sensor schlafen (max. 50 ms fuer Kommandos)
+                time.sleep(min(max(next_poll_delay(), 0.001), 0.05))
+                continue
+            now = clock()
+            stale = [name for name, age in get_stale().items() if age > STALE_WARN_AGE]
+            pose_id, deg_base, deg_arm = detector.classify(data)
+            if stale:
+                pose_id = 0  # Wie detect(): mit veralteten Sensoren keine Pose
+
+            # Entprellen: Wechsel erst melden, wenn die neue Pose min_pose Sekunden anliegt
+            if pose_id != candidate:
+                candidate, since = pose_id, now
+            if candidate != pose and now - since >= min_pose:
+                sink.event("pose", since, pose=candidate, name=POSES[candidate], previous=pose)
+                pose = candidate
+
+            status = calibration_status()
+            if calibrating and not status:
+                sink.event("calibrated", now, kind=calibrating)
+            calibrating = status[0] if status else None
+
+            if rom:
+                rom.add(data, now)
+            if every and frames % every == 0:
+                sink.frame(data, now, pose_id, (deg_base, deg_arm))
+            sink.flush()
+            if on_frame:
+                on_frame(data)
+            frames += 1
+
+            if control:
+                elapsed = time.perf_counter() - t_start
+                control.status = {"frames": frames, "rate": round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+                                  "pose": pose, "pose_name": POSES[pose] if pose is not None else None,
+                                  "stale": stale, "calibration": status}
+    finally:
+        elapsed = time.perf_counter() - t_start
+        if frames and elapsed > 0:
+            print(f"[ACQ] {frames} Frames in {elapsed:.1f} s ({frames / elapsed:.0f} Hz)")
+    return frames
+
+
+def run_headless(args, profile=None):
+    """main.py --headless: Sensoren und Posen-Erkennung ohne Grafik-Module."""
+    from hardware.sensor_manager import SensorManager
+    from pose_detector import PoseDetector
+    import metrics
+
+    stream = open_output(args.out)
+    if stream is sys.stdout.buffer:
+        sys.stdout = sys.stderr  # Statusmeldungen ([HAL], ...) nicht in den Datenstrom mischen
+    print("--- ArmSense Headless ---")
+    sensors = SensorManager()
+    detector = PoseDetector()
+    metrics.start_exporters()
+    sink = SINKS[args.format](stream, SENSOR_MAPPING.keys())
+    rom = RomStats(SENSOR_MAPPING.keys())
+    control = None
+    if args.control:
+        try:
+            control = ControlServer(args.control)
+            print(f"[CTL] Steuer-Socket auf {control.address[0]}:{control.address[1]} ({', '.join(COMMANDS)})")
+        except OSError as e:
+            print(f"[CTL] Steuer-Socket nicht gestartet (Port {args.control}): {e}")
+    if profile:
+        profile.mark("Sensoren bereit")
+
+    try:
+        # Dummy-Modus liest keinen Bus: sonst liefe der Loop mit voller CPU-Last
+        headless_loop(sensors, detector, sink, control, every=args.every, rom=rom,
+                      rate=ACQ_RATE if getattr(sensors, "dummy_mode", False) else None,
+                      on_frame=profile.first_frame if profile and profile.enabled else None)
+    except KeyboardInterrupt:
+        pass
+    except (BrokenPipeError, ConnectionError) as e:
+        print(f"[ACQ] Ausgabe geschlossen: {e}")
+    finally:
+        if rom.frames:
+            print(f"[ROM] Bewegungsumfang ({rom.frames} Frames):\n{rom.describe()}")
+        if control:
+            control.close()
+        metrics.stop_exporters()
+        try:
+            if stream is not sys.__stdout__.buffer:
+                stream.close()
+        except (BrokenPipeError, OSError):
+            pass
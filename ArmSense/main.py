@@ -1,35 +1,361 @@
 # main.py
+import time
+_T_START = time.perf_counter()  # Referenz fuer --profile-startup
+
+import os
 import sys
+import argparse
+import multiprocessing
+from config import *
+import backends
+import metrics
 from hardware.sensor_manager import SensorManager
-from visualization.arm_renderer import ArmVisualizer
 from pose_detector import PoseDetector
+from transport.shm_ring import SharedFrameWriter, SharedFrameReader, CMD_ZERO, CMD_FORWARD
+
+_T_IMPORTED = time.perf_counter()
+
+class StartupProfile:
+    """Kaltstart-Messung (--profile-startup): Zeitmarken ab Programmstart bis zum ersten Frame."""
+
+    # Module, die den Start spuerbar verlangsamen (und headless nicht geladen sein sollten)
+    HEAVY_MODULES = ("board", "busio", "adafruit_bno055", "pygame", "OpenGL", "numpy", "matplotlib")
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.marks = [("Module importiert", _T_IMPORTED)]
+        self.reported = False
+
+    def mark(self, label):
+        if self.enabled:
+            self.marks.append((label, time.perf_counter()))
+
+    def first_frame(self, *_):
+        """Letzte Marke; gibt den Bericht einmalig aus (auch als on_frame Callback nutzbar)."""
+        if not self.enabled or self.reported:
+            return
+        self.mark("Erster Frame")
+        self.reported = True
+        print("[START] Kaltstart:")
+        last = _T_START
+        for label, t in self.marks:
+            print(f"[START]   {label:<20} {(t - _T_START) * 1000:8.1f} ms  (+{(t - last) * 1000:.1f} ms)")
+            last = t
+        heavy = [m for m in self.HEAVY_MODULES if m in sys.modules]
+        print(f"[START] Geladene Backends: {backends.loaded() or '-'} | Schwere Module: {heavy or '-'}")
+
+def open_publishers(args):
+    """Netzwerk-Publisher laut Kommandozeile (--udp / --ws)."""
+    publishers = []
+    if args.udp:
+        from transport.net_stream import UdpPublisher
+        publishers.append(UdpPublisher(SENSOR_MAPPING.keys(), STREAM_GROUP, STREAM_PORT))
+        print(f"[NET] UDP Multicast auf {STREAM_GROUP}:{STREAM_PORT}")
+    if args.ws:
+        from transport.websocket import WebSocketPublisher
+        publishers.append(WebSocketPublisher(SENSOR_MAPPING.keys(), STREAM_WS_PORT))
+        print(f"[NET] WebSocket-Server auf Port {STREAM_WS_PORT}")
+    return publishers
+
+def open_recorder(path, sensors):
+    """Spaltenweise Sitzungs-Aufzeichnung (--record). Liefert (Writer, on_frame Callback)."""
+    from recording.session import SessionWriter
+    writer = SessionWriter(path, SENSOR_MAPPING.keys(), raw=hasattr(sensors, "last_raw"),
+                           state_source=getattr(sensors, "get_filter_state", None),
+                           state_version=getattr(sensors, "get_calibration_version", None))
+    print(f"[REC] Zeichne Sitzung auf: {path}")
+
+    def on_frame(data):
+        writer.append(time.time(), data, getattr(sensors, "last_raw", None))
+    return writer, on_frame
+
+def chain_callbacks(*callbacks):
+    """Fasst mehrere on_frame Callbacks zusammen (None-Eintraege werden ignoriert)."""
+    callbacks = [cb for cb in callbacks if cb]
+    if not callbacks:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def on_frame(data):
+        for cb in callbacks:
+            cb(data)
+    return on_frame
+
+def acquisition_loop(sensors, ring, publishers=(), on_frame=None, stop_event=None):
+    """
+    Liest die Sensoren mit ACQ_RATE, veroeffentlicht jeden Frame und fuehrt
+    Kommandos der Leser (Kalibrierung) aus. Laeuft bis stop_event gesetzt ist.
+    """
+    period = 1.0 / ACQ_RATE
+    next_tick = time.perf_counter()
+    last_tick = next_tick
+    frames, max_period = 0, 0.0
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            # Kommandos der Leser (z.B. Kalibrierung aus dem Visualizer)
+            cmd = ring.poll_command()
+            if cmd == CMD_ZERO:
+                sensors.calibrate_zero()
+            elif cmd == CMD_FORWARD:
+                sensors.calibrate_forward()
+
+            data = sensors.get_data()
+            now = time.time()
+            ring.publish(data, now)
+            for publisher in publishers:
+                publisher.publish(data, now)
+            if on_frame:
+                on_frame(data)
+
+            # Timing-Statistik (zeigt, ob der Takt stabil bleibt)
+            tick = time.perf_counter()
+            if frames:
+                max_period = max(max_period, tick - last_tick)
+            last_tick = tick
+            frames += 1
+
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+    finally:
+        if frames:
+            print(f"[ACQ] {frames} Frames, Soll-Periode {period * 1000:.1f} ms, "
+                  f"max. Periode {max_period * 1000:.1f} ms")
+        stats = sensors.get_sweep_stats() if hasattr(sensors, "get_sweep_stats") else {}
+        if stats:
+            print(f"[ACQ] Deadline: {stats['misses']} gerissen, {stats['deferred']} Reads verschoben, "
+                  f"max. Sweep {stats['max_sweep'] * 1000:.1f} ms")
+
+def run_daemon(publishers, record_raw=None, profile=None, record=None):
+    """Akquisitions-Daemon: Besitzt den I2C-Bus und veroeffentlicht Frames im Shared Memory."""
+    profile = profile or StartupProfile(False)
+    print("--- ArmSense Akquisitions-Daemon ---")
+    try:
+        # Vor dem Bus-Zugriff: ein zweiter Daemon darf weder Ring noch Sensoren uebernehmen
+        ring = SharedFrameWriter(SHM_NAME, SENSOR_MAPPING.keys(), SHM_CAPACITY)
+    except FileExistsError as e:
+        print(f"[SHM] {e}")
+        for publisher in publishers:
+            publisher.close()
+        return
+    sensors = SensorManager()
+    if record_raw:
+        sensors.start_raw_log()
+    writer, on_record = open_recorder(record, sensors) if record else (None, None)
+    metrics.start_exporters()
+    profile.mark("Sensoren bereit")
+    print(f"[SHM] Veroeffentliche Frames in '{ring.name}' ({SHM_CAPACITY} Slots). STRG+C zum Beenden.")
+
+    on_frame = chain_callbacks(on_record, profile.first_frame if profile.enabled else None)
+    try:
+        acquisition_loop(sensors, ring, publishers, on_frame=on_frame)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+        for publisher in publishers:
+            publisher.close()
+        if record_raw:
+            sensors.save_raw_log(record_raw)
+        if writer:
+            writer.close()
+        metrics.stop_exporters()
+    print("\nDaemon beendet.")
+
+def _acquisition_process(shm_name, stop_event, ready_event, detect_flag, pose_text, record=None):
+    """Split-Modus: Akquisition, Filterung und Posen-Erkennung im eigenen Prozess (eigener GIL)."""
+    if ACQ_CPU is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {ACQ_CPU})
+
+    sensors = SensorManager()
+    detector = PoseDetector()
+    writer, on_record = open_recorder(record, sensors) if record else (None, None)
+    metrics.start_exporters()
+    # Kleiner Ring: Der Renderer liest immer nur den neuesten Frame
+    ring = SharedFrameWriter(shm_name, SENSOR_MAPPING.keys(), capacity=8)
+    ready_event.set()
+
+    def on_pose(data):
+        if detect_flag.value:
+            pose_text.value = detector.detect(data, sensors.get_stale()).encode("utf-8")[:SPLIT_POSE_TEXT_LEN - 1]
+
+    try:
+        acquisition_loop(sensors, ring, on_frame=chain_callbacks(on_pose, on_record), stop_event=stop_event)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+        if writer:
+            writer.close()
+        metrics.stop_exporters()
+
+def run_viewer(sensors, detect, profile=None, on_frame=None, ghosts=None):
+    """
+    Render-Loop. detect(data, active) liefert den Posen-Text
+    (lokal berechnet oder aus dem Akquisitions-Prozess).
+    ghosts: GhostSource (visualization/ghosts.py), abgetastet an der Replay-Position
+    bzw. an der Zeit seit Start.
+    """
+    profile = profile or StartupProfile(False)
+    ArmVisualizer = backends.get("graphics", GRAPHICS_BACKEND).visualizer
 
-def main():
     print("--- ArmSense Start ---")
     print("Steuerung: Maus=Kamera | '1'=Ref-Kalibrierung | '0'=Null-Kalibrierung")
-    
-    # 1. Module initialisieren
-    sensors = SensorManager()
+
     vis = ArmVisualizer()
-    detector = PoseDetector()
-    
+    profile.mark("Grafik bereit")
+
     running = True
+    t_ghosts = time.time()
     print("Main Loop gestartet.")
-    
+
     while running:
         # A. Input verarbeiten (jetzt mit sensors Uebergabe)
         running = vis.handle_input(sensor_manager=sensors)
-        
+
         # B. Daten holen (Model Update)
         data = sensors.get_data()
-        
+        if on_frame:
+            on_frame(data)
+
         # C. Pose erkennen (wenn manuell aktiviert mit Taste 9)
-        pose_text = ""
-        if vis.pose_detection_active:
-            pose_text = detector.detect(data)
+        pose_text = detect(data, vis.pose_detection_active)
 
         # D. Grafik zeichnen (View Update)
-        vis.render(data, pose_text)
+        if ghosts:
+            position = vis.replay_state[1] if vis.replay_state else time.time() - t_ghosts
+            vis.render(data, pose_text, ghosts.sample(position))
+        else:
+            vis.render(data, pose_text)
+        profile.first_frame()
+
+def run_split(profile=None, record=None, ghosts=None):
+    """Akquisition und Rendering in getrennten Prozessen, verbunden ueber Shared Memory."""
+    ctx = multiprocessing.get_context("spawn")
+    shm_name = f"{SHM_NAME}_split_{os.getpid()}"
+    stop_event = ctx.Event()
+    ready_event = ctx.Event()
+    detect_flag = ctx.Value('b', 0, lock=False)
+    pose_text = ctx.Array('c', SPLIT_POSE_TEXT_LEN)
+
+    proc = ctx.Process(target=_acquisition_process, name="ArmSense-Akquisition",
+                       args=(shm_name, stop_event, ready_event, detect_flag, pose_text, record))
+    proc.start()
+    if not ready_event.wait(30.0):
+        print("[SPLIT] Akquisitions-Prozess startet nicht.")
+        stop_event.set()
+        proc.join(5.0)
+        return
+
+    sensors = SharedFrameReader(shm_name)
+    if profile:
+        profile.mark("Akquisition bereit")
+
+    def detect(data, active):
+        detect_flag.value = active
+        return pose_text.value.decode("utf-8", "replace") if active else ""
+
+    try:
+        run_viewer(sensors, detect, profile, ghosts=ghosts)
+    finally:
+        sensors.close()
+        stop_event.set()
+        proc.join(5.0)
+
+def main():
+    parser = argparse.ArgumentParser(description="ArmSense - Echtzeit-Armvisualisierung")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Nur Akquisition: Frames in Shared Memory veroeffentlichen (ohne Grafik)")
+    parser.add_argument("--shm", action="store_true",
+                        help="Frames vom laufenden Daemon lesen statt selbst auf den Bus zuzugreifen")
+    parser.add_argument("--udp", action="store_true",
+                        help="Daemon: Frames zusaetzlich per UDP Multicast senden (STREAM_GROUP/STREAM_PORT)")
+    parser.add_argument("--ws", action="store_true",
+                        help="Daemon: Frames zusaetzlich ueber einen WebSocket-Server senden (STREAM_WS_PORT)")
+    parser.add_argument("--split", action="store_true",
+                        help="Akquisition/Posen-Erkennung und Rendering in getrennten Prozessen (umgeht den GIL)")
+    parser.add_argument("--connect", metavar="URL",
+                        help="Entfernten Stream anzeigen, z.B. udp://239.255.42.99:5005 oder ws://pi:8765")
+    parser.add_argument("--record-raw", metavar="DATEI",
+                        help="Rohdaten (ACC/MAG/GYR) fuer die Offline-Fusion als .npz aufzeichnen "
+                             "(nur FUSION_MODE = 'host')")
+    parser.add_argument("--record", metavar="VERZEICHNIS",
+                        help="Sitzung spaltenweise aufzeichnen (Zeit, Quaternionen, Gelenkwinkel, Posen)")
+    parser.add_argument("--replay", metavar="VERZEICHNIS",
+                        help="Aufgezeichnete Sitzung abspielen (P=Play/Pause, Pfeiltasten=Springen/Tempo)")
+    parser.add_argument("--refilter", action="store_true",
+                        help="Replay: Rohdaten erneut filtern statt die aufgezeichneten Quaternionen zu zeigen")
+    parser.add_argument("--ghosts", metavar="VERZEICHNIS",
+                        help="Alle Sitzungen unter VERZEICHNIS als halbtransparente Arme zum Vergleich einblenden")
+    parser.add_argument("--headless", action="store_true",
+                        help="Ohne Grafik: Sensoren und Posen-Erkennung ohne Taktbremse, Frames und "
+                             "Posen-Ereignisse an --out, Kalibrierung ueber den Steuer-Socket")
+    parser.add_argument("--out", default="-", metavar="ZIEL",
+                        help="Headless: '-' (stdout), Dateipfad oder tcp://host:port")
+    parser.add_argument("--format", choices=("json", "binary"), default="json",
+                        help="Headless: JSON-Zeilen oder net_stream-Pakete mit Laengen-Praefix")
+    parser.add_argument("--every", type=int, default=1, metavar="N",
+                        help="Headless: nur jeden N-ten Frame ausgeben (0 = nur Ereignisse)")
+    parser.add_argument("--control", type=int, default=HEADLESS_CONTROL_PORT, metavar="PORT",
+                        help="Headless: Port des Steuer-Socket (zero/forward/status/quit), 0 = aus")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Kaltstart messen und bis zum ersten Frame aufschluesseln")
+    args = parser.parse_args()
+    profile = StartupProfile(args.profile_startup)
+
+    if args.headless:
+        from headless import run_headless
+        run_headless(args, profile)
+        return
+
+    if args.daemon:
+        run_daemon(open_publishers(args), args.record_raw, profile, args.record)
+        return
+
+    ghosts = None
+    if args.ghosts:
+        from visualization.ghosts import GhostSource
+        ghosts = GhostSource(args.ghosts)
+
+    if args.split:
+        run_split(profile, args.record, ghosts)
+        print("Beendet.")
+        sys.exit()
+
+    # 1. Module initialisieren
+    if args.replay:
+        from recording.replay import SessionReplay
+        sensors = SessionReplay(args.replay, refilter=args.refilter)
+        sensors.play()
+    elif args.connect:
+        from transport.net_stream import NetworkFrameSource
+        sensors = NetworkFrameSource(args.connect, delay=STREAM_DELAY)
+    elif args.shm:
+        sensors = SharedFrameReader(SHM_NAME)
+    else:
+        sensors = SensorManager()
+        if args.record_raw:
+            sensors.start_raw_log()
+        metrics.start_exporters()
+    detector = PoseDetector()
+    writer, on_record = open_recorder(args.record, sensors) if args.record else (None, None)
+    profile.mark("Datenquelle bereit")
+
+    try:
+        get_stale = getattr(sensors, "get_stale", dict)
+        run_viewer(sensors, lambda data, active: detector.detect(data, get_stale()) if active else "",
+                   profile, on_record, ghosts)
+    finally:
+        if args.record_raw and isinstance(sensors, SensorManager):
+            sensors.save_raw_log(args.record_raw)
+        if writer:
+            writer.close()
+        metrics.stop_exporters()
 
     print("Beendet.")
     sys.exit()
@@ -0,0 +1,290 @@
+# metrics.py
+"""
+Gesundheits-Metriken fuer Sensoren und Pipeline (nur Standardbibliothek).
+
+Zaehler, Gauges und Histogramme mit festen Buckets; ein Update kostet einen
+Attribut-Zugriff bzw. eine binaere Suche. Export als Prometheus-Text
+(http://127.0.0.1:METRICS_PORT/metrics, JSON unter /metrics.json) und als
+periodischer JSON-Snapshot (METRICS_SNAPSHOT).
+
+    reads = REGISTRY.counter("armsense_sensor_reads_total", "Reads", ["sensor"])
+    reads.labels("arm").inc()
+"""
+import sys
+import os
+import json
+import time
+import bisect
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Read-Dauer in Sekunden (BNO055-Quaternion bei 100-400 kHz: ~0.5-3 ms, Clock-Stretching/Timeouts darueber)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.5)
+
+
+class _Value:
+    """Ein Zaehler-/Gauge-Wert mit festen Labels (Updates ohne Lock, ein Schreiber pro Wert)."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def set(self, value):
+        self.value = value
+
+
+class _Buckets:
+    """Histogramm-Werte mit festen Buckets (Zaehler pro Bucket, nicht kumulativ)."""
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # letzter Bucket = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total, result = 0, []
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            total += n
+            result.append((bound, total))
+        return result
+
+
+class Metric:
+    """Metrik-Familie: Name, Typ, Hilfetext und ein Wert pro Label-Kombination."""
+
+    def __init__(self, name, kind, help_text, labelnames=(), buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) if buckets else None
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Wert fuer eine Label-Kombination; im Hot-Path einmal holen und behalten."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: Labels {self.labelnames} erwartet, {values} erhalten")
+            with self._lock:
+                child = self._children.setdefault(values, _Buckets(self.buckets) if self.buckets else _Value())
+        return child
+
+    # Kurzformen fuer Metriken ohne Labels
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def samples(self):
+        return sorted(self._children.items())
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name, kind, help_text, labelnames, buckets=None):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Metric(name, kind, help_text, labelnames, buckets)
+            elif metric.kind != kind or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metrik {name} existiert bereits als {metric.kind}{metric.labelnames}")
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get(name, "counter", help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get(name, "gauge", help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._get(name, "histogram", help_text, labelnames, buckets)
+
+    def prometheus(self):
+        """Alle Metriken im Prometheus-Textformat (Version 0.0.4)."""
+        lines = []
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for values, child in metric.samples():
+                if metric.kind == "histogram":
+                    for bound, total in child.cumulative():
+                        labels = _format_labels(metric.labelnames, values, [("le", _format_value(bound))])
+                        lines.append(f"{metric.name}_bucket{labels} {total}")
+                    labels = _format_labels(metric.labelnames, values)
+                    lines.append(f"{metric.name}_sum{labels} {_format_value(child.sum)}")
+                    lines.append(f"{metric.name}_count{labels} {child.count}")
+                else:
+                    labels = _format_labels(metric.labelnames, values)
+                    lines.append(f"{metric.name}{labels} {_format_value(child.value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Alle Metriken als JSON-taugliches Dict."""
+        result = {}
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            entries = []
+            for values, child in metric.samples():
+                entry = {"labels": dict(zip(metric.labelnames, values))}
+                if metric.kind == "histogram":
+                    entry["buckets"] = {_format_value(bound): total for bound, total in child.cumulative()}
+                    entry["sum"] = child.sum
+                    entry["count"] = child.count
+                else:
+                    entry["value"] = child.value
+                entries.append(entry)
+            result[metric.name] = {"type": metric.kind, "help": metric.help, "values": entries}
+        return {"time": time.time(), "metrics": result}
+
+
+REGISTRY = Registry()
+
+
+class SensorMetrics:
+    """Metriken des SensorManagers; die Werte pro Sensor werden einmal angelegt."""
+
+    def __init__(self, names, registry=REGISTRY):
+        reads = registry.counter("armsense_sensor_reads_total", "Lesezugriffe pro Sensor", ["sensor"])
+        errors = registry.counter("armsense_sensor_read_errors_total",
+                                  "Fehlgeschlagene oder korrupte Reads (NAK, Exception, Quaternion-Norm)", ["sensor"])
+        rejects = registry.counter("armsense_sensor_jump_rejects_total",
+                                   "Vom Jump-Filter verworfene Werte (MAX_ANGLE_JUMP)", ["sensor"])
+        forced = registry.counter("armsense_sensor_forced_accepts_total",
+                                  "Spruenge, die nach MAX_OUTLIERS Frames akzeptiert wurden", ["sensor"])
+        stale = registry.counter("armsense_sensor_stale_frames_total",
+                                 "Frames mit veraltetem Wert (faelliger Read ohne Ergebnis)", ["sensor"])
+        filter_errors = registry.counter("armsense_sensor_filter_errors_total",
+                                         "Ausnahmen im Filter (letzter gueltiger Wert weitergegeben)", ["sensor"])
+        latency = registry.histogram("armsense_sensor_read_seconds", "Dauer eines Reads", ["sensor"])
+        self.reads = {name: reads.labels(name) for name in names}
+        self.errors = {name: errors.labels(name) for name in names}
+        self.rejects = {name: rejects.labels(name) for name in names}
+        self.forced = {name: forced.labels(name) for name in names}
+        self.stale = {name: stale.labels(name) for name in names}
+        self.filter_errors = {name: filter_errors.labels(name) for name in names}
+        self.latency = {name: latency.labels(name) for name in names}
+        self.frames = registry.counter("armsense_frames_total", "Verarbeitete Frames (get_data)")
+        self.deadline_misses = registry.counter("armsense_sweep_deadline_misses_total",
+                                                "Sweeps mit aufgegebenem Read (SWEEP_DEADLINE)")
+        self.bus_frequency = registry.gauge("armsense_i2c_frequency_hz", "Aktuelle I2C-Frequenz (I2C_AUTOTUNE)")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            body, ctype = self.registry.prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            body, ctype = json.dumps(self.registry.snapshot()).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # Kein Log pro Scrape
+
+
+def serve(port, host="127.0.0.1", registry=REGISTRY):
+    """Startet den HTTP-Endpunkt in einem Daemon-Thread; Rueckgabe: Server (server_address, shutdown())."""
+    handler = type("Handler", (_Handler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+class SnapshotWriter:
+    """Schreibt alle interval Sekunden einen JSON-Snapshot (atomar ersetzt)."""
+
+    def __init__(self, path, interval, registry=REGISTRY):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+
+    def write(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.registry.snapshot(), f)
+        os.replace(tmp, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"[METRICS] Snapshot fehlgeschlagen: {e}")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.write()
+
+
+_exporters = []
+
+
+def start_exporters():
+    """Startet Endpunkt und Snapshot laut config.py (einmal pro Prozess)."""
+    from config import METRICS_PORT, METRICS_HOST, METRICS_SNAPSHOT, METRICS_SNAPSHOT_INTERVAL
+    if _exporters:
+        return
+    if METRICS_PORT:
+        try:
+            _exporters.append(serve(METRICS_PORT, METRICS_HOST))
+            print(f"[METRICS] Prometheus-Endpunkt: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        except OSError as e:
+            print(f"[METRICS] Endpunkt nicht gestartet ({METRICS_HOST}:{METRICS_PORT}): {e}")
+    if METRICS_SNAPSHOT:
+        _exporters.append(SnapshotWriter(METRICS_SNAPSHOT, METRICS_SNAPSHOT_INTERVAL))
+
+
+def stop_exporters():
+    while _exporters:
+        exporter = _exporters.pop()
+        if isinstance(exporter, SnapshotWriter):
+            exporter.close()
+        else:
+            exporter.shutdown()
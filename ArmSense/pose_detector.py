@@ -1,18 +1,51 @@
 # pose_detector.py
 import math
+from config import STALE_WARN_AGE
+
+# Posen-IDs (Index in dieser Liste) fuer Aufzeichnung und Posen-Index. 0 = keine Pose erkannt.
+POSES = ["Keine Pose", "Arm haengt", "L-Form", "Vorne Gestreckt"]
 
 class PoseDetector:
     def __init__(self):
         self.current_pose = "Unbekannt"
         # Toleranz in Grad (+/-)
         self.TOL = 25.0
+        self._layout = None   # Indizes von base/arm im zuletzt gesehenen SensorFrame-Layout
+        self._indices = None
 
-    def detect(self, sensor_data):
+    def detect(self, sensor_data, stale=None):
         """
         Analysiert die Quaternion-Daten und erkennt die Pose.
+        stale: {Sensor: Alter in s} (SensorManager.get_stale()); zu alte Werte -> keine Pose.
         """
-        q_base = sensor_data.get("base", (1,0,0,0))
-        q_arm = sensor_data.get("arm", (1,0,0,0))
+        too_old = sorted(name for name, age in (stale or {}).items() if age > STALE_WARN_AGE)
+        if too_old:
+            return f"Sensor veraltet: {', '.join(too_old)}"
+
+        pose_id, deg_base, deg_arm = self.classify(sensor_data)
+        if pose_id:
+            return POSES[pose_id]
+
+        # Keine Pose erkannt -> Zeige aktuelle Winkel an
+        return f"Winkel: B{int(deg_base)} A{int(deg_arm)}"
+
+    def classify(self, sensor_data):
+        """
+        Wie detect(), aber maschinenlesbar: (Posen-ID, Winkel Base, Winkel Arm).
+        Die ID ist der Index in POSES.
+        """
+        layout = getattr(sensor_data, "layout", None)
+        if layout is not None:
+            # SensorFrame: Indizes einmal pro Layout aufloesen, danach ohne Namens-Lookup
+            if layout is not self._layout:
+                self._layout = layout
+                self._indices = (layout.index.get("base"), layout.index.get("arm"))
+            i_base, i_arm = self._indices
+            q_base = sensor_data.q(i_base) if i_base is not None else (1,0,0,0)
+            q_arm = sensor_data.q(i_arm) if i_arm is not None else (1,0,0,0)
+        else:
+            q_base = sensor_data.get("base", (1,0,0,0))
+            q_arm = sensor_data.get("arm", (1,0,0,0))
         
         # Berechne Winkelabweichung vom Nullpunkt (Hängen = 0 Grad)
         deg_base = self._get_angle_from_identity(q_base)
@@ -23,19 +56,18 @@ class PoseDetector:
 
         # 1. Arm haengt (Beide nahe 0°)
         if deg_base < self.TOL and deg_arm < self.TOL:
-            return "Arm haengt"
+            return 1, deg_base, deg_arm
 
         # 2. L-Form (Oberarm hängt, Unterarm ~90°)
         if deg_base < self.TOL and abs(deg_arm - 90) < self.TOL:
-            return "L-Form"
+            return 2, deg_base, deg_arm
 
         # 3. Vorne Gestreckt (Beide ~90°)
         # Da wir 'Vorne' als 90° Abweichung vom Hängen definiert haben
         if abs(deg_base - 90) < self.TOL and abs(deg_arm - 90) < self.TOL:
-            return "Vorne Gestreckt"
-            
-        # Keine Pose erkannt -> Zeige aktuelle Winkel an
-        return f"Winkel: B{int(deg_base)} A{int(deg_arm)}"
+            return 3, deg_base, deg_arm
+
+        return 0, deg_base, deg_arm
 
     def _get_angle_from_identity(self, q):
         """Berechnet Rotationswinkel eines Quaternions relativ zu (1,0,0,0) in Grad"""
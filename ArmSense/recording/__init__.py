@@ -0,0 +1,3 @@
+# recording/__init__.py
+from .session import SessionWriter, SessionReader, joint_angles
+from .pose_index import PoseEventIndex
@@ -0,0 +1,233 @@
+# recording/pose_index.py
+"""
+Posen-Ereignisse ueber viele Sitzungen.
+
+Pro Sitzung wird die Posen-Spalte einmal in Intervalle zerlegt (Pose, Start, Ende,
+Spitzenwinkel je Gelenk). Alle Intervalle landen in einem kompakten Index
+(pose_index.npy + pose_index.json im Sitzungs-Wurzelverzeichnis). Abfragen filtern
+nur noch dieses Array:
+
+    python recording/pose_index.py build sitzungen/
+    python recording/pose_index.py query sitzungen/ --pose "Vorne Gestreckt" --min-duration 2
+"""
+import sys
+import os
+import json
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import POSE_EVENT_MERGE_GAP
+from pose_detector import PoseDetector
+from recording.session import SessionReader, INDEX_FILE
+
+INDEX_NAME = "pose_index"
+
+
+def find_sessions(root):
+    """Alle Sitzungs-Verzeichnisse (mit index.json) unterhalb von root, sortiert."""
+    sessions = []
+    for folder, _, files in os.walk(root):
+        if INDEX_FILE in files:
+            sessions.append(folder)
+    return sorted(sessions)
+
+
+def session_fingerprint(session):
+    """Aendert sich, sobald die Sitzung weitergeschrieben wurde (Index wird pro Chunk ersetzt)."""
+    stat = os.stat(os.path.join(session, INDEX_FILE))
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _pose_column(reader, redetect):
+    if not redetect and "pose" in reader.columns:
+        return reader.read("pose")
+    # Neu erkennen (z.B. nach geaenderten Toleranzen im PoseDetector)
+    detector = PoseDetector()
+    quats = {name: reader.read(f"q.{name}") for name in reader.sensors}
+    return np.array([detector.classify({name: tuple(q[i]) for name, q in quats.items()})[0]
+                     for i in range(reader.frames)], dtype=np.uint8)
+
+
+def extract_events(reader, joints, merge_gap=POSE_EVENT_MERGE_GAP, redetect=False):
+    """
+    Zerlegt eine Sitzung in Posen-Intervalle. Gleiche Posen, die nur kurz (< merge_gap s)
+    unterbrochen werden, zaehlen als ein Ereignis (Flackern an den Toleranzgrenzen).
+    Rueckgabe: Liste (pose_id, start, end, [Spitzenwinkel pro Gelenk]).
+    """
+    if not reader.frames:
+        return []
+    t = reader.read("t")
+    pose = _pose_column(reader, redetect)
+    angles = [reader.read(f"angle.{joint}") for joint in joints]
+
+    # Lauf-Grenzen: Indizes, an denen sich die Pose aendert
+    change = np.flatnonzero(np.diff(pose)) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [len(pose)])) - 1  # inklusive
+
+    events = []
+    for first, last in zip(starts, ends):
+        pose_id = int(pose[first])
+        if pose_id == 0:
+            continue
+        if events and events[-1][0] == pose_id and t[first] - t[events[-1][2]] < merge_gap:
+            events[-1][2] = last  # Mit vorigem Ereignis zusammenfassen
+        else:
+            events.append([pose_id, first, last])
+
+    return [(pose_id, float(t[first]), float(t[last]),
+             [float(np.nanmax(a[first:last + 1])) for a in angles])
+            for pose_id, first, last in events]
+
+
+class PoseEventIndex:
+    """Intervall-Index ueber alle Sitzungen eines Verzeichnisses."""
+
+    def __init__(self, root, sessions, poses, joints, events):
+        self.root = root
+        self.sessions = sessions   # Liste {"path": relativ zu root, "fingerprint": ...}
+        self.poses = poses
+        self.joints = joints
+        self.events = events       # Strukturiertes Array, ein Eintrag pro Ereignis
+
+    @staticmethod
+    def _dtype(joints):
+        return np.dtype([("session", "<u4"), ("pose", "u1"), ("start", "<f8"), ("end", "<f8"),
+                         ("duration", "<f4")] + [(f"peak_{joint}", "<f4") for joint in joints])
+
+    @classmethod
+    def load(cls, root):
+        with open(os.path.join(root, INDEX_NAME + ".json")) as f:
+            meta = json.load(f)
+        events = np.load(os.path.join(root, INDEX_NAME + ".npy"))
+        return cls(root, meta["sessions"], meta["poses"], meta["joints"], events)
+
+    @classmethod
+    def build(cls, root, redetect=False, verbose=True):
+        """
+        Baut den Index fuer alle Sitzungen unter root bzw. aktualisiert ihn:
+        Unveraenderte Sitzungen (gleicher Fingerprint) werden nicht erneut gelesen.
+        """
+        old = None
+        if not redetect and os.path.exists(os.path.join(root, INDEX_NAME + ".json")):
+            old = cls.load(root)
+
+        sessions, parts, poses, joints = [], [], None, None
+        for path in find_sessions(root):
+            rel = os.path.relpath(path, root)
+            fingerprint = session_fingerprint(path)
+            session_id = len(sessions)
+            sessions.append({"path": rel, "fingerprint": fingerprint})
+
+            reused = old and cls._reuse(old, rel, fingerprint)
+            if reused is not None and (joints is None or joints == old.joints):
+                poses, joints = old.poses, old.joints
+                rows = reused.copy()
+                rows["session"] = session_id
+                parts.append(rows)
+                continue
+
+            reader = SessionReader(path)
+            session_joints = list(reader.index.get("joints", {}))
+            if joints is None:
+                poses, joints = reader.poses, session_joints
+            elif session_joints != joints:
+                print(f"[INDEX] Uebersprungen (andere Gelenke): {rel}")
+                sessions.pop()
+                continue
+
+            events = extract_events(reader, joints, redetect=redetect)
+            rows = np.zeros(len(events), dtype=cls._dtype(joints))
+            for i, (pose_id, start, end, peaks) in enumerate(events):
+                rows[i]["session"] = session_id
+                rows[i]["pose"] = pose_id
+                rows[i]["start"] = start
+                rows[i]["end"] = end
+                rows[i]["duration"] = end - start
+                for joint, peak in zip(joints, peaks):
+                    rows[i][f"peak_{joint}"] = peak
+            parts.append(rows)
+            if verbose:
+                print(f"[INDEX] {rel}: {len(events)} Ereignisse")
+
+        joints = joints or []
+        events = np.concatenate(parts) if parts else np.zeros(0, dtype=cls._dtype(joints))
+        index = cls(root, sessions, poses or [], joints, events)
+        index.save()
+        return index
+
+    @staticmethod
+    def _reuse(old, rel, fingerprint):
+        for session_id, session in enumerate(old.sessions):
+            if session["path"] == rel and session["fingerprint"] == fingerprint:
+                return old.events[old.events["session"] == session_id]
+        return None
+
+    def save(self):
+        np.save(os.path.join(self.root, INDEX_NAME + ".npy"), self.events)
+        meta = {"sessions": self.sessions, "poses": self.poses, "joints": self.joints}
+        with open(os.path.join(self.root, INDEX_NAME + ".json"), "w") as f:
+            json.dump(meta, f, indent=1)
+
+    def query(self, pose=None, min_duration=None, max_duration=None, start=None, end=None, sessions=None):
+        """
+        Filtert die Ereignisse. pose: Name oder ID. start/end: Unix-Zeitbereich, in dem das
+        Ereignis liegen muss (Ueberlappung genuegt). sessions: Liste relativer Sitzungs-Pfade.
+        Rueckgabe: strukturiertes Array (Felder session, pose, start, end, duration, peak_<gelenk>).
+        """
+        ev = self.events
+        mask = np.ones(len(ev), dtype=bool)
+        if pose is not None:
+            pose_id = self.poses.index(pose) if isinstance(pose, str) else pose
+            mask &= ev["pose"] == pose_id
+        if min_duration is not None:
+            mask &= ev["duration"] >= min_duration
+        if max_duration is not None:
+            mask &= ev["duration"] <= max_duration
+        if start is not None:
+            mask &= ev["end"] >= start
+        if end is not None:
+            mask &= ev["start"] <= end
+        if sessions is not None:
+            ids = [i for i, s in enumerate(self.sessions) if s["path"] in set(sessions)]
+            mask &= np.isin(ev["session"], ids)
+        return ev[mask]
+
+    def describe(self, event):
+        """Lesbare Zeile fuer ein Ereignis aus query()."""
+        peaks = ", ".join(f"{joint} {event[f'peak_{joint}']:.0f}°" for joint in self.joints)
+        return (f"{self.sessions[event['session']]['path']}: {self.poses[event['pose']]} "
+                f"{event['start']:.2f} - {event['end']:.2f} ({event['duration']:.1f} s) | max. {peaks}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ArmSense Posen-Ereignis-Index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Index fuer alle Sitzungen unter ROOT bauen/aktualisieren")
+    build.add_argument("root")
+    build.add_argument("--redetect", action="store_true",
+                       help="Posen aus den Quaternionen neu erkennen statt die aufgezeichneten IDs zu nutzen")
+    query = sub.add_parser("query", help="Ereignisse abfragen")
+    query.add_argument("root")
+    query.add_argument("--pose", help='z.B. "Vorne Gestreckt"')
+    query.add_argument("--min-duration", type=float)
+    query.add_argument("--max-duration", type=float)
+    query.add_argument("--start", type=float, help="Unix-Zeit")
+    query.add_argument("--end", type=float, help="Unix-Zeit")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = PoseEventIndex.build(args.root, redetect=args.redetect)
+        print(f"[INDEX] {len(index.events)} Ereignisse aus {len(index.sessions)} Sitzungen")
+        return
+
+    index = PoseEventIndex.load(args.root)
+    events = index.query(args.pose, args.min_duration, args.max_duration, args.start, args.end)
+    for event in events:
+        print(index.describe(event))
+    print(f"{len(events)} Treffer")
+
+
+if __name__ == "__main__":
+    main()
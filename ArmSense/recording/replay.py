@@ -0,0 +1,160 @@
+# recording/replay.py
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from recording.session import SessionReader
+
+SPEEDS = (0.125, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+
+class SessionReplay:
+    """
+    Spielt eine aufgezeichnete Sitzung als Datenquelle ab (get_data() wie SensorManager).
+
+    Steuerung: play/pause/toggle, set_speed, seek (absolut, Sekunden ab Sitzungsbeginn),
+    skip (relativ). Ein Sprung kostet unabhaengig von der Position gleich viel:
+    Zeit -> Frame ueber den Chunk-Index (binaere Suche), danach direkter Zugriff.
+
+    refilter=True: Statt der aufgezeichneten gefilterten Quaternionen laufen die Rohdaten
+    erneut durch den Filter eines SensorManager (z.B. mit geaenderten Filter-Parametern).
+    Ein Sprung stellt dann den letzten Keyframe des Filter-Zustands wieder her und filtert
+    nur die Frames ab dort (max. RECORD_KEYFRAME_FRAMES) neu.
+    """
+
+    def __init__(self, path, refilter=False, manager=None):
+        self.reader = SessionReader(path)
+        if not self.reader.frames:
+            raise ValueError(f"Sitzung ohne Frames: {path}")
+        self.names = self.reader.sensors
+        self.t0, self.t1 = self.reader.time_range()
+
+        self.manager = None
+        if refilter:
+            if "raw." + self.names[0] not in self.reader.columns:
+                raise ValueError("Sitzung enthaelt keine Rohdaten (raw.*), Neu-Filtern nicht moeglich")
+            if manager is None:
+                from hardware.sensor_manager import SensorManager
+                manager = SensorManager(use_hardware=False)
+            self.manager = manager
+
+        self.position = 0.0      # Sekunden ab Sitzungsbeginn
+        self.speed = 1.0
+        self.playing = False
+        self._wall = None
+        self.frame = 0
+        self._filtered_frame = -1  # Letzter Frame, den der Filter verarbeitet hat
+        self._data = None
+        self.refiltered = 0        # Statistik: neu gefilterte Frames (zeigt die Kosten von Spruengen)
+
+    # --- Steuerung ---
+
+    @property
+    def duration(self):
+        return self.t1 - self.t0
+
+    def play(self):
+        if self.position >= self.duration:
+            self.position = 0.0
+        self.playing = True
+        self._wall = time.perf_counter()
+
+    def pause(self):
+        self._advance()
+        self.playing = False
+
+    def toggle(self):
+        self.pause() if self.playing else self.play()
+
+    def set_speed(self, speed):
+        self._advance()
+        self.speed = max(SPEEDS[0], min(SPEEDS[-1], speed))
+
+    def faster(self):
+        self.set_speed(self.speed * 2.0)
+
+    def slower(self):
+        self.set_speed(self.speed / 2.0)
+
+    def seek(self, position):
+        """Springt an eine Position (Sekunden ab Sitzungsbeginn)."""
+        self.position = max(0.0, min(self.duration, position))
+        self._wall = time.perf_counter()
+
+    def seek_fraction(self, fraction):
+        self.seek(fraction * self.duration)
+
+    def skip(self, seconds):
+        self._advance()
+        self.seek(self.position + seconds)
+
+    def replay_status(self):
+        """(spielt, Position, Dauer, Geschwindigkeit) fuer die Anzeige."""
+        self._advance()
+        return self.playing, self.position, self.duration, self.speed
+
+    def _advance(self):
+        now = time.perf_counter()
+        if self.playing and self._wall is not None:
+            self.position += (now - self._wall) * self.speed
+            if self.position >= self.duration:
+                self.position = self.duration
+                self.playing = False
+        self._wall = now
+
+    # --- Datenquelle ---
+
+    def get_data(self):
+        self._advance()
+        frame = self.reader.frame_at(self.t0 + self.position)
+        if frame != self.frame or self._data is None:
+            self.frame = frame
+            self._data = self._refilter(frame) if self.manager else self._recorded(frame)
+        return self._data
+
+    def _recorded(self, frame):
+        return {name: tuple(float(c) for c in self.reader.row(f"q.{name}", frame)) for name in self.names}
+
+    def _refilter(self, frame):
+        first = self._filtered_frame + 1
+        keyframe = self.reader.keyframe_before(frame)
+        # Rueckwaerts-Sprung oder Keyframe naeher als die aktuelle Position -> Zustand laden
+        if frame < first or (keyframe and keyframe["frame"] > first):
+            if keyframe:
+                self.manager.set_filter_state(keyframe["state"])
+                first = keyframe["frame"]
+            else:
+                first = 0
+
+        raw = {name: self.reader.read_frames(f"raw.{name}", first, frame) for name in self.names}
+        times = self.reader.read_frames("t", first, frame)  # Fuer zeitabhaengige Filter-Stufen
+        data = None
+        for i in range(frame - first + 1):
+            sample = {}
+            for name in self.names:
+                q = raw[name][i]
+                if not np.isnan(q[0]):
+                    sample[name] = tuple(float(c) for c in q)
+            data = self.manager.process(sample, t=float(times[i]))
+        self.refiltered += frame - first + 1
+        self._filtered_frame = frame
+        return data
+
+    # --- Kalibrierung (nur beim Neu-Filtern sinnvoll) ---
+
+    def calibrate_zero(self):
+        if self.manager:
+            self.manager.calibrate_zero()
+        else:
+            print("[REPLAY] Kalibrierung nur mit Neu-Filtern (--refilter) moeglich.")
+
+    def calibrate_forward(self):
+        if self.manager:
+            self.manager.calibrate_forward()
+        else:
+            print("[REPLAY] Kalibrierung nur mit Neu-Filtern (--refilter) moeglich.")
+
+    def calibration_status(self):
+        return self.manager.calibration_status() if self.manager else None
@@ -0,0 +1,270 @@
+# recording/reprocess.py
+"""
+Neu-Auswertung ganzer Sitzungs-Archive mit der aktuellen Pipeline (Filter, Posen, Bewegungsumfang).
+
+Jede Sitzung laeuft in einem eigenen Prozess des Pools (Sitzungen sind unabhaengig, kein
+geteilter Zustand) durch SensorManager.process() und wird als neue Sitzung unter dem
+Ausgabe-Verzeichnis geschrieben (gleicher relativer Pfad). Das Manifest (reprocess.jsonl,
+eine Zeile pro fertiger Sitzung, nur angehaengt) haelt fest, welche Sitzungen mit welchem
+Pipeline-Stand fertig sind; ein abgebrochener Lauf setzt beim naechsten Start dort fort.
+Aendern sich Quelle oder Pipeline-Code, wird neu gerechnet.
+
+    python recording/reprocess.py archiv/ neu/               # Alle Kerne
+    python recording/reprocess.py archiv/ neu/ --jobs 8
+    python recording/reprocess.py archiv/ neu/ --recorded    # Aufgezeichnete Quaternionen statt Rohdaten
+"""
+import sys
+import os
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from recording.session import SessionReader, SessionWriter, INDEX_FILE
+from recording.pose_index import find_sessions, session_fingerprint
+from rom_stats import load_session
+
+MANIFEST_FILE = "reprocess.jsonl"
+MANIFEST_VERSION = 1
+# Quelltexte, deren Aenderung das Ergebnis aendert (Pipeline-Fingerprint)
+PIPELINE_FILES = ("config.py", "utils.py", "frame.py", "pose_detector.py", "rom_stats.py",
+                  "hardware/sensor_manager.py", "hardware/filters.py", "hardware/calibration.py",
+                  "hardware/skew.py", "recording/session.py")
+
+
+def pipeline_fingerprint():
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    h = hashlib.sha1()
+    for rel in PIPELINE_FILES:
+        with open(os.path.join(base, rel), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _apply_calibration(manager, state, restart=True):
+    """
+    Kalibrierung aus einem Keyframe uebernehmen (Filter-Zustand bleibt der neu gerechnete).
+    restart: Geaenderte Sensoren wie nach einer Kalibrierung neu anlaufen lassen (nicht fuer Frame 0).
+    """
+    offsets = {name: tuple(q) for name, q in state["offsets"].items()}
+    alignments = {name: tuple(q) for name, q in state["alignments"].items()}
+    changed = [name for name in offsets
+               if offsets[name] != manager.offsets.get(name) or alignments.get(name) != manager.alignments.get(name)]
+    if changed:
+        manager.set_calibration(offsets, alignments)
+        for name in changed if restart else ():
+            if name in manager.filters:
+                manager.filters[name].restart()
+
+
+def reprocess_session(src, dst, use_raw=True):
+    """
+    Eine Sitzung neu auswerten. Rohdaten laufen durch einen SensorManager; die Kalibrierung
+    kommt aus den Keyframes der Aufnahme. Ohne Rohdaten (oder use_raw=False) werden nur
+    Gelenkwinkel, Posen und Bewegungsumfang aus den aufgezeichneten Quaternionen neu berechnet.
+    Das Ergebnis entsteht in dst + ".tmp" und ersetzt dst erst, wenn es vollstaendig ist.
+    """
+    reader = SessionReader(src)
+    raw = use_raw and all(f"raw.{name}" in reader.columns for name in reader.sensors)
+    manager = None
+    keyframes = {kf["frame"]: kf["state"] for kf in reader.keyframes}
+    if raw:
+        from hardware.sensor_manager import SensorManager
+        manager = SensorManager(use_hardware=False)
+        if 0 in keyframes:
+            _apply_calibration(manager, keyframes[0], restart=False)
+
+    tmp = dst + ".tmp"
+    if os.path.exists(tmp):
+        shutil.rmtree(tmp)  # Rest eines abgebrochenen Laufs
+    writer = SessionWriter(tmp, reader.sensors, raw=raw, state_source=manager.get_filter_state if manager else None,
+                           state_version=manager.get_calibration_version if manager else None)
+    prefix = "raw." if raw else "q."
+    for i, meta in enumerate(reader.chunks):
+        # Chunkweise als Listen: ein Lesezugriff pro Spalte, danach reine Python-Schleife
+        times = reader.chunk("t", i).tolist()
+        columns = [(name, reader.chunk(prefix + name, i).tolist()) for name in reader.sensors]
+        first = meta["first_frame"]
+        for j, t in enumerate(times):
+            sample = {}
+            for name, column in columns:
+                q = column[j]
+                if q[0] == q[0]:  # NaN = kein Read in diesem Frame
+                    sample[name] = tuple(q)
+            if manager:
+                state = keyframes.get(first + j)
+                if state and first + j:
+                    _apply_calibration(manager, state)
+                writer.append(t, manager.process(sample, t=t), sample)
+            else:
+                writer.append(t, sample)
+    writer.close(verbose=False)
+
+    if os.path.exists(dst):
+        shutil.rmtree(dst)
+    os.replace(tmp, dst)
+    return {"frames": writer.frames, "raw": raw}
+
+
+def _work(task):
+    """Pool-Worker: (rel, src, dst, use_raw) -> (rel, Ergebnis, Fehler, Sekunden)."""
+    rel, src, dst, use_raw = task
+    t_start = time.perf_counter()
+    try:
+        result, error = reprocess_session(src, dst, use_raw), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return rel, result, error, time.perf_counter() - t_start
+
+
+def load_manifest(path, pipeline):
+    """Eintraege {rel: eintrag} aus einem Lauf mit gleichem Pipeline-Stand, sonst leer."""
+    sessions = {}
+    try:
+        with open(path) as f:
+            header = json.loads(f.readline())
+            if header.get("version") != MANIFEST_VERSION or header.get("pipeline") != pipeline:
+                return {}
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Beim Abbruch halb geschriebene letzte Zeile
+                sessions[entry.pop("session")] = entry
+    except (OSError, ValueError):
+        return {}
+    return sessions
+
+
+class ManifestLog:
+    """Haengt pro fertiger Sitzung eine Zeile an (konstante Kosten, auch bei tausenden Sitzungen)."""
+
+    def __init__(self, path, pipeline, entries):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(json.dumps({"version": MANIFEST_VERSION, "pipeline": pipeline}) + "\n")
+            for rel, entry in entries.items():
+                f.write(json.dumps(dict(entry, session=rel)) + "\n")
+        os.replace(tmp, path)  # Kompaktiert: pro Sitzung nur der letzte Eintrag
+        self.f = open(path, "a")
+
+    def add(self, rel, entry):
+        self.f.write(json.dumps(dict(entry, session=rel)) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+def reprocess(root, out, jobs=None, use_raw=True, force=False, verbose=True):
+    """
+    Wertet alle Sitzungen unter root neu aus (Ausgabe unter out; ist root selbst eine Sitzung,
+    landet sie unter out/<name>). Rueckgabe: Statistik-Dict,
+    "rom" = gemergter Bewegungsumfang aller fertigen Sitzungen (aus deren index.json).
+    """
+    root, out = os.path.abspath(root), os.path.abspath(out)
+    os.makedirs(out, exist_ok=True)
+    pipeline = pipeline_fingerprint()
+    manifest_path = os.path.join(out, MANIFEST_FILE)
+    done = {} if force else load_manifest(manifest_path, pipeline)
+
+    sources = [src for src in find_sessions(root) if src != out and not src.startswith(out + os.sep)]
+    # root selbst eine Sitzung: unter ihrem Namen ausgeben (rel "." wuerde out selbst ersetzen)
+    base = os.path.dirname(root) if os.path.exists(os.path.join(root, INDEX_FILE)) else root
+    tasks, sizes = [], {}
+    for src in sources:
+        rel = os.path.relpath(src, base)
+        if os.path.abspath(os.path.join(out, rel)) == out:
+            raise ValueError(f"Sitzung {src} wuerde das Ausgabe-Verzeichnis {out} ersetzen")
+        entry = done.get(rel)
+        if (entry and entry["status"] == "done" and entry["source"] == session_fingerprint(src)
+                and entry["recorded"] == (not use_raw)):
+            continue
+        with open(os.path.join(src, INDEX_FILE)) as f:
+            sizes[rel] = json.load(f).get("frames", 0)
+        tasks.append((rel, src, os.path.join(out, rel), use_raw))
+    # Grosse Sitzungen zuerst: kein langer Nachzuegler am Ende des Laufs
+    tasks.sort(key=lambda task: -sizes[task[0]])
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks) or 1))
+    total_frames = sum(sizes.values())
+    if verbose:
+        print(f"[FLEET] {len(tasks)} Sitzungen ({total_frames} Frames) mit {jobs} Prozessen, "
+              f"{len(sources) - len(tasks)} bereits fertig (Pipeline {pipeline})")
+
+    log = ManifestLog(manifest_path, pipeline, {rel: e for rel, e in done.items() if e["status"] == "done"})
+    t_start = time.perf_counter()
+    completed, frames, busy, errors = 0, 0, 0.0, 0
+
+    def finished(rel, result, error, seconds):
+        nonlocal completed, frames, busy, errors
+        completed += 1
+        busy += seconds
+        if error:
+            errors += 1
+            entry = {"status": "error", "error": error}
+        else:
+            frames += result["frames"]
+            entry = {"status": "done", "source": session_fingerprint(os.path.join(base, rel)),
+                     "recorded": not use_raw, "raw": result["raw"], "frames": result["frames"],
+                     "seconds": round(seconds, 3)}
+        done[rel] = entry
+        log.add(rel, entry)  # Ein Abbruch verliert hoechstens die gerade laufenden Sitzungen
+        if verbose:
+            elapsed = time.perf_counter() - t_start
+            rate = frames / elapsed if elapsed > 0 else 0.0
+            eta = (total_frames - frames) / rate if rate > 0 else 0.0
+            state = f"FEHLER {error}" if error else f"{result['frames']} Frames in {seconds:.1f} s"
+            print(f"[FLEET] {completed}/{len(tasks)} {rel}: {state} | {rate:,.0f} Frames/s, noch ~{eta:.0f} s")
+
+    try:
+        if jobs == 1:
+            for task in tasks:
+                finished(*_work(task))
+        elif tasks:
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(jobs) as pool:
+                for item in pool.imap_unordered(_work, tasks):
+                    finished(*item)
+    finally:
+        log.close()
+
+    wall = time.perf_counter() - t_start
+    if verbose and tasks:
+        # Parallelitaet = Summe der Rechenzeit pro Sitzung / Wandzeit (ideal: jobs)
+        print(f"[FLEET] Fertig: {frames} Frames in {wall:.1f} s ({frames / wall:,.0f} Frames/s), "
+              f"Parallelitaet {busy / wall:.1f} von {jobs}, {errors} Fehler")
+
+    rom = None
+    for rel, entry in sorted(done.items()):
+        stats = load_session(os.path.join(out, rel)) if entry["status"] == "done" else None
+        if stats is None:
+            continue
+        if rom is None:
+            rom = stats
+        else:
+            rom.merge(stats)
+    return {"sessions": len(tasks), "frames": frames, "errors": errors, "seconds": wall, "rom": rom}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ArmSense Sitzungs-Archiv mit der aktuellen Pipeline neu auswerten")
+    parser.add_argument("root", help="Archiv-Verzeichnis mit Sitzungen (main.py --record)")
+    parser.add_argument("out", help="Ausgabe-Verzeichnis (gleiche Struktur, Manifest reprocess.jsonl)")
+    parser.add_argument("--jobs", type=int, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--recorded", action="store_true",
+                        help="Aufgezeichnete Quaternionen statt Rohdaten verwenden (nur Winkel/Posen/ROM neu)")
+    parser.add_argument("--force", action="store_true", help="Manifest ignorieren und alles neu rechnen")
+    args = parser.parse_args()
+
+    stats = reprocess(args.root, args.out, args.jobs, use_raw=not args.recorded, force=args.force)
+    if stats["rom"]:
+        print(f"Bewegungsumfang ({stats['rom'].sessions} Sitzungen):")
+        print(stats["rom"].describe())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# recording/session.py
+"""
+Spaltenweise Aufzeichnung einer Sitzung fuer die Auswertung.
+
+Layout eines Sitzungs-Verzeichnisses:
+
+    sitzung/
+        index.json            Sensoren, Spalten, Posen-Namen, Chunks (Zeitbereich + Frames)
+        t/00000.npy           Zeitstempel (float64, Sekunden)
+        q.base/00000.npy      Gefilterte Quaternionen (float32, N x 4)
+        raw.base/00000.npy    Roh-Quaternionen vor Nullpunkt/Filter (float32, N x 4, NaN = kein Read)
+        angle.elbow/...       Gelenkwinkel in Grad (float32)
+        pose/...              Posen-ID (uint8, Index in "poses")
+
+Der Index enthaelt ausserdem den ROM-Snapshot (rom_stats.py) ueber alle geschriebenen Frames.
+
+Jede Spalte ist pro Chunk eine eigene .npy Datei. Der Reader mappt nur die Chunks
+der angefragten Spalte und des angefragten Zeitbereichs in den Speicher.
+
+Keyframes im Index sichern alle RECORD_KEYFRAME_FRAMES Frames den Filter-Zustand
+(SensorManager.get_filter_state()) *vor* dem jeweiligen Frame. Das Replay springt damit
+an jede Stelle, ohne den Filter ab Sitzungsbeginn neu laufen zu lassen. Aendert sich die
+Kalibrierung (state_version), folgt sofort ein Keyframe fuer den naechsten Frame, damit
+das Reprocessing sie ab demselben Frame anwendet wie die Live-Auswertung.
+"""
+import sys
+import os
+import json
+import bisect
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import RECORD_CHUNK_FRAMES, RECORD_KEYFRAME_FRAMES, JOINTS
+from pose_detector import PoseDetector, POSES
+from rom_stats import RomStats, joint_angles
+
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+IDENTITY = (1.0, 0.0, 0.0, 0.0)
+
+
+class SessionWriter:
+    """
+    Schreibt Frames chunkweise als Spalten. append() puffert nur in Listen; erst ein
+    voller Chunk wird als .npy geschrieben und im Index eingetragen (der Index auf der
+    Platte ist damit immer konsistent, auch wenn der Prozess abstuerzt).
+    """
+
+    def __init__(self, path, sensor_names, chunk_frames=RECORD_CHUNK_FRAMES, raw=True, joints=JOINTS,
+                 state_source=None, keyframe_frames=RECORD_KEYFRAME_FRAMES, state_version=None):
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            raise FileExistsError(f"Sitzung existiert bereits: {path}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.sensors = list(sensor_names)
+        self.joints = dict(joints)
+        self.chunk_frames = chunk_frames
+        self.raw = raw
+        self.detector = PoseDetector()
+        self.rom = RomStats(self.sensors, self.joints)
+
+        self.columns = {"t": ("float64", [])}
+        for name in self.sensors:
+            self.columns[f"q.{name}"] = ("float32", [4])
+            if raw:
+                self.columns[f"raw.{name}"] = ("float32", [4])
+        for joint in self.joints:
+            self.columns[f"angle.{joint}"] = ("float32", [])
+        self.columns["pose"] = ("uint8", [])
+
+        self.chunks = []
+        self.frames = 0
+        # state_source(): aktueller Filter-Zustand (nach dem zuletzt verarbeiteten Frame)
+        self.state_source = state_source
+        self.keyframe_frames = keyframe_frames
+        # state_version(): billiger Zaehler, der sich mit jeder Kalibrierung aendert
+        self.state_version = state_version
+        self._version = state_version() if state_version else None
+        self.keyframes = []
+        if state_source:
+            self.keyframes.append({"frame": 0, "state": state_source()})
+        self._reset_buffers()
+        self._write_index()
+
+    def _reset_buffers(self):
+        self.buffers = {column: [] for column in self.columns}
+
+    def append(self, t, data, raw=None):
+        """Ein Frame: Zeitstempel, gefilterte Daten (get_data()) und optional Rohdaten."""
+        buf = self.buffers
+        buf["t"].append(t)
+        for name in self.sensors:
+            buf[f"q.{name}"].append(data.get(name, IDENTITY))
+            if self.raw:
+                q_raw = (raw or {}).get(name)
+                buf[f"raw.{name}"].append(q_raw if q_raw is not None else (np.nan,) * 4)
+        # Segment- und Gelenkwinkel einmal berechnen: Spalten und Bewegungsumfang
+        angles = joint_angles(data, self.rom.pairs)
+        self.rom.add_angles(angles, t)
+        for joint in self.joints:
+            buf[f"angle.{joint}"].append(angles[f"joint.{joint}"])
+        buf["pose"].append(self.detector.classify(data)[0])
+
+        # Zustand nach diesem Frame = Zustand vor dem naechsten -> Keyframe fuer den naechsten Frame
+        next_frame = self.frames + len(buf["t"])
+        version = self.state_version() if self.state_version else None
+        if self.state_source and (next_frame % self.keyframe_frames == 0 or version != self._version):
+            self._version = version
+            self.keyframes.append({"frame": next_frame, "state": self.state_source()})
+
+        if len(buf["t"]) >= self.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        """Schreibt den aktuellen Puffer als neuen Chunk."""
+        n = len(self.buffers["t"])
+        if not n:
+            return
+        chunk = len(self.chunks)
+        for column, (dtype, _) in self.columns.items():
+            folder = os.path.join(self.path, column)
+            os.makedirs(folder, exist_ok=True)
+            np.save(os.path.join(folder, f"{chunk:05d}.npy"), np.asarray(self.buffers[column], dtype=dtype))
+
+        t = self.buffers["t"]
+        self.chunks.append({"start": t[0], "end": t[-1], "frames": n, "first_frame": self.frames})
+        self.frames += n
+        self._reset_buffers()
+        self._write_index()
+
+    def _write_index(self):
+        index = {
+            "version": FORMAT_VERSION,
+            "sensors": self.sensors,
+            "joints": {joint: list(pair) for joint, pair in self.joints.items()},
+            "poses": POSES,
+            "columns": {column: {"dtype": dtype, "shape": shape} for column, (dtype, shape) in self.columns.items()},
+            "frames": self.frames,
+            "chunks": self.chunks,
+            "keyframes": [kf for kf in self.keyframes if kf["frame"] < self.frames],
+            "rom": self.rom.snapshot(),  # Nach flush() deckt er genau die geschriebenen Frames ab
+        }
+        tmp = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, os.path.join(self.path, INDEX_FILE))
+
+    def close(self, verbose=True):
+        self.flush()
+        if verbose:
+            print(f"[REC] {self.frames} Frames in {len(self.chunks)} Chunks gespeichert: {self.path}")
+
+
+class SessionReader:
+    """
+    Liest einzelne Spalten einer Sitzung, optional auf einen Zeitbereich beschraenkt.
+    Chunks werden per mmap geoeffnet; nur die benoetigten Bereiche werden von der Platte gelesen.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE)) as f:
+            self.index = json.load(f)
+        if self.index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unbekannte Format-Version in {path}: {self.index.get('version')}")
+        self.sensors = self.index["sensors"]
+        self.poses = self.index["poses"]
+        self.chunks = self.index["chunks"]
+        self.keyframes = self.index.get("keyframes", [])
+        # Sparse Index: Startzeit / erster Frame pro Chunk (binaere Suche statt Scan)
+        self._chunk_starts = [c["start"] for c in self.chunks]
+        self._chunk_first = [c["first_frame"] for c in self.chunks]
+        self._keyframe_frames = [kf["frame"] for kf in self.keyframes]
+        self._mmaps = {}
+
+    @property
+    def columns(self):
+        return list(self.index["columns"])
+
+    @property
+    def frames(self):
+        return self.index["frames"]
+
+    def time_range(self):
+        if not self.chunks:
+            return None
+        return self.chunks[0]["start"], self.chunks[-1]["end"]
+
+    def chunk(self, column, i):
+        """Ein Chunk einer Spalte als np.memmap (nur lesend, bleibt geoeffnet)."""
+        key = (column, i)
+        mm = self._mmaps.get(key)
+        if mm is None:
+            if column not in self.index["columns"]:
+                raise KeyError(f"Spalte '{column}' nicht in der Sitzung (vorhanden: {', '.join(self.columns)})")
+            mm = np.load(os.path.join(self.path, column, f"{i:05d}.npy"), mmap_mode="r")
+            self._mmaps[key] = mm
+        return mm
+
+    def frame_at(self, t):
+        """Index des letzten Frames mit Zeitstempel <= t (0, falls t vor dem ersten Frame liegt)."""
+        i = max(0, bisect.bisect_right(self._chunk_starts, t) - 1)
+        pos = int(np.searchsorted(self.chunk("t", i), t, side="right")) - 1
+        return max(0, self._chunk_first[i] + pos)
+
+    def locate(self, frame):
+        """(Chunk-Nr., Position im Chunk) eines globalen Frame-Index."""
+        i = bisect.bisect_right(self._chunk_first, frame) - 1
+        return i, frame - self._chunk_first[i]
+
+    def row(self, column, frame):
+        i, pos = self.locate(frame)
+        return self.chunk(column, i)[pos]
+
+    def read_frames(self, column, first, last):
+        """Frames first..last (inklusive) einer Spalte, auch ueber Chunk-Grenzen."""
+        parts = []
+        frame = first
+        while frame <= last:
+            i, pos = self.locate(frame)
+            n = min(self.chunks[i]["frames"] - pos, last - frame + 1)
+            parts.append(self.chunk(column, i)[pos:pos + n])
+            frame += n
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def keyframe_before(self, frame):
+        """Letzter Keyframe mit Frame-Index <= frame oder None."""
+        i = bisect.bisect_right(self._keyframe_frames, frame) - 1
+        return self.keyframes[i] if i >= 0 else None
+
+    def iter_chunks(self, column, start=None, end=None):
+        """
+        Liefert (Chunk-Nr., Slice-Anfang, mmap-Slice) fuer alle Chunks im Zeitbereich [start, end].
+        Die Zeitspalte wird nur fuer die Rand-Chunks gelesen (binaere Suche).
+        """
+        for i, meta in enumerate(self.chunks):
+            if start is not None and meta["end"] < start:
+                continue
+            if end is not None and meta["start"] > end:
+                break
+            lo, hi = 0, meta["frames"]
+            if (start is not None and meta["start"] < start) or (end is not None and meta["end"] > end):
+                t = self.chunk("t", i)
+                if start is not None:
+                    lo = int(np.searchsorted(t, start, side="left"))
+                if end is not None:
+                    hi = int(np.searchsorted(t, end, side="right"))
+            if hi > lo:
+                yield i, lo, self.chunk(column, i)[lo:hi]
+
+    def read(self, column, start=None, end=None):
+        """Spalte im Zeitbereich [start, end] als zusammenhaengendes Array."""
+        parts = [part for _, _, part in self.iter_chunks(column, start, end)]
+        if not parts:
+            meta = self.index["columns"][column]
+            return np.empty([0] + meta["shape"], dtype=meta["dtype"])
+        if len(parts) == 1:
+            return parts[0]  # Bleibt memory-mapped
+        return np.concatenate(parts)
+
+    def read_columns(self, columns, start=None, end=None):
+        return {column: self.read(column, start, end) for column in columns}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ArmSense Sitzung anzeigen / Spalte exportieren")
+    parser.add_argument("session", help="Sitzungs-Verzeichnis (main.py --record)")
+    parser.add_argument("--column", help="Spalte ausgeben, z.B. angle.elbow")
+    parser.add_argument("--start", type=float, help="Startzeit (Unix-Sekunden)")
+    parser.add_argument("--end", type=float, help="Endzeit (Unix-Sekunden)")
+    parser.add_argument("-o", "--output", help="Spalte als .npy speichern statt Statistik ausgeben")
+    args = parser.parse_args()
+
+    reader = SessionReader(args.session)
+    if not args.column:
+        t_range = reader.time_range()
+        duration = t_range[1] - t_range[0] if t_range else 0.0
+        print(f"Sitzung: {args.session}")
+        print(f"  Frames:   {reader.frames} in {len(reader.chunks)} Chunks ({duration:.1f} s)")
+        print(f"  Sensoren: {', '.join(reader.sensors)}")
+        print(f"  Spalten:  {', '.join(reader.columns)}")
+        return
+
+    values = reader.read(args.column, args.start, args.end)
+    if args.output:
+        np.save(args.output, values)
+        print(f"{len(values)} Werte -> {args.output}")
+    elif len(values):
+        print(f"{args.column}: {len(values)} Werte, min {np.nanmin(values):.2f}, "
+              f"max {np.nanmax(values):.2f}, mittel {np.nanmean(values):.2f}")
+    else:
+        print(f"{args.column}: keine Werte im Zeitbereich")
+
+
+if __name__ == "__main__":
+    main()
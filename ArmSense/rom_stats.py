@@ -0,0 +1,318 @@
+# rom_stats.py
+"""
+Bewegungsumfang (Range of Motion) ueber den Frame-Strom mit konstantem Speicher.
+
+Pro Kanal (Segment-Winkel zum Nullpunkt und Gelenkwinkel aus JOINTS) laufen ein
+Welford-Akkumulator (Anzahl, Min/Max, Mittelwert, Varianz) und ein t-Digest fuer die
+Perzentile. Beide lassen sich mergen: Snapshots einzelner Sitzungen (index.json, Feld "rom")
+ergeben zusammen dieselbe Statistik wie ein Durchlauf ueber alle Frames, ohne die
+Rohdaten erneut zu lesen.
+
+    python rom_stats.py sitzungen/               # Alle Sitzungen zusammengefasst
+    python rom_stats.py sitzungen/ --per-session
+"""
+import sys
+import os
+import json
+import math
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config import JOINTS, ROM_COMPRESSION, ROM_PERCENTILES
+from utils import q_angle_between
+
+IDENTITY = (1.0, 0.0, 0.0, 0.0)
+SNAPSHOT_VERSION = 1
+
+
+def joint_angles(data, joints=JOINTS):
+    """Gelenkwinkel in Grad: Winkel zwischen Eltern- und Kind-Segment (None = Nullpunkt)."""
+    angles = {}
+    for joint, (parent, child) in joints.items():
+        q_parent = IDENTITY if parent is None else data.get(parent, IDENTITY)
+        angles[joint] = q_angle_between(q_parent, data.get(child, IDENTITY))
+    return angles
+
+
+class Welford:
+    """Anzahl, Min/Max, Mittelwert und Varianz in einem Durchlauf (numerisch stabil, mergebar)."""
+    __slots__ = ("n", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min: self.min = x
+        if x > self.max: self.max = x
+
+    def merge(self, other):
+        """Chan et al.: kombiniert zwei Teil-Statistiken exakt."""
+        if not other.n:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Stichproben-Varianz (n - 1)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def to_dict(self):
+        return {"n": self.n, "mean": self.mean, "m2": self.m2,
+                "min": self.min if self.n else None, "max": self.max if self.n else None}
+
+    @classmethod
+    def from_dict(cls, d):
+        w = cls()
+        w.n, w.mean, w.m2 = d["n"], d["mean"], d["m2"]
+        if w.n:
+            w.min, w.max = d["min"], d["max"]
+        return w
+
+
+class TDigest:
+    """
+    Merging t-Digest (Dunning): hoechstens ~compression Zentroide, genauer an den Raendern.
+    Neue Werte landen in einem Puffer, der beim Ueberlaufen einsortiert wird.
+    """
+    __slots__ = ("compression", "centroids", "buffer", "count", "min", "max")
+
+    def __init__(self, compression=ROM_COMPRESSION):
+        self.compression = compression
+        self.centroids = []  # [(mittelwert, gewicht), ...] sortiert
+        self.buffer = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x, weight=1):
+        self.buffer.append((x, weight))
+        self.count += weight
+        if x < self.min: self.min = x
+        if x > self.max: self.max = x
+        if len(self.buffer) >= 5 * self.compression:
+            self._compress()
+
+    def _k(self, q):
+        # Skalenfunktion k1: kleine Zentroide nahe q = 0 und q = 1
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _q_limit(self, q):
+        return (math.sin(min(self._k(q) + 1, self.compression / 4) * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self):
+        if not self.buffer:
+            return
+        points = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        total = float(self.count)
+        merged = []
+        mean, weight = points[0]
+        done = 0.0  # Gewicht der abgeschlossenen Zentroide
+        limit = self._q_limit(0.0) * total
+        for x, w in points[1:]:
+            if done + weight + w <= limit:
+                weight += w
+                mean += (x - mean) * w / weight
+            else:
+                merged.append((mean, weight))
+                done += weight
+                limit = self._q_limit(done / total) * total
+                mean, weight = x, w
+        merged.append((mean, weight))
+        self.centroids = merged
+
+    def merge(self, other):
+        if not other.count:
+            return
+        self.buffer.extend(other.centroids)
+        self.buffer.extend(other.buffer)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def quantile(self, q):
+        """Wert am Anteil q (0..1), linear zwischen den Zentroid-Mitten interpoliert."""
+        self._compress()
+        c = self.centroids
+        if not c:
+            return None
+        if len(c) == 1:
+            return c[0][0]
+        target = q * self.count
+        # Rand: zwischen Minimum und erstem Zentroid bzw. letztem Zentroid und Maximum
+        first = c[0][1] / 2
+        if target <= first:
+            return self.min + (c[0][0] - self.min) * target / first
+        cum = first
+        for (m0, w0), (m1, w1) in zip(c, c[1:]):
+            step = (w0 + w1) / 2
+            if target <= cum + step:
+                return m0 + (m1 - m0) * (target - cum) / step
+            cum += step
+        last = c[-1][1] / 2
+        return c[-1][0] + (self.max - c[-1][0]) * min(1.0, (target - cum) / last)
+
+    def to_dict(self):
+        self._compress()
+        return {"compression": self.compression, "centroids": [[m, w] for m, w in self.centroids],
+                "min": self.min if self.count else None, "max": self.max if self.count else None}
+
+    @classmethod
+    def from_dict(cls, d):
+        digest = cls(d["compression"])
+        digest.centroids = [(m, w) for m, w in d["centroids"]]
+        digest.count = sum(w for _, w in digest.centroids)
+        if digest.count:
+            digest.min, digest.max = d["min"], d["max"]
+        return digest
+
+
+class RomStats:
+    """
+    Statistik pro Kanal: "segment.<sensor>" (Winkel zum Nullpunkt) und "joint.<gelenk>" (JOINTS).
+    add() pro Frame, summary() jederzeit, snapshot()/merge() fuer Sitzungen.
+    """
+
+    def __init__(self, sensors=(), joints=JOINTS, compression=ROM_COMPRESSION):
+        self.pairs = {f"segment.{name}": (None, name) for name in sensors}
+        self.pairs.update((f"joint.{joint}", tuple(pair)) for joint, pair in joints.items())
+        self.welford = {channel: Welford() for channel in self.pairs}
+        self.digests = {channel: TDigest(compression) for channel in self.pairs}
+        self.frames = 0
+        self.sessions = 1
+        self._duration = 0.0  # Dauer bereits gemergter Teile
+        self.t_first = None
+        self.t_last = None
+
+    @property
+    def duration(self):
+        own = self.t_last - self.t_first if self.t_first is not None else 0.0
+        return self._duration + own
+
+    def add(self, data, t=None):
+        self.add_angles(joint_angles(data, self.pairs), t)
+
+    def add_angles(self, angles, t=None):
+        """Winkel {kanal: grad} eines Frames (z.B. wenn der Aufrufer sie ohnehin berechnet)."""
+        for channel, angle in angles.items():
+            self.welford[channel].add(angle)
+            self.digests[channel].add(angle)
+        self.frames += 1
+        if t is not None:
+            if self.t_first is None:
+                self.t_first = t
+            self.t_last = t
+
+    def merge(self, other):
+        for channel in other.pairs:
+            if channel not in self.pairs:
+                self.pairs[channel] = other.pairs[channel]
+                self.welford[channel] = Welford()
+                self.digests[channel] = TDigest(other.digests[channel].compression)
+            self.welford[channel].merge(other.welford[channel])
+            self.digests[channel].merge(other.digests[channel])
+        self.frames += other.frames
+        self.sessions += other.sessions
+        self._duration += other.duration
+
+    def summary(self, percentiles=ROM_PERCENTILES):
+        """{kanal: {n, min, max, range, mean, std, p5, ...}} in Grad."""
+        result = {}
+        for channel, w in self.welford.items():
+            if not w.n:
+                continue
+            stats = {"n": w.n, "min": w.min, "max": w.max, "range": w.max - w.min,
+                     "mean": w.mean, "std": math.sqrt(w.variance)}
+            digest = self.digests[channel]
+            for p in percentiles:
+                stats[f"p{p:g}"] = digest.quantile(p / 100.0)
+            result[channel] = stats
+        return result
+
+    def snapshot(self):
+        """JSON-taugliche Kopie (fuer index.json und merge ueber Sitzungen)."""
+        return {"version": SNAPSHOT_VERSION, "frames": self.frames, "sessions": self.sessions,
+                "duration": self.duration,
+                "channels": {channel: {"pair": list(pair), "welford": self.welford[channel].to_dict(),
+                                       "digest": self.digests[channel].to_dict()}
+                             for channel, pair in self.pairs.items()}}
+
+    @classmethod
+    def from_snapshot(cls, snap):
+        if snap.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unbekannte ROM-Snapshot-Version: {snap.get('version')}")
+        stats = cls(joints={})
+        for channel, entry in snap["channels"].items():
+            stats.pairs[channel] = tuple(entry["pair"])
+            stats.welford[channel] = Welford.from_dict(entry["welford"])
+            stats.digests[channel] = TDigest.from_dict(entry["digest"])
+        stats.frames = snap["frames"]
+        stats.sessions = snap["sessions"]
+        stats._duration = snap["duration"]
+        return stats
+
+    def describe(self, percentiles=ROM_PERCENTILES):
+        lines = []
+        for channel, s in self.summary(percentiles).items():
+            quantiles = " ".join(f"p{p:g} {s[f'p{p:g}']:.1f}" for p in percentiles)
+            lines.append(f"  {channel:16s} {s['min']:6.1f} .. {s['max']:6.1f} Grad (Umfang {s['range']:.1f}), "
+                         f"mittel {s['mean']:.1f} +/- {s['std']:.1f} | {quantiles}")
+        return "\n".join(lines) or "  (keine Frames)"
+
+
+def load_session(path):
+    """ROM-Snapshot aus dem index.json einer Sitzung oder None (aeltere Aufzeichnung)."""
+    with open(os.path.join(path, "index.json")) as f:
+        snap = json.load(f).get("rom")
+    return RomStats.from_snapshot(snap) if snap else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bewegungsumfang aus den ROM-Snapshots aufgezeichneter Sitzungen")
+    parser.add_argument("root", help="Sitzung oder Verzeichnis mit Sitzungen (main.py --record)")
+    parser.add_argument("--per-session", action="store_true", help="Jede Sitzung einzeln ausgeben")
+    parser.add_argument("--json", action="store_true", help="Zusammenfassung als JSON ausgeben")
+    args = parser.parse_args()
+
+    sessions = sorted(folder for folder, _, files in os.walk(args.root) if "index.json" in files)
+    total, missing = None, []
+    for path in sessions:
+        stats = load_session(path)
+        if stats is None:
+            missing.append(path)
+            continue
+        if args.per_session and not args.json:
+            print(f"{os.path.relpath(path, args.root)}: {stats.frames} Frames, {stats.duration:.1f} s")
+            print(stats.describe())
+        if total is None:
+            total = stats
+        else:
+            total.merge(stats)
+
+    if args.json:
+        print(json.dumps(total.summary() if total else {}, indent=1))
+        return
+    if total:
+        print(f"Gesamt: {total.sessions} Sitzungen, {total.frames} Frames, {total.duration:.1f} s")
+        print(total.describe())
+    if missing:
+        print(f"Ohne ROM-Snapshot (aeltere Aufzeichnung): {len(missing)} Sitzungen")
+
+
+if __name__ == "__main__":
+    main()
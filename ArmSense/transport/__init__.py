@@ -0,0 +1,3 @@
+# transport/__init__.py
+from .shm_ring import SharedFrameWriter, SharedFrameReader
+from .net_stream import FrameEncoder, StreamClient, UdpPublisher, NetworkFrameSource
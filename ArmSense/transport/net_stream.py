@@ -0,0 +1,315 @@
+# transport/net_stream.py
+import sys
+import os
+import json
+import time
+import socket
+import struct
+import bisect
+import threading
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import q_slerp, q_normalize
+
+# --- PAKETFORMAT ---
+# Header (16 Bytes): magic "AS", kind, n_sensors, seq (uint32), timestamp (double)
+# KIND_FRAME: n_sensors * 4 * int16 (Quaternion w, x, y, z skaliert mit 32767)
+#             -> 16 + 8 * n Bytes pro Frame (2 Sensoren = 32 Bytes)
+# KIND_NAMES: JSON-Liste der Sensornamen (wird periodisch / beim Verbinden gesendet)
+# KIND_EVENT: JSON-Objekt (Posen-Wechsel, Kalibrierung; main.py --headless --format binary)
+
+MAGIC = b"AS"
+KIND_FRAME = 0
+KIND_NAMES = 1
+KIND_EVENT = 2
+
+_HEADER = struct.Struct("<2sBBId")
+Q_SCALE = 32767.0
+
+
+def _to_int16(v):
+    return max(-32767, min(32767, int(round(v * Q_SCALE))))
+
+
+class FrameEncoder:
+    """Kodiert SensorManager-Frames in kompakte Binaer-Pakete."""
+
+    def __init__(self, sensor_names):
+        self.sensor_names = list(sensor_names)
+        self.n = len(self.sensor_names)
+        self._names = tuple(self.sensor_names)
+        self._body = struct.Struct("<%dh" % (4 * self.n))
+        self.seq = 0
+
+    def encode(self, sensor_data, timestamp):
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        layout = getattr(sensor_data, "layout", None)
+        if layout is not None and layout.names == self._names:
+            # SensorFrame (frame.py) mit gleicher Sensor-Reihenfolge
+            values = [_to_int16(v) for v in sensor_data.values]
+        else:
+            values = []
+            for name in self.sensor_names:
+                values.extend(_to_int16(v) for v in sensor_data.get(name, (1.0, 0.0, 0.0, 0.0)))
+        return _HEADER.pack(MAGIC, KIND_FRAME, self.n, self.seq, timestamp) + self._body.pack(*values)
+
+    def encode_names(self):
+        body = json.dumps(self.sensor_names).encode("utf-8")
+        return _HEADER.pack(MAGIC, KIND_NAMES, self.n, self.seq, time.time()) + body
+
+    def encode_event(self, event, timestamp):
+        body = json.dumps(event).encode("utf-8")
+        return _HEADER.pack(MAGIC, KIND_EVENT, self.n, self.seq, timestamp) + body
+
+
+def decode(packet):
+    """
+    Dekodiert ein Paket.
+    Rueckgabe: (KIND_FRAME, seq, timestamp, [q, ...]), (KIND_NAMES, seq, timestamp, [name, ...])
+    oder (KIND_EVENT, seq, timestamp, {ereignis}).
+    Wirft ValueError bei ungueltigen Paketen.
+    """
+    if len(packet) < _HEADER.size:
+        raise ValueError("Paket zu kurz")
+    magic, kind, n, seq, timestamp = _HEADER.unpack_from(packet, 0)
+    if magic != MAGIC:
+        raise ValueError("Kein ArmSense-Paket")
+
+    if kind in (KIND_NAMES, KIND_EVENT):
+        return kind, seq, timestamp, json.loads(bytes(packet[_HEADER.size:]).decode("utf-8"))
+    if kind != KIND_FRAME or len(packet) != _HEADER.size + 8 * n:
+        raise ValueError("Ungueltiger Frame")
+
+    raw = struct.unpack_from("<%dh" % (4 * n), packet, _HEADER.size)
+    quats = [q_normalize(tuple(v / Q_SCALE for v in raw[i * 4:i * 4 + 4])) for i in range(n)]
+    return kind, seq, timestamp, quats
+
+
+class StreamClient:
+    """
+    Client-Logik unabhaengig vom Transport: Pakete mit feed() einspeisen,
+    mit sample() einen interpolierten Frame fuer einen Zeitpunkt abholen.
+
+    - Sortiert verspaetete Pakete in die Historie ein, verwirft Duplikate
+    - Zaehlt verlorene Frames anhand der Sequenznummern
+    - Interpoliert (SLERP) zwischen den benachbarten Frames, auch ueber Luecken hinweg
+    """
+
+    def __init__(self, history=64, delay=0.05):
+        self.sensor_names = None
+        self.delay = delay
+        self._times = deque(maxlen=history)
+        self._frames = deque(maxlen=history)
+        self._seqs = deque(maxlen=history)
+        self._offset = None      # geschaetzte Differenz Empfaenger-Uhr - Sender-Uhr
+        self._first_seq = None
+        self._max_seq = None
+        self.received = 0
+        self.duplicates = 0
+        self.late = 0
+
+    @property
+    def lost(self):
+        if self._first_seq is None:
+            return 0
+        return max(0, (self._max_seq - self._first_seq + 1) - self.received)
+
+    def feed(self, packet, recv_time=None):
+        """Verarbeitet ein Paket. Rueckgabe True, wenn ein neuer Frame aufgenommen wurde."""
+        try:
+            kind, seq, timestamp, payload = decode(packet)
+        except (ValueError, struct.error):
+            return False
+
+        if kind == KIND_NAMES:
+            self.sensor_names = payload
+            return False
+        if kind != KIND_FRAME:
+            return False
+        if self.sensor_names is None or len(payload) != len(self.sensor_names):
+            return False
+
+        if recv_time is None:
+            recv_time = time.time()
+        offset = recv_time - timestamp
+        # Minimum der Laufzeit als Uhren-Offset (Jitter erhoeht den Wert nur)
+        if self._offset is None or offset < self._offset:
+            self._offset = offset
+
+        if self._first_seq is None or self._max_seq - seq > self._seqs.maxlen:
+            # Erster Frame oder Sender neu gestartet (Sequenz springt weit zurueck)
+            self._reset(seq)
+
+        if seq in self._seqs:
+            self.duplicates += 1
+            return False
+        if self._seqs and seq < self._seqs[0]:
+            self.late += 1
+            return False
+
+        frame = dict(zip(self.sensor_names, payload))
+        idx = bisect.bisect(self._times, timestamp)
+        if idx == len(self._times):
+            self._times.append(timestamp)
+            self._frames.append(frame)
+            self._seqs.append(seq)
+        else:
+            # Verspaetetes Paket in zeitlicher Reihenfolge einsortieren
+            if len(self._times) == self._times.maxlen:
+                self._times.popleft()
+                self._frames.popleft()
+                self._seqs.popleft()
+                idx -= 1
+                if idx < 0:
+                    self.late += 1
+                    return False
+            self._times.insert(idx, timestamp)
+            self._frames.insert(idx, frame)
+            self._seqs.insert(idx, seq)
+        self._max_seq = max(self._max_seq, seq)
+        self.received += 1
+        return True
+
+    def _reset(self, seq):
+        self._times.clear()
+        self._frames.clear()
+        self._seqs.clear()
+        self._first_seq = seq
+        self._max_seq = seq
+        self.received = 0
+
+    def latest(self):
+        return dict(self._frames[-1]) if self._frames else None
+
+    def sample(self, now=None):
+        """
+        Interpolierter Frame fuer die lokale Zeit now (Standard: time.time()),
+        zeitversetzt um self.delay, damit fast immer zwei Nachbar-Frames vorliegen.
+        """
+        if not self._frames:
+            return None
+        if now is None:
+            now = time.time()
+        t = now - self._offset - self.delay
+
+        idx = bisect.bisect(self._times, t)
+        if idx == 0:
+            return dict(self._frames[0])
+        if idx == len(self._times):
+            return dict(self._frames[-1])
+
+        t0, t1 = self._times[idx - 1], self._times[idx]
+        f0, f1 = self._frames[idx - 1], self._frames[idx]
+        alpha = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+        return {name: q_slerp(f0[name], f1[name], alpha) for name in f0}
+
+    def stats(self):
+        return {"received": self.received, "lost": self.lost,
+                "duplicates": self.duplicates, "late": self.late}
+
+
+# --- UDP MULTICAST ---
+
+class UdpPublisher:
+    """Sendet Frames per UDP Multicast (ein Datagramm pro Frame)."""
+
+    def __init__(self, sensor_names, group, port, ttl=1, names_interval=1.0):
+        self.encoder = FrameEncoder(sensor_names)
+        self.addr = (group, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        self.names_interval = names_interval
+        self._last_names = 0.0
+
+    def publish(self, sensor_data, timestamp):
+        try:
+            if timestamp - self._last_names >= self.names_interval:
+                self.sock.sendto(self.encoder.encode_names(), self.addr)
+                self._last_names = timestamp
+            self.sock.sendto(self.encoder.encode(sensor_data, timestamp), self.addr)
+        except OSError as e:
+            print(f"[NET] UDP Sendefehler: {e}")
+
+    def close(self):
+        self.sock.close()
+
+
+def open_udp_receiver(group, port):
+    """Socket, der der Multicast-Gruppe beitritt."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("", port))
+    mreq = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton("0.0.0.0"))
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+    return sock
+
+
+# --- FRAME-QUELLE FUER VIEWER ---
+
+class NetworkFrameSource:
+    """
+    Empfaengt einen Stream im Hintergrund und bietet get_data() wie der SensorManager.
+    url: "udp://GRUPPE:PORT" oder "ws://HOST:PORT"
+    """
+
+    def __init__(self, url, delay=0.05):
+        self.url = url
+        self.client = StreamClient(delay=delay)
+        self._lock = threading.Lock()
+        self._running = True
+
+        scheme, _, rest = url.partition("://")
+        host, _, port = rest.rpartition(":")
+        if scheme == "udp":
+            self._sock = open_udp_receiver(host, int(port))
+            self._sock.settimeout(0.5)
+            target = self._udp_loop
+        elif scheme == "ws":
+            from .websocket import WebSocketClient
+            self._ws = WebSocketClient(host, int(port))
+            target = self._ws_loop
+        else:
+            raise ValueError(f"Unbekanntes Schema in '{url}' (udp:// oder ws://)")
+
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def _udp_loop(self):
+        while self._running:
+            try:
+                packet = self._sock.recv(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            with self._lock:
+                self.client.feed(packet)
+
+    def _ws_loop(self):
+        try:
+            for message in self._ws.messages():
+                if not self._running:
+                    break
+                with self._lock:
+                    self.client.feed(message)
+        except OSError as e:
+            print(f"[NET] Verbindung zu {self.url} verloren: {e}")
+
+    def get_data(self, raw_align=False):
+        with self._lock:
+            frame = self.client.sample()
+        return frame if frame is not None else {"base": (1, 0, 0, 0), "arm": (1, 0, 0, 0)}
+
+    def calibrate_zero(self):
+        print("[NET] Kalibrierung nur an der Akquisitions-Station moeglich.")
+
+    def calibrate_forward(self):
+        print("[NET] Kalibrierung nur an der Akquisitions-Station moeglich.")
+
+    def close(self):
+        self._running = False
+        if hasattr(self, "_sock"):
+            self._sock.close()
+        if hasattr(self, "_ws"):
+            self._ws.close()
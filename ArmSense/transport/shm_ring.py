@@ -0,0 +1,313 @@
+# transport/shm_ring.py
+import os
+import json
+import struct
+import tempfile
+from multiprocessing import shared_memory, resource_tracker
+
+try:
+    import fcntl
+except ImportError:  # Windows: kein flock, Kommandos dann ohne Sperre
+    fcntl = None
+
+# --- SPEICHER-LAYOUT ---
+# [Header][Sensor-Namen (JSON)][Slot 0][Slot 1]...[Slot N-1]
+#
+# Header: magic, version, n_sensors, capacity, names_len, slot_size, writer_pid
+#         + write_seq (letzter fertig geschriebener Frame)
+#         + cmd_seq + CMD_SLOTS Kommando-Codes (Kommando-Kanal Richtung Daemon)
+# Slot:   seq_begin, timestamp, n_sensors * (w, x, y, z), seq_end
+#
+# Jeder Slot ist durch ein Seqlock geschuetzt: Der Writer schreibt zuerst
+# seq_begin, dann die Daten, zuletzt seq_end. Der Leser liest in umgekehrter
+# Reihenfolge (seq_end, Daten, seq_begin) und verwirft den Slot, wenn beide
+# Zaehler nicht uebereinstimmen (Writer war waehrenddessen aktiv).
+#
+# Kommandos: Mehrere Leser (Renderer, --connect Clients) duerfen gleichzeitig
+# senden. Ein Sender haelt dafuer eine Lock-Datei (flock), schreibt den Code in
+# Slot (cmd_seq + 1) % CMD_SLOTS und erhoeht erst danach cmd_seq. Der Daemon
+# arbeitet alle Kommandos seit seinem letzten poll_command() der Reihe nach ab.
+
+MAGIC = b"ASHM"
+VERSION = 3
+
+_STATIC = struct.Struct("<4sHHIIII")    # 24 Bytes
+_U64 = struct.Struct("<Q")
+
+OFF_WRITE_SEQ = 24
+OFF_CMD_SEQ = 32
+OFF_CMD_CODES = 40
+CMD_SLOTS = 8
+OFF_NAMES = OFF_CMD_CODES + 8 * CMD_SLOTS
+
+# Kommandos vom Leser an den Daemon
+CMD_NONE = 0
+CMD_ZERO = 1     # calibrate_zero()
+CMD_FORWARD = 2  # calibrate_forward()
+
+
+def _slot_size(n_sensors):
+    return 8 + 8 + 32 * n_sensors + 8
+
+
+def _open(name, create=False, size=0):
+    """
+    Oeffnet ein Segment ohne Registrierung beim resource_tracker.
+    Das Segment gehoert dem Daemon und wird nur von SharedFrameWriter.close() entfernt,
+    nicht automatisch beim Beenden eines Lesers (Python < 3.13 Verhalten).
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _pid_alive(pid):
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Prozess eines anderen Benutzers
+    return True
+
+
+def _writer_pid(shm):
+    """PID des Writers eines vorhandenen Segments (0 = unbekannt, z.B. aeltere Version)."""
+    if shm.size < _STATIC.size:
+        return 0
+    magic, version, _, _, _, _, pid = _STATIC.unpack_from(shm.buf, 0)
+    # writer_pid steht seit v2 an derselben Stelle
+    return pid if magic == MAGIC and version >= 2 else 0
+
+
+def _lock_path(name):
+    """Lock-Datei, ueber die sich die Kommando-Sender eines Segments abstimmen."""
+    return os.path.join(tempfile.gettempdir(), f"{name.lstrip('/')}.cmd.lock")
+
+
+def _unlink(shm):
+    if not hasattr(shm, "_track"):
+        # Python < 3.13: unlink() meldet sich beim Tracker ab -> Registrierung ausgleichen
+        resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+
+
+class SharedFrameWriter:
+    """Schreibt gefilterte Frames in einen Shared-Memory-Ringpuffer (ein Writer pro Segment)."""
+
+    def __init__(self, name, sensor_names, capacity=256):
+        self.sensor_names = list(sensor_names)
+        self.n = len(self.sensor_names)
+        self._names = tuple(self.sensor_names)
+        self.capacity = capacity
+        self.slot_size = _slot_size(self.n)
+
+        names = json.dumps(self.sensor_names).encode("utf-8")
+        names_len = len(names)
+        self.slots_offset = OFF_NAMES + ((names_len + 7) // 8) * 8
+        size = self.slots_offset + capacity * self.slot_size
+
+        try:
+            self.shm = _open(name, create=True, size=size)
+        except FileExistsError:
+            # Nur Reste eines abgestuerzten Daemons aufraeumen, nie den Ring eines laufenden
+            stale = _open(name)
+            pid = _writer_pid(stale)
+            stale.close()
+            if _pid_alive(pid):
+                raise FileExistsError(f"Ringpuffer '{name}' wird von Prozess {pid} beschrieben "
+                                      f"(laeuft bereits ein Daemon?)")
+            _unlink(stale)
+            self.shm = _open(name, create=True, size=size)
+
+        buf = self.shm.buf
+        _STATIC.pack_into(buf, 0, MAGIC, VERSION, self.n, capacity, names_len, self.slot_size, os.getpid())
+        _U64.pack_into(buf, OFF_WRITE_SEQ, 0)
+        _U64.pack_into(buf, OFF_CMD_SEQ, 0)
+        for i in range(CMD_SLOTS):
+            _U64.pack_into(buf, OFF_CMD_CODES + 8 * i, CMD_NONE)
+        buf[OFF_NAMES:OFF_NAMES + names_len] = names
+
+        self._slot_struct = struct.Struct("<d%dd" % (4 * self.n))
+        self._seq = 0
+        self._last_cmd_seq = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, sensor_data, timestamp):
+        """Schreibt einen Frame (dict name -> Quaternion) in den naechsten Slot."""
+        seq = self._seq + 1
+        off = self.slots_offset + (seq % self.capacity) * self.slot_size
+        buf = self.shm.buf
+        _U64.pack_into(buf, off, seq)
+        layout = getattr(sensor_data, "layout", None)
+        if layout is not None and layout.names == self._names:
+            # SensorFrame (frame.py) mit gleicher Sensor-Reihenfolge: Werte direkt aus dem Array
+            self._slot_struct.pack_into(buf, off + 8, timestamp, *sensor_data.values)
+        else:
+            values = [timestamp]
+            for name in self.sensor_names:
+                values.extend(sensor_data.get(name, (1.0, 0.0, 0.0, 0.0)))
+            self._slot_struct.pack_into(buf, off + 8, *values)
+        _U64.pack_into(buf, off + self.slot_size - 8, seq)
+        _U64.pack_into(buf, OFF_WRITE_SEQ, seq)
+        self._seq = seq
+        return seq
+
+    def poll_command(self):
+        """
+        Liefert das naechste ausstehende Kommando eines Lesers (CMD_*) oder CMD_NONE.
+        Mehrere ausstehende Kommandos kommen bei aufeinanderfolgenden Aufrufen in
+        Sende-Reihenfolge; mehr als CMD_SLOTS ausstehende ueberschreiben die aeltesten.
+        """
+        buf = self.shm.buf
+        cmd_seq = _U64.unpack_from(buf, OFF_CMD_SEQ)[0]
+        if cmd_seq == self._last_cmd_seq:
+            return CMD_NONE
+        seq = max(self._last_cmd_seq + 1, cmd_seq - CMD_SLOTS + 1)
+        self._last_cmd_seq = seq
+        return _U64.unpack_from(buf, OFF_CMD_CODES + 8 * (seq % CMD_SLOTS))[0]
+
+    def close(self, unlink=True):
+        self.shm.close()
+        if unlink:
+            try:
+                _unlink(self.shm)
+            except FileNotFoundError:
+                pass
+            try:
+                os.remove(_lock_path(self.shm.name))
+            except FileNotFoundError:
+                pass
+
+
+class SharedFrameReader:
+    """
+    Liest Frames aus dem Ringpuffer eines laufenden Daemons.
+    Bietet get_data()/calibrate_zero()/calibrate_forward() wie der SensorManager,
+    damit Visualizer und Debug-Tools ohne Aenderung umgestellt werden koennen.
+    """
+
+    def __init__(self, name):
+        self.shm = _open(name)
+        buf = self.shm.buf
+        magic, version, n, capacity, names_len, slot_size, _ = _STATIC.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f"Segment '{name}' ist kein ArmSense-Ringpuffer (v{VERSION})")
+
+        self.sensor_names = json.loads(bytes(buf[OFF_NAMES:OFF_NAMES + names_len]).decode("utf-8"))
+        self.n = n
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.slots_offset = OFF_NAMES + ((names_len + 7) // 8) * 8
+        self._slot_struct = struct.Struct("<d%dd" % (4 * n))
+
+        self.last_seq = 0
+        self.last_timestamp = 0.0
+        self._last_data = {name: (1, 0, 0, 0) for name in self.sensor_names}
+        self._lock_path = _lock_path(self.shm.name)
+        self._lock_file = None
+
+    @property
+    def write_seq(self):
+        return _U64.unpack_from(self.shm.buf, OFF_WRITE_SEQ)[0]
+
+    def _slot_offset(self, seq):
+        return self.slots_offset + (seq % self.capacity) * self.slot_size
+
+    def view(self, seq):
+        """
+        Zero-Copy Sicht auf die Quaternionen eines Slots (memoryview, Format 'd',
+        Laenge 4 * n_sensors). Gueltig nur, solange check(seq) True liefert.
+        """
+        off = self._slot_offset(seq) + 16
+        return self.shm.buf[off:off + 32 * self.n].cast("d")
+
+    def check(self, seq):
+        """True, wenn der Slot von seq (noch) unveraendert im Puffer liegt."""
+        off = self._slot_offset(seq)
+        buf = self.shm.buf
+        return (_U64.unpack_from(buf, off + self.slot_size - 8)[0] == seq and
+                _U64.unpack_from(buf, off)[0] == seq)
+
+    def read(self, seq):
+        """Kopiert Frame seq. Rueckgabe (timestamp, values) oder None wenn ueberschrieben."""
+        off = self._slot_offset(seq)
+        buf = self.shm.buf
+        if _U64.unpack_from(buf, off + self.slot_size - 8)[0] != seq:
+            return None
+        values = self._slot_struct.unpack_from(buf, off + 8)
+        if _U64.unpack_from(buf, off)[0] != seq:
+            return None
+        return values[0], values[1:]
+
+    def read_latest(self, retries=3):
+        """Neuester vollstaendiger Frame: (seq, timestamp, values) oder None."""
+        for _ in range(retries):
+            seq = self.write_seq
+            if seq == 0:
+                return None
+            frame = self.read(seq)
+            if frame is not None:
+                return seq, frame[0], frame[1]
+        return None
+
+    def read_since(self, last_seq):
+        """
+        Generator ueber alle Frames nach last_seq, die noch im Puffer liegen.
+        Liefert (seq, timestamp, values). Zu alte Frames (ueberholt) werden uebersprungen.
+        """
+        newest = self.write_seq
+        first = max(last_seq + 1, newest - self.capacity + 1, 1)
+        for seq in range(first, newest + 1):
+            frame = self.read(seq)
+            if frame is not None:
+                yield seq, frame[0], frame[1]
+
+    def to_dict(self, values):
+        return {name: tuple(values[i * 4:i * 4 + 4]) for i, name in enumerate(self.sensor_names)}
+
+    def get_data(self, raw_align=False):
+        """Neuester Frame als dict (wie SensorManager.get_data())."""
+        latest = self.read_latest()
+        if latest is not None:
+            self.last_seq, self.last_timestamp, values = latest
+            self._last_data = self.to_dict(values)
+        return dict(self._last_data)
+
+    def send_command(self, code):
+        """Reiht ein Kommando ein. Die Lock-Datei serialisiert gleichzeitige Sender."""
+        if self._lock_file is None:
+            self._lock_file = open(self._lock_path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            buf = self.shm.buf
+            seq = _U64.unpack_from(buf, OFF_CMD_SEQ)[0] + 1
+            _U64.pack_into(buf, OFF_CMD_CODES + 8 * (seq % CMD_SLOTS), code)
+            _U64.pack_into(buf, OFF_CMD_SEQ, seq)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def calibrate_zero(self):
+        print("[SHM] Sende Null-Kalibrierung an Daemon...")
+        self.send_command(CMD_ZERO)
+
+    def calibrate_forward(self):
+        print("[SHM] Sende Vorwaerts-Kalibrierung an Daemon...")
+        self.send_command(CMD_FORWARD)
+
+    def close(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.shm.close()
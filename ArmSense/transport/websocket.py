@@ -0,0 +1,232 @@
+# transport/websocket.py
+import os
+import socket
+import base64
+import hashlib
+import struct
+import threading
+
+from .net_stream import FrameEncoder
+
+# Minimaler WebSocket (RFC 6455) ohne externe Abhaengigkeiten:
+# Server sendet nur Binaer-Nachrichten, Client liest sie (inkl. Fragmentierung).
+
+_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONT = 0x0
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+def _accept_key(key):
+    return base64.b64encode(hashlib.sha1(key + _GUID).digest())
+
+
+def _frame(opcode, payload, mask=False):
+    """Baut einen einzelnen (FIN) WebSocket-Frame."""
+    head = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    n = len(payload)
+    if n < 126:
+        head.append(mask_bit | n)
+    elif n < 65536:
+        head.append(mask_bit | 126)
+        head += struct.pack(">H", n)
+    else:
+        head.append(mask_bit | 127)
+        head += struct.pack(">Q", n)
+    if mask:
+        key = os.urandom(4)
+        head += key
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return bytes(head) + payload
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("Verbindung geschlossen")
+        buf += chunk
+    return bytes(buf)
+
+
+def _read_http_head(sock):
+    data = b""
+    while b"\r\n\r\n" not in data:
+        chunk = sock.recv(1024)
+        if not chunk:
+            raise ConnectionError("Handshake abgebrochen")
+        data += chunk
+        if len(data) > 8192:
+            raise ConnectionError("Handshake zu gross")
+    head, _, rest = data.partition(b"\r\n\r\n")
+    lines = head.split(b"\r\n")
+    headers = {}
+    for line in lines[1:]:
+        k, _, v = line.partition(b":")
+        headers[k.strip().lower()] = v.strip()
+    return lines[0], headers, rest
+
+
+class _Client:
+    """Ein verbundener Viewer. Eigener Sende-Thread: der neueste Frame gewinnt."""
+
+    def __init__(self, server, sock, addr):
+        self.server = server
+        self.sock = sock
+        self.addr = addr
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            request, headers, _ = _read_http_head(self.sock)
+            key = headers.get(b"sec-websocket-key")
+            if not request.startswith(b"GET") or not key:
+                self.sock.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+                return
+            self.sock.sendall(b"HTTP/1.1 101 Switching Protocols\r\n"
+                              b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                              b"Sec-WebSocket-Accept: " + _accept_key(key) + b"\r\n\r\n")
+            self.sock.sendall(_frame(OP_BINARY, self.server.encoder.encode_names()))
+
+            sent = 0
+            while self.server.running:
+                packet, seq = self.server.wait_newer(sent)
+                if packet is None:
+                    continue
+                # Langsame Clients ueberspringen Frames statt eine Queue aufzubauen
+                self.sock.sendall(_frame(OP_BINARY, packet))
+                sent = seq
+        except OSError:
+            pass
+        finally:
+            self.server.remove(self)
+            self.sock.close()
+
+
+class WebSocketPublisher:
+    """Lokaler WebSocket-Server, der jeden Frame an alle verbundenen Viewer sendet."""
+
+    def __init__(self, sensor_names, port, host="0.0.0.0"):
+        self.encoder = FrameEncoder(sensor_names)
+        self.running = True
+        self.clients = []
+        self._cond = threading.Condition()
+        self._packet = None
+        self._seq = 0
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.listen(8)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                sock, addr = self.sock.accept()
+            except OSError:
+                break
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _Client(self, sock, addr)
+            with self._cond:
+                self.clients.append(client)
+            print(f"[NET] WebSocket-Viewer verbunden: {addr[0]}")
+            client.thread.start()
+
+    def wait_newer(self, seq, timeout=0.5):
+        with self._cond:
+            if self._seq == seq:
+                self._cond.wait(timeout)
+            if self._seq == seq:
+                return None, seq
+            return self._packet, self._seq
+
+    def remove(self, client):
+        with self._cond:
+            if client in self.clients:
+                self.clients.remove(client)
+
+    def publish(self, sensor_data, timestamp):
+        packet = self.encoder.encode(sensor_data, timestamp)
+        with self._cond:
+            self._packet = packet
+            self._seq += 1
+            self._cond.notify_all()
+
+    def close(self):
+        self.running = False
+        self.sock.close()
+        with self._cond:
+            self._cond.notify_all()
+            for client in list(self.clients):
+                try:
+                    client.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+class WebSocketClient:
+    """Verbindet sich mit einem WebSocketPublisher und liefert die Binaer-Nachrichten."""
+
+    def __init__(self, host, port, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16))
+        self.sock.sendall(b"GET / HTTP/1.1\r\nHost: " + host.encode() + b"\r\n"
+                          b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                          b"Sec-WebSocket-Key: " + key + b"\r\n"
+                          b"Sec-WebSocket-Version: 13\r\n\r\n")
+        status, headers, self._pending = _read_http_head(self.sock)
+        if b" 101 " not in status or headers.get(b"sec-websocket-accept") != _accept_key(key):
+            self.sock.close()
+            raise ConnectionError(f"WebSocket-Handshake fehlgeschlagen: {status!r}")
+        self.sock.settimeout(None)
+
+    def _recv(self, n):
+        if self._pending:
+            data, self._pending = self._pending[:n], self._pending[n:]
+            if len(data) == n:
+                return data
+            return data + _recv_exact(self.sock, n - len(data))
+        return _recv_exact(self.sock, n)
+
+    def messages(self):
+        """Generator ueber vollstaendige Nachrichten (fragmentierte Frames werden zusammengesetzt)."""
+        fragments = []
+        while True:
+            b0, b1 = self._recv(2)
+            fin, opcode = b0 & 0x80, b0 & 0x0F
+            n = b1 & 0x7F
+            if n == 126:
+                n = struct.unpack(">H", self._recv(2))[0]
+            elif n == 127:
+                n = struct.unpack(">Q", self._recv(8))[0]
+            key = self._recv(4) if b1 & 0x80 else None
+            payload = self._recv(n) if n else b""
+            if key:
+                payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+
+            if opcode == OP_CLOSE:
+                return
+            if opcode == OP_PING:
+                self.sock.sendall(_frame(OP_PONG, payload, mask=True))
+                continue
+            if opcode == OP_PONG:
+                continue
+
+            fragments.append(payload)
+            if fin:
+                yield b"".join(fragments)
+                fragments = []
+
+    def close(self):
+        try:
+            self.sock.sendall(_frame(OP_CLOSE, b"", mask=True))
+        except OSError:
+            pass
+        self.sock.close()
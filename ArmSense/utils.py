@@ -130,3 +130,36 @@ def q_to_matrix(q):
             m10, m11, m12, m13,
             m20, m21, m22, m23,
             m30, m31, m32, m33]
+
+def q_slerp(q1, q2, t):
+    """
+    Sphaerische lineare Interpolation zwischen q1 (t=0) und q2 (t=1).
+    Nimmt automatisch den kuerzeren Weg (q und -q sind dieselbe Rotation).
+    """
+    w1, x1, y1, z1 = q1
+    w2, x2, y2, z2 = q2
+    dot = w1 * w2 + x1 * x2 + y1 * y2 + z1 * z2
+    if dot < 0.0:
+        w2, x2, y2, z2 = -w2, -x2, -y2, -z2
+        dot = -dot
+
+    if dot > 0.9995:
+        # Fast parallel -> lineare Interpolation reicht
+        return q_normalize((w1 + t * (w2 - w1), x1 + t * (x2 - x1),
+                            y1 + t * (y2 - y1), z1 + t * (z2 - z1)))
+
+    theta_0 = math.acos(dot)
+    sin_0 = math.sin(theta_0)
+    s1 = math.sin((1.0 - t) * theta_0) / sin_0
+    s2 = math.sin(t * theta_0) / sin_0
+    return (s1 * w1 + s2 * w2, s1 * x1 + s2 * x2, s1 * y1 + s2 * y2, s1 * z1 + s2 * z2)
+
+def q_angle_between(q1, q2):
+    """
+    Rotationswinkel zwischen zwei Orientierungen in Grad (0..180).
+    Entspricht dem Winkel von q_rel = q1 * inv(q2).
+    """
+    # w-Komponente von q1 * conj(q2) = Skalarprodukt
+    w = q1[0] * q2[0] + q1[1] * q2[1] + q1[2] * q2[2] + q1[3] * q2[3]
+    w = max(-1.0, min(1.0, w))
+    return 2.0 * math.degrees(math.acos(abs(w)))
@@ -1,2 +1,8 @@
 # visualization/__init__.py
-from .arm_renderer import ArmVisualizer
\ No newline at end of file
+# Lazy: "import visualization" laedt pygame/OpenGL erst beim Zugriff auf ArmVisualizer
+
+def __getattr__(name):
+    if name == "ArmVisualizer":
+        from .arm_renderer import ArmVisualizer
+        return ArmVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
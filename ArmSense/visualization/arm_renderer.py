@@ -1,5 +1,6 @@
 import sys
 import os
+import ctypes
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
@@ -12,6 +13,106 @@ from config import *
 from utils import q_to_matrix, q_rotate_vec
 from .body import Body
 
+TIMELINE_HEIGHT = 36  # Hoehe der Replay-Zeitleiste in Pixeln
+
+# Geister-Arme: eine Instanz = ein Segment, Vertex = Anfang (a_t 0) oder Ende (a_t 1)
+GHOST_VERTEX_SHADER = """
+#version 120
+attribute float a_t;
+attribute vec3 a_origin;
+attribute vec3 a_dir;
+attribute vec4 a_color;
+varying vec4 v_color;
+void main() {
+    v_color = a_color;
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(a_origin + a_t * a_dir, 1.0);
+}
+"""
+GHOST_FRAGMENT_SHADER = """
+#version 120
+varying vec4 v_color;
+void main() {
+    gl_FragColor = v_color;
+}
+"""
+
+def _format_time(seconds):
+    minutes, sec = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{sec:02d}"
+
+class GhostOverlay:
+    """
+    Zeichnet viele Arme (2 Segmente pro Arm) mit einem einzigen instanzierten Draw-Call.
+    Ursprung, Richtung und Farbe pro Segment stehen in einem Instanz-Puffer, der pro Frame
+    in einem Stueck hochgeladen wird (visualization/ghosts.py: instance_data).
+    """
+
+    ATTRIBUTES = (("a_origin", 3, 0), ("a_dir", 3, 3), ("a_color", 4, 6))  # (Name, Groesse, Offset in floats)
+
+    def __init__(self):
+        from OpenGL.GL.shaders import compileProgram, compileShader
+        import numpy as np
+        from .ghosts import INSTANCE_FLOATS
+        if not (bool(glDrawArraysInstanced) and bool(glVertexAttribDivisor)):
+            raise RuntimeError("OpenGL-Treiber ohne Instancing (glDrawArraysInstanced/glVertexAttribDivisor)")
+        self.program = compileProgram(compileShader(GHOST_VERTEX_SHADER, GL_VERTEX_SHADER),
+                                      compileShader(GHOST_FRAGMENT_SHADER, GL_FRAGMENT_SHADER))
+        self.locations = {name: glGetAttribLocation(self.program, name)
+                          for name in ("a_t",) + tuple(a[0] for a in self.ATTRIBUTES)}
+        self.stride = INSTANCE_FLOATS * 4
+
+        self.geometry = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.geometry)
+        glBufferData(GL_ARRAY_BUFFER, np.array([0.0, 1.0], dtype=np.float32), GL_STATIC_DRAW)
+        self.instances = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.capacity = 0  # Instanzen im GPU-Puffer
+        self.count = 0
+        self.data = None   # Wiederverwendeter Puffer im Hauptspeicher
+
+    def update(self, q_base, q_arm, colors):
+        """Neue Orientierungen fuer alle Arme (N x 4); ein Upload fuer alle Instanzen."""
+        from .ghosts import instance_data
+        self.data = instance_data(q_base, q_arm, colors, out=self.data)
+        self.count = len(self.data)
+        glBindBuffer(GL_ARRAY_BUFFER, self.instances)
+        if self.count > self.capacity:
+            self.capacity = max(self.count, 2 * self.capacity)
+            glBufferData(GL_ARRAY_BUFFER, self.capacity * self.stride, None, GL_DYNAMIC_DRAW)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, self.count * self.stride, self.data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        if not self.count:
+            return
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT | GL_LINE_BIT)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glDepthMask(GL_FALSE)  # Transparente Arme verdecken sich nicht gegenseitig
+        glLineWidth(2)
+        glUseProgram(self.program)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.geometry)
+        location = self.locations["a_t"]
+        glEnableVertexAttribArray(location)
+        glVertexAttribPointer(location, 1, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glBindBuffer(GL_ARRAY_BUFFER, self.instances)
+        for name, size, offset in self.ATTRIBUTES:
+            location = self.locations[name]
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, self.stride, ctypes.c_void_p(offset * 4))
+            glVertexAttribDivisor(location, 1)  # Ein Wert pro Instanz statt pro Vertex
+
+        glDrawArraysInstanced(GL_LINES, 0, 2, self.count)
+
+        for location in self.locations.values():
+            glVertexAttribDivisor(location, 0)
+            glDisableVertexAttribArray(location)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+        glPopAttrib()
+
 class ArmVisualizer:
     def __init__(self):
         pygame.init()
@@ -31,11 +132,22 @@ class ArmVisualizer:
         
         # Calibration State
         self.calib_step = 0 # 0=Idle, 1=Wait Hang, 2=Wait Fwd
+        self.calib_status = None # (Art, Fortschritt) der laufenden Kalibrierung im SensorManager
+        self.stale = {} # Veraltete Sensoren -> Alter in Sekunden (SensorManager mit SWEEP_DEADLINE)
         self.font = pygame.font.SysFont('Arial', 24)
         
         # Pose Detection State
         self.pose_detection_active = False
 
+        # Replay-Steuerung (nur wenn die Datenquelle ein SessionReplay ist)
+        self.replay = None
+        self.replay_state = None # (spielt, Position, Dauer, Geschwindigkeit)
+        self.scrubbing = False
+
+        # Geister-Arme (main.py --ghosts), Overlay wird beim ersten Bedarf angelegt
+        self.ghost_overlay = None
+        self.ghosts_failed = False
+
     def _init_gl(self):
         glClearColor(0.2, 0.2, 0.2, 1.0)
         glEnable(GL_DEPTH_TEST)
@@ -46,6 +158,13 @@ class ArmVisualizer:
         glMatrixMode(GL_MODELVIEW)
 
     def handle_input(self, sensor_manager=None):
+        # Fortschritt einer laufenden (asynchronen) Kalibrierung fuer das Overlay
+        status_fn = getattr(sensor_manager, "calibration_status", None)
+        self.calib_status = status_fn() if status_fn else None
+        stale_fn = getattr(sensor_manager, "get_stale", None)
+        self.stale = {name: age for name, age in (stale_fn() if stale_fn else {}).items() if age > STALE_WARN_AGE}
+        self.replay = sensor_manager if hasattr(sensor_manager, "replay_status") else None
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT: return False
             
@@ -70,19 +189,38 @@ class ArmVisualizer:
                     self.pose_detection_active = not self.pose_detection_active
                     print(f"[UI] Pose Detection: {self.pose_detection_active}")
 
+                # Replay: P=Play/Pause, Pfeile links/rechts=Springen (Shift: 60 s), hoch/runter=Tempo
+                if self.replay:
+                    step = 60.0 if event.mod & KMOD_SHIFT else 5.0
+                    if key_name == 'p': self.replay.toggle()
+                    if key_name == 'left': self.replay.skip(-step)
+                    if key_name == 'right': self.replay.skip(step)
+                    if key_name == 'up': self.replay.faster()
+                    if key_name == 'down': self.replay.slower()
+                    if key_name == 'home': self.replay.seek(0.0)
+                    if key_name == 'end': self.replay.seek(self.replay.duration)
+
             # --- MAUS ---
             if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
+                if event.button == 1 and self.replay and event.pos[1] >= self.display[1] - TIMELINE_HEIGHT:
+                    # Klick auf die Zeitleiste -> Scrubben
+                    self.scrubbing = True
+                    self.replay.seek_fraction(event.pos[0] / self.display[0])
+                elif event.button == 1:
                     self.mouse_down = True
                     self.last_mouse = event.pos
             if event.type == pygame.MOUSEBUTTONUP: 
                 self.mouse_down = False
-            if event.type == pygame.MOUSEMOTION and self.mouse_down:
+                self.scrubbing = False
+            if event.type == pygame.MOUSEMOTION and self.scrubbing:
+                self.replay.seek_fraction(min(max(event.pos[0] / self.display[0], 0.0), 1.0))
+            elif event.type == pygame.MOUSEMOTION and self.mouse_down:
                 dx, dy = event.pos[0] - self.last_mouse[0], event.pos[1] - self.last_mouse[1]
                 self.cam_rot_x += dy * 0.5
                 self.cam_rot_y += dx * 0.5
                 self.last_mouse = event.pos
-                
+
+        self.replay_state = self.replay.replay_status() if self.replay else None
         return True
 
     def _draw_grid(self):
@@ -134,8 +272,14 @@ class ArmVisualizer:
         text = ""
         color = (255, 255, 0) # Gelb fuer Instructions
         
+        # Priority 0: Running calibration (samples are collected in the background)
+        if self.calib_status:
+            kind, progress = self.calib_status
+            label = "Nullpunkt" if kind == "zero" else "Vorwaerts"
+            text = f"Kalibrierung {label}: {int(progress * 100)}% - Arm ruhig halten"
+            color = (255, 160, 0) # Orange
         # Priority 1: Calibration Steps
-        if self.calib_step == 1:
+        elif self.calib_step == 1:
             text = "STEP 1: Arm haengen lassen (Relaxed) -> [SPACE]"
         elif self.calib_step == 2:
             text = "STEP 2: Arm 90 Grad nach vorne (Forward) -> [SPACE]"
@@ -149,19 +293,21 @@ class ArmVisualizer:
             text = "'0': Hang | '1': Fwd 90 | '9': Detection | '2': Man. Calib"
             color = (180, 180, 180) # Grey
             
-        if not text: return
-            
-        text_surface = self.font.render(text, True, color)
-        # Check if text surface is valid
-        if text_surface.get_width() == 0: return
+        self._begin_2d()
+        if text:
+            self._draw_text(text, color, 20, 20)
+        if self.stale:
+            # Angezeigte Haltung ist fuer diese Segmente nicht aktuell
+            ages = ", ".join(f"{name} {age:.1f} s" for name, age in sorted(self.stale.items()))
+            self._draw_text(f"Veraltet: {ages}", (255, 80, 80), 20, 50)
+        if self.replay_state:
+            self._draw_timeline()
+        self._end_2d()
 
-        w, h = text_surface.get_width(), text_surface.get_height()
-        # Use simple string data, ensure flipped=0 for 2D UI (Top-Left origin)
-        text_data = pygame.image.tostring(text_surface, "RGBA", 0)
-        
-        # --- FIXED: GL State ---
-        # Ensure we are drawing in clean 2D state
+    def _begin_2d(self):
+        """Schaltet auf 2D (Pixel, Ursprung oben links) fuer Overlays."""
         glPushAttrib(GL_ENABLE_BIT | GL_CURRENT_BIT)
+        glDisable(GL_DEPTH_TEST)
         glMatrixMode(GL_PROJECTION)
         glPushMatrix()
         glLoadIdentity()
@@ -169,10 +315,26 @@ class ArmVisualizer:
         glMatrixMode(GL_MODELVIEW)
         glPushMatrix()
         glLoadIdentity()
-        
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
+
+    def _end_2d(self):
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopAttrib()
+
+    def _draw_text(self, text, color, x_pos, y_pos):
+        """Zeichnet einen Text als Textur (nur zwischen _begin_2d/_end_2d)."""
+        text_surface = self.font.render(text, True, color)
+        # Check if text surface is valid
+        if text_surface.get_width() == 0: return
+
+        w, h = text_surface.get_width(), text_surface.get_height()
+        # Use simple string data, ensure flipped=0 for 2D UI (Top-Left origin)
+        text_data = pygame.image.tostring(text_surface, "RGBA", 0)
+
         tex_id = glGenTextures(1)
         glBindTexture(GL_TEXTURE_2D, tex_id)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -181,7 +343,6 @@ class ArmVisualizer:
         glColor3f(1,1,1)
         glEnable(GL_TEXTURE_2D)
         
-        x_pos, y_pos = 20, 20
         glBegin(GL_QUADS)
         glTexCoord2f(0, 0); glVertex2f(x_pos, y_pos)
         glTexCoord2f(1, 0); glVertex2f(x_pos+w, y_pos)
@@ -191,16 +352,42 @@ class ArmVisualizer:
         
         glDisable(GL_TEXTURE_2D)
         glDeleteTextures([tex_id])
-        
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
-        # GL_DEPTH_TEST was disabled, re-enable if it was enabled
-        glPopAttrib()
-        # glEnable(GL_DEPTH_TEST) # Not needed with PopAttrib
 
-    def render(self, sensor_data, pose_text=""):
+    def _draw_timeline(self):
+        """Replay-Zeitleiste am unteren Rand mit Position, Dauer und Tempo."""
+        playing, position, duration, speed = self.replay_state
+        width, height = self.display
+        top = height - TIMELINE_HEIGHT
+        fraction = position / duration if duration > 0 else 0.0
+
+        glBegin(GL_QUADS)
+        glColor4f(0.1, 0.1, 0.1, 0.8)
+        glVertex2f(0, top); glVertex2f(width, top); glVertex2f(width, height); glVertex2f(0, height)
+        glColor4f(0.2, 0.6, 1.0, 0.9)
+        glVertex2f(0, height - 6); glVertex2f(width * fraction, height - 6)
+        glVertex2f(width * fraction, height); glVertex2f(0, height)
+        glEnd()
+
+        state = "PLAY" if playing else "PAUSE"
+        text = f"{state}  {_format_time(position)} / {_format_time(duration)}  x{speed:g}   [P] [<-/->] [hoch/runter]"
+        self._draw_text(text, (220, 220, 220), 10, top + 2)
+
+    def _draw_ghosts(self, ghosts):
+        """ghosts: (q_base, q_arm, farben) als N x 4 Arrays, siehe visualization/ghosts.py."""
+        if self.ghost_overlay is None:
+            if self.ghosts_failed:
+                return
+            try:
+                self.ghost_overlay = GhostOverlay()
+            except Exception as e:
+                self.ghosts_failed = True
+                print(f"[UI] Geister-Arme nicht verfuegbar: {e}")
+                return
+        self.ghost_overlay.update(*ghosts)
+        self.ghost_overlay.draw()
+
+    def render(self, sensor_data, pose_text="", ghosts=None):
+        """ghosts: optionale Orientierungen vieler aufgezeichneter Arme (halbtransparent, ein Draw-Call)."""
         # Quaternionen (w, x, y, z)
         q_base = sensor_data["base"]
         q_arm = sensor_data["arm"]
@@ -264,6 +451,10 @@ class ArmVisualizer:
         self._draw_segment(ARM_LENGTH_2, (0.2, 1, 0.2)) # Grüner Arm
         
         glPopMatrix()
+
+        # --- GEISTER-ARME --- (gleiches Koordinatensystem, nach dem Live-Arm wegen Transparenz)
+        if ghosts is not None and len(ghosts[0]):
+            self._draw_ghosts(ghosts)
         
         glPopMatrix() # Close global rotate
         glPopMatrix() # Close camera
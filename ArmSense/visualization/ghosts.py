@@ -0,0 +1,84 @@
+# visualization/ghosts.py
+"""
+Geister-Arme: viele aufgezeichnete Arme halbtransparent ueber dem aktuellen Arm (main.py --ghosts).
+
+Hier liegt nur der Teil ohne OpenGL: Abtasten der Sitzungen zu einer gemeinsamen Zeit und
+die Instanz-Daten fuer alle Arme auf einmal (numpy, ohne Python-Schleife pro Arm).
+Gezeichnet wird mit GhostOverlay (arm_renderer.py) in einem instanzierten Draw-Call.
+"""
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import ARM_LENGTH_1, ARM_LENGTH_2, GHOST_ALPHA, GHOST_COLORS, GHOST_LIMIT
+
+# Pro Segment-Instanz: Ursprung (3), Richtung * Laenge (3), Farbe RGBA (4)
+INSTANCE_FLOATS = 10
+
+
+def x_axes(q):
+    """Erste Spalte der Rotationsmatrix (= q_rotate_vec(q, (1, 0, 0))) fuer N Quaternionen (N x 4)."""
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    return np.stack((1 - 2 * (y * y + z * z), 2 * (x * y + w * z), 2 * (x * z - w * y)), axis=1)
+
+
+def palette(n, alpha=GHOST_ALPHA, colors=GHOST_COLORS):
+    """RGBA pro Arm (N x 4), Farben reihum aus GHOST_COLORS."""
+    rgb = np.asarray(colors, dtype=np.float32)[np.arange(n) % len(colors)]
+    return np.hstack((rgb, np.full((n, 1), alpha, dtype=np.float32)))
+
+
+def instance_data(q_base, q_arm, colors, out=None):
+    """
+    Instanz-Puffer fuer N Arme: 2 N Segmente (erst alle Oberarme, dann alle Unterarme),
+    je INSTANCE_FLOATS float32. Gleiche Geometrie wie ArmVisualizer.render() fuer den Live-Arm.
+    out: vorhandenes Array (>= 2 N Zeilen) wiederverwenden statt neu anzulegen.
+    """
+    n = len(q_base)
+    if out is None or len(out) < 2 * n:
+        out = np.empty((2 * n, INSTANCE_FLOATS), dtype=np.float32)
+    upper = x_axes(np.asarray(q_base, dtype=np.float64)) * ARM_LENGTH_1
+    lower = x_axes(np.asarray(q_arm, dtype=np.float64)) * ARM_LENGTH_2
+    out[:n, 0:3] = 0.0            # Oberarm beginnt an der Schulter
+    out[:n, 3:6] = upper
+    out[n:2 * n, 0:3] = upper     # Unterarm beginnt am Ellbogen
+    out[n:2 * n, 3:6] = lower
+    out[:n, 6:10] = colors
+    out[n:2 * n, 6:10] = colors
+    return out[:2 * n]
+
+
+class GhostSource:
+    """
+    Alle Sitzungen unter einem Verzeichnis als Geister. sample(position) liefert die
+    Orientierungen aller Sitzungen an derselben Stelle (Sekunden ab Sitzungsbeginn);
+    kuerzere Sitzungen laufen in Schleife.
+    """
+
+    def __init__(self, root, limit=GHOST_LIMIT):
+        from recording.session import SessionReader
+        from recording.pose_index import find_sessions
+        self.readers = []
+        for path in find_sessions(root)[:limit]:
+            reader = SessionReader(path)
+            if reader.frames and "q.base" in reader.columns and "q.arm" in reader.columns:
+                self.readers.append(reader)
+        self.starts = [reader.time_range()[0] for reader in self.readers]
+        self.durations = [max(1e-6, reader.time_range()[1] - reader.time_range()[0]) for reader in self.readers]
+        n = len(self.readers)
+        self.q_base = np.zeros((n, 4), dtype=np.float32)
+        self.q_arm = np.zeros((n, 4), dtype=np.float32)
+        self.colors = palette(n)
+        print(f"[UI] {n} Geister-Arme aus {root}")
+
+    def __len__(self):
+        return len(self.readers)
+
+    def sample(self, position):
+        """(q_base, q_arm, farben) als N x 4 Arrays (werden pro Aufruf ueberschrieben)."""
+        for i, reader in enumerate(self.readers):
+            frame = reader.frame_at(self.starts[i] + position % self.durations[i])
+            self.q_base[i] = reader.row("q.base", frame)
+            self.q_arm[i] = reader.row("q.arm", frame)
+        return self.q_base, self.q_arm, self.colors
@@ -24,10 +24,40 @@ def assert_test(module_name, func_name, hardcoded_data, expected_value, actual_v
     print(f"[{module_name}] {func_name} | Hardcoded Daten: {hardcoded_data} | Erwartungswert: {expected_value} | Resultat: {result_str}")
     return passed
 
+# Registrierte Test-Module: (Kuerzel, Modulname, Ueberschrift)
+TEST_MODULES = [
+    ('pose', 'test_pose_detector', 'Posenerkennung Tests'),
+    ('sensor', 'test_sensor_manager', 'Sensor Manager & Filter Tests'),
+    ('shm', 'test_shm_ring', 'Shared-Memory Ringpuffer Tests'),
+    ('net', 'test_net_stream', 'Netzwerk-Streaming Tests'),
+    ('i2c', 'test_bus_tuner', 'I2C Frequenz-Tuning Tests'),
+    ('poll', 'test_poll_scheduler', 'Polling-Scheduler Tests'),
+    ('fusion', 'test_fusion', 'Host-Fusion Tests'),
+    ('async', 'test_async_manager', 'Asyncio-Schnittstelle Tests'),
+    ('backends', 'test_backends', 'Backend-Registry Tests'),
+    ('rec', 'test_recording', 'Aufzeichnung Tests'),
+    ('replay', 'test_replay', 'Replay Tests'),
+    ('pose_index', 'test_pose_index', 'Posen-Index Tests'),
+    ('deadline', 'test_deadline', 'Zeitbudget Tests'),
+    ('metrics', 'test_metrics', 'Metriken Tests'),
+    ('discovery', 'test_discovery', 'Topologie Tests'),
+    ('i2cdev', 'test_i2cdev', 'i2c-dev Tests'),
+    ('bno055_config', 'test_bno055_config', 'BNO055 Setup Tests'),
+    ('skew', 'test_skew', 'Sweep-Versatz Tests'),
+    ('filters', 'test_filters', 'Filter-Ketten Tests'),
+    ('frame', 'test_frame', 'SensorFrame Tests'),
+    ('headless', 'test_headless', 'Headless-Betrieb Tests'),
+    ('rom_stats', 'test_rom_stats', 'Bewegungsumfang Tests'),
+    ('reprocess', 'test_reprocess', 'Archiv-Neuauswertung Tests'),
+    ('ghosts', 'test_ghosts', 'Geister-Arme Tests'),
+    ('split', 'test_split', 'Split-Modus Tests'),
+    ('debug_plot', 'test_debug_plot', 'Live-Plotter Tests'),
+]
+
 def main():
     parser = argparse.ArgumentParser(description="ArmSense Eigener Test-Runner")
-    parser.add_argument('test_module', nargs='?', default='all', choices=['all', 'pose', 'sensor'], 
-                        help="Gibt an, welche Tests ausgeführt werden sollen: 'all', 'pose', oder 'sensor'")
+    parser.add_argument('test_module', nargs='?', default='all', choices=['all'] + [key for key, _, _ in TEST_MODULES],
+                        help="Gibt an, welche Tests ausgeführt werden sollen: 'all' oder ein Modul-Kürzel")
     
     args = parser.parse_args()
     
@@ -37,27 +67,18 @@ def main():
     
     all_tests_passed = True
 
-    # 1. Pose Detector Tests ausführen
-    if args.test_module in ['all', 'pose']:
-        print("\n--- Posenerkennung Tests ---")
-        try:
-            from test_pose_detector import run_all_tests as run_pose_tests
-            success = run_pose_tests(assert_test)
-            if not success:
-                all_tests_passed = False
-        except ImportError:
-            print("[\u26A0] test_pose_detector.py wurde noch nicht implementiert.")
-
-    # 2. Sensor Manager Tests ausführen
-    if args.test_module in ['all', 'sensor']:
-        print("\n--- Sensor Manager & Filter Tests ---")
+    for key, module_name, title in TEST_MODULES:
+        if args.test_module not in ['all', key]:
+            continue
+        print(f"\n--- {title} ---")
         try:
-            from test_sensor_manager import run_all_tests as run_sensor_tests
-            success = run_sensor_tests(assert_test)
-            if not success:
-                all_tests_passed = False
+            module = __import__(module_name)
         except ImportError as e:
-            print(f"[\u26A0] test_sensor_manager.py konnte nicht importiert werden: {e}")
+            print(f"[\u26A0] {module_name}.py konnte nicht importiert werden: {e}")
+            continue
+        success = module.run_all_tests(assert_test)
+        if not success:
+            all_tests_passed = False
 
     print("\n" + "="*50)
     if all_tests_passed:
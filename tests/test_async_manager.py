@@ -0,0 +1,101 @@
+import sys
+import os
+import asyncio
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.async_manager import AsyncSensorManager
+
+class FakeSource:
+    """Zaehlt Frames durch und simuliert eine Kalibrierung ueber N Frames."""
+
+    def __init__(self):
+        self.count = 0
+        self.calib_left = 0
+
+    def get_data(self):
+        self.count += 1
+        if self.calib_left:
+            self.calib_left -= 1
+        return {"n": self.count}
+
+    def calibrate_zero(self, samples=None):
+        self.calib_left = samples or 5
+
+    def calibration_status(self):
+        return ("zero", 0.0) if self.calib_left else None
+
+async def consume(policy, delays, maxsize=3):
+    """Liest len(delays) + 1 Frames, wartet nach jedem Frame delays[i] Sekunden. Liefert Frame-Nummern und Verluste."""
+    n = len(delays) + 1
+    async with AsyncSensorManager(FakeSource(), rate=1000, policy=policy, maxsize=maxsize) as manager:
+        received = []
+        async for frame in manager.frames():
+            received.append(frame["n"])
+            if len(received) == n:
+                dropped = manager.dropped()
+                break
+            await asyncio.sleep(delays[len(received) - 1])
+    return received, dropped
+
+async def calibrate():
+    source = FakeSource()
+    async with AsyncSensorManager(source, rate=1000) as manager:
+        await manager.calibrate_zero(samples=10)
+    return source.calibration_status(), source.count
+
+async def calibrate_while_running():
+    from hardware.sensor_manager import SensorManager
+    sensors = SensorManager(use_hardware=False)
+    sensors.inject_test_data([{"base": (1.0, 0.0, 0.0, 0.0), "arm": (1.0, 0.0, 0.0, 0.0)}] * 40)
+    async with AsyncSensorManager(sensors, rate=1000) as manager:
+        sensors.calibrate_zero(samples=20)
+        forward = await manager.calibrate_forward(samples=5)  # Null-Kalibrierung laeuft noch
+        status = sensors.calibration_status()
+        for _ in range(20):
+            await manager.get_data()
+        zero = await manager.calibrate_zero(samples=5)        # Nach deren Ende: nicht mehr abgelehnt
+    return forward, status[0], zero
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die asyncio-Schnittstelle aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: latest -> langsamer Konsument sieht nur neue Frames, Rest wird verworfen ===
+    received, dropped = asyncio.run(consume("latest", [0.02] * 4))
+    result = (all(b > a + 1 for a, b in zip(received, received[1:])), dropped > 0)
+    if not assert_func("async_manager", "Policy latest", "1000 Hz, Konsument 50 Hz", (True, True), result):
+        all_passed = False
+
+    # === TEST 2: bounded -> Akquisition wartet, kein Frame geht verloren ===
+    received, dropped = asyncio.run(consume("bounded", [0.01] * 9))
+    if not assert_func("async_manager", "Policy bounded", "1000 Hz, Konsument 100 Hz", (list(range(1, 11)), 0), (received, dropped)):
+        all_passed = False
+
+    # === TEST 3: drop_oldest -> nach einer Pause kommen die letzten maxsize Frames lueckenlos ===
+    received, dropped = asyncio.run(consume("drop_oldest", [0.05, 0, 0]))
+    result = (received[0], received[2] - received[1], received[3] - received[2], dropped > 0)
+    if not assert_func("async_manager", "Policy drop_oldest", "maxsize 3, 50 ms Pause", (1, 1, 1, True), result):
+        all_passed = False
+
+    # === TEST 4: calibrate_zero ist awaitable und endet nach der Kalibrierung ===
+    if not assert_func("async_manager", "Kalibrierung awaitable", "10 Samples, kein Konsument", (None, 10), asyncio.run(calibrate())):
+        all_passed = False
+
+    # === TEST 5: Abgelehnte Kalibrierung meldet False statt auf die laufende zu warten ===
+    result = asyncio.run(calibrate_while_running())
+    if not assert_func("async_manager", "Kalibrierung abgelehnt", "Vorwaerts waehrend Nullpunkt", (False, "zero", True), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
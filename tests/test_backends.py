@@ -0,0 +1,58 @@
+import sys
+import os
+import subprocess
+
+# Damit das Skript das 'ArmSense' Modul findet
+ARMSENSE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense'))
+sys.path.insert(0, ARMSENSE_DIR)
+
+import backends
+
+# Laeuft in einem frischen Interpreter: Andere Tests mocken die Pi-Bibliotheken in sys.modules
+IMPORT_CHECK = """
+import sys
+import main, debug.debug_value, hardware, visualization, transport
+print(sorted(m for m in ('board', 'busio', 'adafruit_bno055', 'pygame', 'OpenGL') if m in sys.modules))
+"""
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die Backend-Registry aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Imports laden weder Blinka noch pygame/OpenGL ===
+    proc = subprocess.run([sys.executable, "-c", IMPORT_CHECK], cwd=ARMSENSE_DIR,
+                          capture_output=True, text=True, timeout=60)
+    result = proc.stdout.strip().splitlines()[-1] if proc.returncode == 0 else proc.stderr.strip()[-200:]
+    if not assert_func("backends", "Lazy Imports", "main, debug_value, hardware, visualization, transport", "[]", result):
+        all_passed = False
+
+    # === TEST 2: Registrierte Backends werden erst bei get() geladen ===
+    backends.register("test", "math", {"sqrt": "math:sqrt", "mod": "math"})
+    before = ("test", "math") in backends.loaded()
+    ns = backends.get("test")
+    result = (before, ns.sqrt(16.0), ("test", "math") in backends.loaded())
+    if not assert_func("backends", "Lazy Laden", "Test-Backend 'math'", (False, 4.0, True), result):
+        all_passed = False
+
+    # === TEST 3: Fehlendes Backend -> BackendUnavailable (ImportError) ===
+    backends.register("test", "fehlt", {"x": "armsense_gibt_es_nicht"})
+    try:
+        backends.get("test", "fehlt")
+        result = None
+    except ImportError as e:
+        result = type(e).__name__
+    result = (result, backends.available("test"))
+    if not assert_func("backends", "Fehlendes Backend", "Modul nicht installiert", ("BackendUnavailable", ["math"]), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
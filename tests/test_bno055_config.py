@@ -0,0 +1,89 @@
+import sys
+import os
+import math
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware import bno055_config
+from hardware.bno055_config import CHIP_REMAPS, parse_axes, resolve, apply, rotation_matrix
+from hardware.sensor_manager import SensorManager
+
+class FakeSensor:
+    def __init__(self, q):
+        self.quaternion = q
+
+def chip_remap(registers, v):
+    """Wie der BNO055 einen Sensor-Vektor mit AXIS_MAP_CONFIG/SIGN umsortiert."""
+    config, sign = registers
+    sources = (config & 3, config >> 2 & 3, config >> 4 & 3)
+    signs = (-1 if sign & 4 else 1, -1 if sign & 2 else 1, -1 if sign & 1 else 1)
+    return tuple(s * v[p] for p, s in zip(sources, signs))
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für Modus, Achsen-Remap und Einheiten der BNO055 aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Achsen-Angabe -> Register, Spiegelungen werden abgelehnt ===
+    try:
+        parse_axes("x,y,-z")
+        mirrored = "akzeptiert"
+    except ValueError:
+        mirrored = "ValueError"
+    registers = bno055_config._registers(parse_axes("-y,x,z"))
+    result = (len(CHIP_REMAPS), registers, mirrored)
+    if not assert_func("bno055_config", "Achsen", "'-y,x,z' / 'x,y,-z'", (24, (0x21, 0x04), "ValueError"), result):
+        all_passed = False
+
+    # === TEST 2: Host-Rechnung mit der Montage-Quaternion entspricht dem Chip-Remap (alle 24) ===
+    v_sensor = (0.3, -0.5, 0.8)
+    wrong = 0
+    for registers, mount in CHIP_REMAPS.items():
+        v_segment = chip_remap(registers, v_sensor)
+        # v_sensor = R(mount) * v_segment
+        m = rotation_matrix(mount)
+        back = tuple(sum(m[i][j] * v_segment[j] for j in range(3)) for i in range(3))
+        if max(abs(a - b) for a, b in zip(back, v_sensor)) > 1e-9:
+            wrong += 1
+    if not assert_func("bno055_config", "Remap-Quaternion", "24 Chip-Remaps", 0, wrong):
+        all_passed = False
+
+    # === TEST 3: Aufloesung der Einstellungen ===
+    s = math.sqrt(0.5)
+    on_chip = resolve({"mode": "imuplus", "mount": (s, 0, 0, s), "units": {"gyro": "rps"}})
+    on_host = resolve({"mount": (math.cos(math.radians(5)), math.sin(math.radians(5)), 0, 0)})
+    host_fusion = resolve({"mode": "ndof"}, host_fusion=True)
+    result = (on_chip.mode, on_chip.axis_map, on_chip.host_mount, on_chip.unit_sel,
+              on_host.axis_map, on_host.host_mount is not None, host_fusion.mode)
+    # 90 Grad um Z: Segment-X = Sensor-Y, Segment-Y = Sensor -X ("y,-x,z")
+    expected = ("imuplus", (0x21, 0x02), None, 0x02, (0x24, 0x00), True, "amg")
+    if not assert_func("bno055_config", "resolve", "90 Grad um Z / 10 Grad um X / Host-Fusion", expected, result):
+        all_passed = False
+
+    # === TEST 4: Register-Reihenfolge beim Init und Host-Montage im SensorManager ===
+    writes = []
+    apply(lambda reg, value: writes.append((reg, value)), on_chip, sleep=lambda t: None)
+    expected_writes = [(0x3D, 0x00), (0x07, 0), (0x41, 0x21), (0x42, 0x02), (0x3B, 0x02), (0x3D, 0x08)]
+
+    manager = SensorManager(use_hardware=False)
+    manager.sensors = {"base": FakeSensor((1.0, 0.0, 0.0, 0.0)), "arm": FakeSensor((1.0, 0.0, 0.0, 0.0))}
+    manager.dummy_mode = False
+    manager.host_mounts = {"arm": on_host.host_mount}
+    data = manager.get_data()
+    arm = tuple(round(c, 4) for c in data["arm"])
+    result = (writes, data["base"], arm)
+    expected = (expected_writes, (1.0, 0.0, 0.0, 0.0), (0.9962, 0.0872, 0.0, 0.0))
+    if not assert_func("bno055_config", "Init / Host-Montage", "imuplus + Remap, 10 Grad Host-Montage", expected, result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,179 @@
+import sys
+import os
+import subprocess
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.bus_tuner import BusTuner, is_glitch
+
+class FakeBus:
+    """Simuliert einen Kabelbaum, der ab einer Grenzfrequenz Fehler produziert."""
+
+    def __init__(self, error_every):
+        # error_every: freq -> jeder n-te Lesezugriff schlaegt fehl (0 = nie)
+        self.error_every = error_every
+        self.freq = None
+        self.reads = 0
+        self.broken = set()  # Frequenzen, bei denen der Wechsel selbst fehlschlaegt
+
+    def set_frequency(self, freq):
+        if freq in self.broken:
+            raise OSError("Bus nicht verfuegbar")
+        self.freq = freq
+
+    def read_all(self):
+        values = []
+        for _ in range(2):
+            self.reads += 1
+            n = self.error_every.get(self.freq, 0)
+            if n and self.reads % n == 0:
+                values.append(OSError("NAK"))
+            else:
+                values.append((1.0, 0.0, 0.0, 0.0))
+        return values
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für das I2C-Frequenz-Tuning aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    candidates = [10000, 100000, 400000]
+
+    # === TEST 1: Glitch-Erkennung (nicht normierte Quaternionen) ===
+    result = [is_glitch((1.0, 0.0, 0.0, 0.0)), is_glitch((0.5, 0.0, 0.0, 0.0)), is_glitch((None, None, None, None))]
+    if not assert_func("bus_tuner", "Glitch-Erkennung", "Norm 1.0 / 0.5 / None", [False, True, True], result):
+        all_passed = False
+
+    # === TEST 2: Schnellste Frequenz im Fehlerbudget ===
+    # 400 kHz: jeder 10. Zugriff fehlerhaft (10% > 1% Budget) -> 100 kHz
+    bus = FakeBus({400000: 10})
+    tuner = BusTuner(bus.set_frequency, bus.read_all, candidates, error_budget=0.01, samples=20, retune_interval=0)
+    result = (tuner.tune(), bus.freq)
+    if not assert_func("bus_tuner", "Tuning beim Start", "400 kHz: 10% Fehler, Budget 1%", (100000, 100000), result):
+        all_passed = False
+
+    # === TEST 3: Backoff bei steigender Fehlerrate im Betrieb ===
+    tuner = BusTuner(bus.set_frequency, bus.read_all, candidates, error_budget=0.01, window=10, retune_interval=0)
+    tuner.frequency = 100000
+    for i in range(10):
+        tuner.record(i % 2 == 0)  # 50% Fehler
+    result = (tuner.maintain(), tuner.frequency, bus.freq)
+    if not assert_func("bus_tuner", "Backoff", "50% Fehler bei 100 kHz", (True, 10000, 10000), result):
+        all_passed = False
+
+    # === TEST 4: Fehlgeschlagener Wechsel im Betrieb -> bisherige Frequenz, keine Exception ===
+    bus = FakeBus({})
+    tuner = BusTuner(bus.set_frequency, bus.read_all, candidates, error_budget=0.01, window=10, retune_interval=1e-9)
+    tuner.tune()
+    tuner.frequency = 100000
+    bus.freq = 100000
+    bus.broken = {400000}
+    result = [tuner.maintain(), tuner.frequency, bus.freq]
+    bus.broken = {400000, 100000}  # Auch das Zuruecksetzen scheitert
+    result += [tuner.maintain(), tuner.frequency]
+    if not assert_func("bus_tuner", "Fehler beim Wechsel", "400 kHz nicht setzbar", [False, 100000, 100000, False, 100000], result):
+        all_passed = False
+
+    # === TEST 5: Periodischer Test der naechsten Stufe ueber normale Frames, ohne Mess-Sweep ===
+    result = []
+    for error_every in (0, 2):
+        bus = FakeBus({400000: error_every})
+        tuner = BusTuner(bus.set_frequency, bus.read_all, candidates, error_budget=0.01, samples=5, retune_interval=1e-9)
+        tuner._switch(100000)
+        steps = [tuner.maintain()]
+        reads = bus.reads
+        for _ in range(5):
+            for q in bus.read_all():
+                tuner.record(not isinstance(q, Exception))
+            steps.append(tuner.maintain())
+        result.append((steps, bus.reads - reads, tuner.frequency, bus.freq))
+    expected = [([False, False, False, False, False, True], 10, 400000, 400000),
+                ([False, False, False, False, False, False], 10, 100000, 100000)]
+    if not assert_func("bus_tuner", "Nachregeln", "400 kHz fehlerfrei / 50% Fehler, 5 Frames", expected, result):
+        all_passed = False
+
+    # === TEST 6: SensorManager wechselt nur den Takt, Sensoren und Kalibrierung bleiben ===
+    from types import SimpleNamespace
+    from hardware.sensor_manager import SensorManager
+
+    class FakeI2C:
+        def __init__(self, scl, sda, frequency):
+            self.frequency = frequency
+            self.active = True
+        def deinit(self):
+            self.active = False
+
+    sm = SensorManager(use_hardware=False)
+    sm.hw = SimpleNamespace(board=SimpleNamespace(SCL=3, SDA=2), busio=SimpleNamespace(I2C=FakeI2C))
+    old = sm.i2c = FakeI2C(3, 2, 10000)
+    sm.bus_frequency = 10000
+    sm.muxes = {0x70: SimpleNamespace(i2c=old), 0x71: SimpleNamespace(i2c=old)}
+    sensors = sm.sensors = {"base": object(), "arm": object()}
+    sm.offsets["arm"] = (0.0, 1.0, 0.0, 0.0)
+    sm._set_frequency(400000)
+    result = (old.active, all(tca.i2c is sm.i2c for tca in sm.muxes.values()), sm.i2c.frequency, sm.bus_frequency, sm.sensors is sensors,
+              sm.offsets["arm"])
+    expected = (False, True, 400000, 400000, True, (0.0, 1.0, 0.0, 0.0))
+    if not assert_func("bus_tuner", "Nur Takt wechseln", "10 kHz -> 400 kHz", expected, result):
+        all_passed = False
+
+    # === TEST 7: Host-Fusion (AMG-Modus) misst ueber den Burst, nicht ueber das Quaternion-Register ===
+    class AmgSensor:
+        quaternion = (0.0, 0.0, 0.0, 0.0)  # Im AMG-Modus rechnet der Chip keine Fusion
+        def __init__(self, ok):
+            self.ok = ok
+
+    def read_burst(sensor, buf, scales):
+        if not sensor.ok:
+            raise OSError("NAK")
+        return ((0.0, 0.0, 9.81), (0.0, 0.0, 0.0), (20.0, 0.0, 0.0))
+
+    sm_fusion = SensorManager(use_hardware=False)
+    sm_fusion.sensors = {"base": AmgSensor(True), "arm": AmgSensor(False)}
+    sm_fusion.fusion, sm_fusion._read_burst = object(), read_burst
+    sm_fusion._burst_buf, sm_fusion._burst_scales = bytearray(0), {"base": None, "arm": None}
+    tuner = BusTuner(lambda freq: None, sm_fusion._read_all, [100000], samples=4)
+    result = (tuner.measure(100000), sm_fusion._read_all()[0])
+    if not assert_func("bus_tuner", "Host-Fusion", "AMG-Modus, 1 von 2 Sensoren NAK", (0.5, (1, 0, 0, 0)), result):
+        all_passed = False
+
+    # === TEST 8: i2cdev-Backend (Takt legt der Kernel fest) -> kein Tuner, mit Hinweis ===
+    import io
+    import contextlib
+    import backends
+    from hardware import sensor_manager
+
+    class I2CDevManager(SensorManager):
+        def _open_bus(self, frequency):
+            self.opened = frequency  # Bus und Sensoren interessieren hier nicht
+
+    backends.register("hardware", "test_i2cdev", {"i2cdev": "math"})
+    saved = (sensor_manager.I2C_AUTOTUNE, sensor_manager.HARDWARE_BACKEND)
+    sensor_manager.I2C_AUTOTUNE, sensor_manager.HARDWARE_BACKEND = True, "test_i2cdev"
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            sm_dev = I2CDevManager()
+    finally:
+        sensor_manager.I2C_AUTOTUNE, sensor_manager.HARDWARE_BACKEND = saved
+    result = (sm_dev.dummy_mode, sm_dev.tuner, "[I2C] Auto-Tuning aus" in out.getvalue())
+    if not assert_func("bus_tuner", "i2cdev", "I2C_AUTOTUNE mit /dev/i2c-N", (False, None, True), result):
+        all_passed = False
+
+    # === TEST 9: Modul laesst sich ohne SensorManager (und Pi-Bibliotheken) importieren ===
+    code = "import sys, hardware.bus_tuner; print(sorted(m for m in ('hardware.sensor_manager', 'board') if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                          cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ArmSense'))
+    if not assert_func("bus_tuner", "Import", "import hardware.bus_tuner", "[]", proc.stdout.strip()):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,99 @@
+import sys
+import os
+import time
+import threading
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.deadline import DeadlineSweep
+from hardware.sensor_manager import SensorManager
+
+class FakeSensor:
+    """BNO055-Ersatz: Read dauert 'delay' Sekunden; blockiert, solange 'hang' gesetzt ist."""
+    def __init__(self, delay=0.001):
+        self.delay = delay
+        self.hang = threading.Event()
+        self.released = threading.Event()
+
+    @property
+    def quaternion(self):
+        if self.hang.is_set():
+            self.released.wait()
+        time.sleep(self.delay)
+        return (1.0, 0.0, 0.0, 0.0)
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für den Sweep mit Zeitbudget aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Was nicht ins Budget passt, wird verschoben und kommt danach zuerst dran ===
+    sweep = DeadlineSweep(budget=1.0, smoothing=1.0)
+    reads = {name: (lambda: time.sleep(0.01)) for name in ("a", "b", "c", "d")}
+    sweep.run(reads)  # Lernt die Dauer der Reads (10 ms)
+    sweep.budget = 0.025
+    first = list(sweep.run(reads))
+    second = list(sweep.run(reads))
+    result = (len(first), sorted(set(first + second)), sweep.misses)
+    if not assert_func("deadline", "Budget", "4 Reads je 10 ms, Budget 25 ms", (2, ["a", "b", "c", "d"], 0), result):
+        all_passed = False
+    sweep.close()
+
+    # === TEST 2: Zeitpunkt und Dauer stammen aus dem Worker (Ende des Reads, nicht Abholung) ===
+    sweep = DeadlineSweep(budget=1.0)
+    def timed_read():
+        t_begin = time.perf_counter()
+        time.sleep(0.005)
+        return t_begin, time.perf_counter()
+    (t_begin, t_done), t_end, cost = sweep.run({"a": timed_read})["a"]
+    result = t_end - cost <= t_begin <= t_done <= t_end
+    if not assert_func("deadline", "Read-Zeitpunkt", "5 ms Read", True, result):
+        all_passed = False
+        print(f"    Read {t_begin:.6f}..{t_done:.6f}, Sweep {t_end - cost:.6f}..{t_end:.6f}")
+    sweep.close()
+
+    # === TEST 3: Haengender Read ueberschreitet die Deadline nicht ===
+    manager = SensorManager(use_hardware=False)
+    manager.sensors = {"base": FakeSensor(), "arm": FakeSensor()}
+    manager.dummy_mode = False
+    manager.sweeper = DeadlineSweep(budget=0.02)
+    manager.get_data()
+    manager.sensors["arm"].hang.set()
+    durations = []
+    for _ in range(5):
+        t_start = time.perf_counter()
+        data = manager.get_data()
+        durations.append(time.perf_counter() - t_start)
+        time.sleep(0.02)  # Rest der Frame-Periode
+    stale = manager.get_stale()
+    stats = manager.get_sweep_stats()
+    result = (max(durations) < 0.05, data["arm"], sorted(stale), stale["arm"] > 0.05, stats["misses"], stats["busy"])
+    if not assert_func("deadline", "Haengender Read", "arm blockiert, Budget 20 ms",
+                       (True, (1, 0, 0, 0), ["arm", "base"], True, 1, True), result):
+        all_passed = False
+
+    # === TEST 4: Nach dem Ende der Transaktion wird wieder gelesen ===
+    # Der haengende Read hat die geschaetzte Dauer von "arm" erhoeht: erst verschoben, dann zuerst gelesen
+    arm = manager.sensors["arm"]
+    arm.hang.clear()
+    arm.released.set()
+    time.sleep(0.01)
+    manager.get_data()
+    deferred = sorted(manager.get_stale())
+    manager.get_data()
+    result = (deferred, manager.get_stale(), manager.sweeper.busy, sorted(manager.last_raw))
+    if not assert_func("deadline", "Erholung", "Read beendet", (["arm"], {}, False, ["arm", "base"]), result):
+        all_passed = False
+    manager.sweeper.close()
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,66 @@
+import sys
+import os
+
+import numpy as np
+
+# Damit das Skript das 'ArmSense' Modul (und das Debug-Skript) findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense', 'debug')))
+os.environ.setdefault("MPLBACKEND", "Agg")  # Kein Fenster noetig
+
+from debug_sensors import SampleRing, minmax_decimate
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für Ringpuffer und Min/Max-Dezimierung des Live-Plotters aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Ringpuffer vor und nach dem Ueberlauf in zeitlicher Reihenfolge ===
+    ring = SampleRing(4, 2)
+    for i in range(3):
+        ring.append(float(i), (i, -i))
+    t_before, _ = ring.snapshot()
+    for i in range(3, 7):
+        ring.append(float(i), (i, -i))
+    t, values = ring.snapshot()
+    t[0] = 99.0  # Snapshot ist eine Kopie
+    result = (t_before.tolist(), ring.snapshot()[0].tolist(), values[:, 1].tolist(), ring.count)
+    expected = ([0.0, 1.0, 2.0], [3.0, 4.0, 5.0, 6.0], [-3.0, -4.0, -5.0, -6.0], 7)
+    if not assert_func("debug_plot", "Ringpuffer", "Kapazitaet 4, 3 bzw. 7 Werte", expected, result):
+        all_passed = False
+
+    # === TEST 2: Min/Max jedes Buckets bleibt erhalten (auch einzelne Spitzen) ===
+    n, buckets = 1003, 10
+    x = np.arange(n, dtype=np.float64)
+    y = np.stack((np.sin(x / 50.0), np.zeros(n)), axis=1).astype(np.float32)
+    y[500, 1] = 42.0   # Einzelner Ausreisser
+    y[-1, 1] = -7.0    # Neuester Wert
+    x_out, y_out = minmax_decimate(x, y, buckets)
+    per = n // buckets
+    kept = y[n - per * buckets:].reshape(buckets, per, 2)
+    result = (len(x_out), y_out.shape, bool(np.array_equal(y_out[0::2], kept.min(axis=1))),
+              bool(np.array_equal(y_out[1::2], kept.max(axis=1))), float(y_out[:, 1].max()),
+              float(y_out[-2, 1]), bool(np.all(np.diff(x_out) >= 0)))
+    expected = (20, (20, 2), True, True, 42.0, -7.0, True)
+    if not assert_func("debug_plot", "Min/Max-Buckets", "1003 Werte -> 10 Buckets", expected, result):
+        all_passed = False
+
+    # === TEST 3: Kurze Reihen (weniger Werte als Buckets) bleiben unveraendert ===
+    x = np.arange(5, dtype=np.float64)
+    y = np.arange(10, dtype=np.float32).reshape(5, 2)
+    x_out, y_out = minmax_decimate(x, y, 10)
+    empty = minmax_decimate(np.zeros(0), np.zeros((0, 2), dtype=np.float32), 10)
+    result = (x_out is x, y_out is y, len(empty[0]), empty[1].shape)
+    if not assert_func("debug_plot", "Kurze Reihe", "5 Werte, 10 Buckets", (True, True, 0, (0, 2)), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,161 @@
+import sys
+import os
+import time
+import tempfile
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware import discovery
+
+class FakeBus:
+    """
+    I2C-Bus mit TCA9548A-Multiplexern und BNO055. devices: {(mux, kanal): {adresse: chip_id}},
+    (None, None) = direkt am Bus. Jede Transaktion dauert 'delay' Sekunden.
+    """
+    def __init__(self, muxes, devices, delay=0.0005):
+        self.masks = {mux: 0 for mux in muxes}
+        self.devices = devices
+        self.delay = delay
+        self.transactions = 0
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def _visible(self, address):
+        for (mux, channel), devices in self.devices.items():
+            if address in devices and (mux is None or self.masks[mux] & (1 << channel)):
+                return devices[address]
+        return None
+
+    def writeto(self, address, buf):
+        self.transactions += 1
+        time.sleep(self.delay)
+        if address in self.masks:
+            self.masks[address] = buf[0]
+        elif self._visible(address) is None:
+            raise OSError(121, "Remote I/O error")
+
+    def writeto_then_readfrom(self, address, out_buf, in_buf):
+        self.transactions += 1
+        time.sleep(self.delay)
+        chip = self._visible(address)
+        if chip is None:
+            raise OSError(121, "Remote I/O error")
+        in_buf[0] = chip
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die Topologie-Erkennung aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    cache = os.path.join(tempfile.mkdtemp(), "topology.json")
+
+    def rig():
+        # Bus 1: zwei Multiplexer, ein BNO055 direkt am Bus (0x29), ein fremdes Geraet (Chip-ID 0x55)
+        bus1 = FakeBus([0x70, 0x71], {(0x70, 2): {0x28: 0xA0}, (0x70, 7): {0x28: 0xA0},
+                                      (0x71, 0): {0x28: 0x55}, (None, None): {0x29: 0xA0}})
+        # Bus 3: ein Multiplexer, zwei Sensoren an einem Kanal (0x28/0x29)
+        bus3 = FakeBus([0x70], {(0x70, 5): {0x28: 0xA0, 0x29: 0xA0}})
+        return {1: bus1, 3: bus3}
+
+    # === TEST 1: Voller Scan findet alle BNO055 (nur Chip-ID 0xA0) ===
+    buses = rig()
+    topology = discovery.discover(buses, cache, mux_addresses=[0x70, 0x71])
+    result = (topology["source"], [(s["bus"], s["mux"], s["channel"], s["address"]) for s in topology["sensors"]])
+    expected = ("scan", [(1, None, None, 0x29), (1, 0x70, 2, 0x28), (1, 0x70, 7, 0x28),
+                         (3, 0x70, 5, 0x28), (3, 0x70, 5, 0x29)])
+    if not assert_func("discovery", "Voller Scan", "2 Busse, 3 Multiplexer, 1 Sensor direkt", expected, result):
+        all_passed = False
+    full_scan = buses[1].transactions
+
+    # === TEST 2: Naechster Start bestaetigt nur den Cache (wenige Transaktionen) ===
+    buses = rig()
+    cached = discovery.discover(buses, cache, mux_addresses=[0x70, 0x71])
+    result = (cached["source"], cached["fingerprint"] == topology["fingerprint"],
+              buses[1].transactions < full_scan // 4)
+    if not assert_func("discovery", "Cache", "gleiche Topologie", ("cache", True, True), result):
+        all_passed = False
+
+    # === TEST 3: Sensor umgesteckt -> Cache passt nicht, voller Scan mit neuem Fingerprint ===
+    buses = rig()
+    buses[1].devices[(0x70, 3)] = buses[1].devices.pop((0x70, 2))
+    moved = discovery.discover(buses, cache, mux_addresses=[0x70, 0x71])
+    result = (moved["source"], moved["fingerprint"] != topology["fingerprint"],
+              discovery.find(moved, 3) is not None, discovery.find(moved, 2))
+    if not assert_func("discovery", "Umgesteckt", "Kanal 2 -> 3", ("scan", True, True, None), result):
+        all_passed = False
+
+    # === TEST 4: Busse werden parallel gescannt ===
+    buses = rig()
+    for bus in buses.values():
+        bus.delay = 0.002
+    t_start = time.perf_counter()
+    discovery.scan(buses, mux_addresses=[0x70, 0x71])
+    elapsed = time.perf_counter() - t_start
+    serial = sum(bus.transactions for bus in buses.values()) * 0.002
+    result = elapsed < 0.8 * serial
+    if not assert_func("discovery", "Parallel", "2 Busse, 2 ms pro Transaktion", True, result):
+        all_passed = False
+
+    # === TEST 5: Fehlt eine SENSOR_MAPPING-Position im Cache, wird neu gescannt; leere Scans nicht gecacht ===
+    for _ in range(2):  # Erster Aufruf ersetzt den umgesteckten Cache aus TEST 3
+        buses = rig()
+        confirmed = discovery.discover(buses, cache, mux_addresses=[0x70], required=[(0x70, 2), (0x70, 7)])["source"]
+    buses = rig()
+    buses[1].devices[(0x71, 4)] = {0x28: 0xA0}  # Neu: Sensor an einem Mux ausserhalb von mux_addresses
+    rescanned = discovery.discover(buses, cache, mux_addresses=[0x70], required=[(0x70, 2), (0x71, 4)])
+    empty_cache = os.path.join(tempfile.mkdtemp(), "topology.json")
+    empty = discovery.discover({1: FakeBus([0x70], {})}, empty_cache)
+    result = (confirmed, rescanned["source"], discovery.find(rescanned, 4, 0x71) is not None,
+              len(empty["sensors"]), os.path.exists(empty_cache))
+    if not assert_func("discovery", "Pflicht-Positionen", "Cache ohne (0x71, 4) / Bus ohne Sensoren",
+                       ("cache", "scan", True, 0, False), result):
+        all_passed = False
+
+    # === TEST 6: SENSOR_MAPPING mit zweitem Multiplexer, nicht eingetragene Sensoren werden gemeldet ===
+    from types import SimpleNamespace
+    from config import SENSOR_MAPPING
+    from hardware.sensor_manager import SensorManager
+
+    class FakeBNO:
+        def __init__(self, channel, address):
+            self.channel, self.address = channel, address
+
+        def _write_register(self, register, value):
+            pass
+
+    topology = {"sensors": [{"bus": 1, "mux": 0x70, "channel": 2, "address": 0x28},
+                            {"bus": 1, "mux": 0x71, "channel": 3, "address": 0x29},
+                            {"bus": 1, "mux": 0x71, "channel": 5, "address": 0x28},
+                            {"bus": 1, "mux": None, "channel": None, "address": 0x28}]}
+    saved = dict(SENSOR_MAPPING)
+    SENSOR_MAPPING.update({"base": 2, "arm": (0x71, 3)})
+    try:
+        manager = SensorManager(use_hardware=False)
+        manager.hw = SimpleNamespace(bno055=SimpleNamespace(BNO055_I2C=FakeBNO))
+        manager.muxes = {mux: {ch: (mux, ch) for ch in range(8)} for mux in (0x70, 0x71)}
+        manager.topology = topology
+        manager._init_sensors()
+        placed = {name: (bno.channel, bno.address) for name, bno in manager.sensors.items()}
+        missing = [discovery.where(e["mux"], e["channel"]) for e in discovery.unmapped(topology)]
+    finally:
+        SENSOR_MAPPING.clear()
+        SENSOR_MAPPING.update(saved)
+    result = (discovery.position(7), discovery.position((0x71, 3)), placed, missing)
+    expected = ((0x70, 7), (0x71, 3), {"base": ((0x70, 2), 0x28), "arm": ((0x71, 3), 0x29)}, ["Mux 0x71 Kanal 5"])
+    if not assert_func("discovery", "Zweiter Mux", "arm an (0x71, 3), Sensor an 0x71 Kanal 5 frei", expected, result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,122 @@
+import sys
+import os
+import math
+import json
+import random
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.filters import build_chain, benchmark, JumpFilter, STAGES
+from hardware.sensor_manager import SensorManager
+from utils import q_angle_between
+
+RATE = 100.0
+
+def about_x(degrees):
+    half = math.radians(degrees) / 2
+    return (math.cos(half), math.sin(half), 0.0, 0.0)
+
+def noisy(degrees, rng, noise=0.5):
+    """Drehung um X plus Rauschen (Grad) um Y."""
+    half = math.radians(rng.gauss(0.0, noise)) / 2
+    q = about_x(degrees)
+    n = (math.cos(half), 0.0, math.sin(half), 0.0)
+    w1, x1, y1, z1 = q
+    w2, x2, y2, z2 = n
+    return (w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2, w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2, w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2)
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die Filter-Kette aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Median entfernt einen einzelnen Spike, Jump-Filter verhaelt sich wie bisher ===
+    median = build_chain([("median", {"window": 3})])
+    stream = [about_x(10.0)] * 5 + [about_x(70.0)] + [about_x(10.0)] * 5
+    worst = max(q_angle_between(median.apply(q), about_x(10.0)) for q in stream)
+    jump = build_chain([("jump", {"limit": 20.0, "max_outliers": 2})])
+    outputs = [round(q_angle_between(jump.apply(q), (1, 0, 0, 0))) for q in [about_x(5.0)] + [about_x(90.0)] * 3]
+    result = (worst < 1e-6, outputs)
+    if not assert_func("filters", "Median / Jump", "60° Spike / 85° Sprung, 2 Ausreisser", (True, [5, 5, 5, 90]), result):
+        all_passed = False
+
+    # === TEST 2: One-Euro ruhig bei Stillstand, weniger Nachlauf als gleich ruhiges SLERP bei Bewegung ===
+    rng = random.Random(42)
+    one_euro = build_chain([("one_euro", {"min_cutoff": 1.0, "beta": 2.0})])
+    slerp = build_chain([("slerp", {"tau": 1.0 / (2 * math.pi)})])  # Gleiche Grenzfrequenz bei Stillstand
+    raw_jitter, euro_jitter, euro_lag, slerp_lag = [], [], [], []
+    for i in range(400):
+        t = i / RATE
+        angle = 0.0 if i < 200 else 180.0 * (t - 2.0)  # Ab 2 s Drehung mit 180°/s
+        q = noisy(angle, rng)
+        qe, qs = one_euro.apply(q, t), slerp.apply(q, t)
+        if 100 <= i < 200:
+            raw_jitter.append(q_angle_between(q, about_x(0.0)))
+            euro_jitter.append(q_angle_between(qe, about_x(0.0)))
+        elif i >= 300:
+            euro_lag.append(q_angle_between(qe, about_x(angle)))
+            slerp_lag.append(q_angle_between(qs, about_x(angle)))
+    mean = lambda values: sum(values) / len(values)
+    result = (mean(euro_jitter) < 0.5 * mean(raw_jitter), mean(euro_lag) < 0.5 * mean(slerp_lag))
+    if not assert_func("filters", "One-Euro", "Rauschen 0.5°, dann 180°/s", (True, True), result):
+        all_passed = False
+
+    # === TEST 3: Zustand als JSON sichern und fortsetzen (Keyframes), alte Keyframes laden ===
+    spec = [("median", {"window": 5}), ("jump", {}), ("one_euro", {}), ("slerp", {"tau": 0.02})]
+    chain = build_chain(spec)
+    rng = random.Random(1)
+    samples = [(noisy(i * 0.5, rng), i / RATE) for i in range(60)]
+    for q, t in samples[:30]:
+        chain.apply(q, t)
+    restored = build_chain(spec)
+    restored.set_state(json.loads(json.dumps(chain.get_state())))
+    same = all(chain.apply(q, t) == restored.apply(q, t) for q, t in samples[30:])
+
+    manager = SensorManager(use_hardware=False)
+    old_state = {"last_valid": {"base": [1, 0, 0, 0], "arm": list(about_x(30.0))},
+                 "outliers": {"base": 0, "arm": 2},
+                 "offsets": {"base": [1, 0, 0, 0], "arm": [1, 0, 0, 0]},
+                 "alignments": {"base": [1, 0, 0, 0], "arm": [1, 0, 0, 0]}}
+    manager.set_filter_state(old_state)
+    jump_state = manager.filters["arm"].stage(JumpFilter).get_state()
+    result = (same, jump_state["outliers"], "filters" in manager.get_filter_state())
+    if not assert_func("filters", "Zustand", "4 Stufen / Keyframe ohne 'filters'", (True, 2, True), result):
+        all_passed = False
+
+    # === TEST 4: Benchmark misst jede Stufe einzeln und die Kette ===
+    costs = benchmark([(kind, {}) for kind in STAGES], samples=500)
+    result = sorted(costs) == sorted(list(STAGES) + ["kette"]) and all(us > 0 for us in costs.values())
+    if not assert_func("filters", "Benchmark", "alle Stufen, 500 Samples", True, result):
+        all_passed = False
+
+    # === TEST 5: Limit waechst nur mit dem geplanten Leseabstand (PollScheduler), begrenzt ===
+    def jump_after(dt, interval=None, frames=1):
+        jump = JumpFilter(limit=20.0, max_outliers=10)
+        jump.interval = interval
+        jump.apply(about_x(0.0), 0.0)
+        for i in range(1, frames + 1):
+            out = jump.apply(about_x(30.0), i * dt)
+        return round(q_angle_between(out, about_x(0.0)))
+    restored = JumpFilter(limit=20.0)
+    restored.set_state({"last": list(about_x(0.0)), "outliers": 0})
+    restored.interval = 0.2
+    result = (jump_after(0.01, 0.2),           # 30° in 10 ms -> Glitch
+              jump_after(0.2, 0.2),            # 30° in 200 ms, geplant mit 5 Hz -> Bewegung
+              jump_after(1.0 / 30.0, None, 5), # Render-Schleife ohne Scheduler: bleibt bei 20° je Frame
+              jump_after(0.2, 0.01, 5),        # Verworfene Frames oeffnen das Limit nicht weiter
+              round(q_angle_between(restored.apply(about_x(30.0), 5000.0), about_x(0.0))))  # Andere Zeitbasis
+    if not assert_func("filters", "Jump / Poll-Rate", "30° Sprung, 20° Limit", (0, 30, 0, 0, 0), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
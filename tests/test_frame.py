@@ -0,0 +1,58 @@
+import sys
+import os
+import pickle
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from frame import SensorFrame, layout_for, FRESH, HELD
+from hardware.sensor_manager import SensorManager
+from transport.net_stream import FrameEncoder
+from pose_detector import PoseDetector
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für den kompakten SensorFrame aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    q_10 = (0.99619, 0.08716, 0.0, 0.0)
+
+    # === TEST 1: Verhaelt sich wie das bisherige dict ===
+    frame = SensorFrame.from_mapping({"arm": q_10}, layout_for(["base", "arm"]), timestamp=1.5)
+    result = (frame == {"base": (1.0, 0.0, 0.0, 0.0), "arm": q_10}, frame.get("hand", "-"), "arm" in frame,
+              list(frame), dict(frame.items())["arm"], len(frame), bytes(frame.flags))
+    expected = (True, "-", True, ["base", "arm"], q_10, 2, bytes([0, FRESH]))
+    if not assert_func("frame", "Mapping", "arm gesetzt, base fehlt", expected, result):
+        all_passed = False
+
+    # === TEST 2: get_data() liefert SensorFrame mit Flags; Pickle (multiprocessing) ===
+    manager = SensorManager(use_hardware=False)
+    manager.inject_test_data([{"base": q_10, "arm": q_10}, {"base": q_10}])
+    manager.get_data()
+    data = manager.get_data()
+    copy = pickle.loads(pickle.dumps(data))
+    result = (type(data).__name__, data.flags[data.layout.index["base"]], data.flags[data.layout.index["arm"]],
+              copy == data, copy.layout is data.layout)
+    if not assert_func("frame", "SensorManager", "2. Frame ohne arm", ("SensorFrame", FRESH, HELD, True, True), result):
+        all_passed = False
+
+    # === TEST 3: Schnelle Pfade (Index statt Name) liefern dasselbe wie ueber das dict ===
+    as_dict = data.to_dict()
+    packet_frame = FrameEncoder(["base", "arm"]).encode(data, 2.0)
+    packet_dict = FrameEncoder(["base", "arm"]).encode(as_dict, 2.0)
+    packet_other = FrameEncoder(["arm", "base"]).encode(data, 2.0)  # Andere Reihenfolge -> ueber Namen
+    detector = PoseDetector()
+    result = (packet_frame == packet_dict, packet_other == FrameEncoder(["arm", "base"]).encode(as_dict, 2.0),
+              detector.classify(data) == detector.classify(as_dict))
+    if not assert_func("frame", "Index-Zugriff", "Netz-Encoder / Posen-Erkennung", (True, True, True), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
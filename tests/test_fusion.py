@@ -0,0 +1,74 @@
+import sys
+import os
+import math
+import struct
+import tempfile
+
+import numpy as np
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.fusion import MadgwickBank, RawLog, decode_burst, fuse_recording
+from utils import q_mult, q_conjugate, q_angle_between
+
+def to_sensor(q, v):
+    """Erd-Vektor v im Sensor-System einer Orientierung q (q* v q)."""
+    return q_mult(q_mult(q_conjugate(q), (0.0,) + tuple(v)), q)[1:]
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die Host-Fusion aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Burst-Dekodierung (Default-Einheiten des BNO055) ===
+    buf = struct.pack("<9h", 0, 0, 981, 320, 0, -640, 0, 0, 16 * 90)
+    acc, mag, gyr = decode_burst(buf)
+    result = (tuple(acc), tuple(mag), round(math.degrees(gyr[2]), 3))
+    if not assert_func("fusion", "Burst dekodieren", "ACC z=981, MAG x=320/z=-640, GYR z=1440 LSB",
+                       ((0.0, 0.0, 9.81), (20.0, 0.0, -40.0), 90.0), result):
+        all_passed = False
+
+    # === TEST 2: Ruhender Sensor konvergiert gegen die wahre Orientierung ===
+    half = 1.0
+    axis = (0.3, -0.5, 0.8)
+    norm = math.sqrt(sum(c * c for c in axis))
+    q_true = (math.cos(half),) + tuple(math.sin(half) * c / norm for c in axis)
+    acc_s, mag_s = to_sensor(q_true, (0, 0, 9.81)), to_sensor(q_true, (20.0, 0.0, -40.0))
+
+    bank = MadgwickBank(["base", "arm"], beta=0.1)
+    for _ in range(300):
+        bank.update([[0, 0, 0]] * 2, [acc_s] * 2, [mag_s] * 2, 0.01)
+    result = [q_angle_between(bank.quaternion(name), q_true) < 0.5 for name in ("base", "arm")]
+    if not assert_func("fusion", "Konvergenz (Gravitation + Magnetfeld)", "114° um schraege Achse, 3 s", [True, True], result):
+        all_passed = False
+
+    # === TEST 3: Online-Schritt und Offline-Fusion der Aufnahme sind identisch ===
+    # "arm" dreht mit 90°/s um z, "base" faellt im zweiten Sweep aus
+    bank = MadgwickBank(["base", "arm"], beta=0.05, gains={"arm": 0.2})
+    log = RawLog(bank.names)
+    w = math.radians(90.0)
+    for i in range(100):
+        t = i * 0.01
+        samples = {"arm": (t, (0, 0, 9.81), (20.0, 0.0, -40.0), (0, 0, w))}
+        if i != 1:
+            samples["base"] = (t, (0, 0, 9.81), (20.0, 0.0, -40.0), (0, 0, 0))
+        online = bank.step(samples, log)
+
+    path = os.path.join(tempfile.mkdtemp(), "raw.npz")
+    log.save(path)
+    offline = fuse_recording(np.load(path), beta=0.05, gains={"arm": 0.2})
+    result = (len(log), bool(np.allclose(offline[-1], bank.q, atol=1e-5)), online["base"] == bank.quaternion("base"))
+    if not assert_func("fusion", "Offline-Fusion", "100 Sweeps, 1 Ausfall, Gain pro Sensor", (100, True, True), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
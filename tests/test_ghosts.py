@@ -0,0 +1,80 @@
+import sys
+import os
+import math
+import shutil
+import tempfile
+
+import numpy as np
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from config import ARM_LENGTH_1, ARM_LENGTH_2, GHOST_ALPHA
+from utils import q_rotate_vec, q_normalize
+from recording.session import SessionWriter
+from visualization.ghosts import instance_data, palette, GhostSource
+
+def q_about(axis, deg):
+    half = math.radians(deg) / 2
+    s = math.sin(half)
+    return (math.cos(half), axis[0] * s, axis[1] * s, axis[2] * s)
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die Geister-Arme (Instanz-Daten und Abtasten der Sitzungen) aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Instanz-Daten = gleiche Geometrie wie der Live-Arm (q_rotate_vec) ===
+    rng = np.random.default_rng(7)
+    n = 150
+    q_base = np.array([q_normalize(tuple(q)) for q in rng.normal(size=(n, 4))], dtype=np.float32)
+    q_arm = np.array([q_normalize(tuple(q)) for q in rng.normal(size=(n, 4))], dtype=np.float32)
+    data = instance_data(q_base, q_arm, palette(n))
+    worst = 0.0
+    for i in range(n):
+        elbow = q_rotate_vec(tuple(q_base[i]), (ARM_LENGTH_1, 0.0, 0.0))
+        hand = np.add(elbow, q_rotate_vec(tuple(q_arm[i]), (ARM_LENGTH_2, 0.0, 0.0)))
+        worst = max(worst, np.abs(data[i, 0:3]).max(), np.abs(data[i, 3:6] - elbow).max(),
+                    np.abs(data[n + i, 0:3] - elbow).max(), np.abs(data[n + i, 0:3] + data[n + i, 3:6] - hand).max())
+    result = (data.shape, data.dtype == np.float32, bool(worst < 1e-5))
+    if not assert_func("ghosts", "Geometrie", "150 Arme", ((300, 10), True, True), result):
+        all_passed = False
+
+    # === TEST 2: Farbe/Alpha pro Arm auf beiden Segmenten; Puffer wird wiederverwendet ===
+    colors = palette(3)
+    colors[1, 3] = 0.8
+    buf = np.zeros((400, 10), dtype=np.float32)
+    data = instance_data(q_base[:3], q_arm[:3], colors, out=buf)
+    result = (data.shape[0], np.shares_memory(data, buf), np.array_equal(data[:3, 6:10], colors),
+              np.array_equal(data[3:, 6:10], colors), float(colors[0, 3]), float(data[4, 9]))
+    expected = (6, True, True, True, GHOST_ALPHA, 0.800000011920929)
+    if not assert_func("ghosts", "Farben", "3 Arme, eigener Puffer", expected, result):
+        all_passed = False
+
+    # === TEST 3: Sitzungen an gleicher relativer Zeit abtasten, kuerzere in Schleife ===
+    base = tempfile.mkdtemp()
+    for name, frames, deg in (("a", 100, 30.0), ("b", 40, 60.0)):
+        writer = SessionWriter(os.path.join(base, name), ["base", "arm"], chunk_frames=16, raw=False)
+        for i in range(frames):
+            writer.append(500.0 + i * 0.1, {"base": q_about((0, 0, 1), deg), "arm": q_about((0, 0, 1), i)})
+        writer.close(verbose=False)
+    source = GhostSource(base)
+    samples = []
+    for position in (2.0, 5.0):  # Sitzung b dauert 3.9 s -> 5.0 s = Frame 11
+        b, a, c = source.sample(position)
+        samples.append([round(math.degrees(2 * math.acos(min(1.0, float(q[0]))))) for q in a])
+    result = (len(source), samples, [round(math.degrees(2 * math.acos(float(q[0])))) for q in b], c.shape)
+    shutil.rmtree(base)
+    if not assert_func("ghosts", "Abtasten", "2 Sitzungen (10 s, 3.9 s)", (2, [[20, 20], [50, 11]], [30, 60], (2, 4)), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
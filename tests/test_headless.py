@@ -0,0 +1,137 @@
+import sys
+import os
+import io
+import json
+import socket
+import subprocess
+import threading
+import time
+
+# Damit das Skript das 'ArmSense' Modul findet
+ARMSENSE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense'))
+sys.path.insert(0, ARMSENSE)
+
+from headless import JsonLinesSink, BinarySink, ControlServer, headless_loop, read_binary
+from hardware.sensor_manager import SensorManager
+from pose_detector import PoseDetector
+from rom_stats import RomStats
+from transport.net_stream import decode, StreamClient, KIND_NAMES, KIND_FRAME, KIND_EVENT
+
+Q_HANG = (1.0, 0.0, 0.0, 0.0)
+Q_90 = (0.70711, 0.0, 0.70711, 0.0)
+
+class FakeClock:
+    """50 ms pro Aufruf (ein Aufruf pro Frame ohne Kommandos)."""
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        self.t = round(self.t + 0.05, 2)
+        return self.t
+
+def _run(frames, sink_cls, control=None, every=1, rom=None):
+    manager = SensorManager(use_hardware=False)
+    manager.inject_test_data(list(frames))
+    out = io.BytesIO()
+    sink = sink_cls(out, ["base", "arm"])
+    n = headless_loop(manager, PoseDetector(), sink, control, every=every, min_pose=0.1, rom=rom,
+                      max_frames=len(frames), clock=FakeClock())
+    return n, out.getvalue()
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für den Headless-Betrieb aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    # 4 Frames haengend, dann L-Form (die ersten 5 Spruenge verwirft der Jump-Filter)
+    frames = [{"base": Q_HANG, "arm": Q_HANG}] * 4 + [{"base": Q_HANG, "arm": Q_90}] * 10
+
+    # === TEST 1: JSON-Zeilen, Posen-Ereignisse entprellt ===
+    rom = RomStats(["base", "arm"])
+    n, out = _run(frames, JsonLinesSink, every=5, rom=rom)
+    lines = [json.loads(line) for line in out.splitlines()]
+    events = [(e["t"], e["pose"], e["previous"]) for e in lines if e["type"] == "pose"]
+    frame_times = [e["t"] for e in lines if e["type"] == "frame"]
+    elbow = rom.summary()["joint.elbow"]
+    result = (n, events, frame_times, lines[0]["q"]["arm"], (elbow["n"], round(elbow["max"])))
+    expected = (14, [(0.05, 1, None), (0.5, 2, 1)], [0.05, 0.3, 0.55], [1.0, 0.0, 0.0, 0.0], (14, 90))
+    if not assert_func("headless", "headless_loop", "JSON, every=5", expected, result):
+        all_passed = False
+
+    # === TEST 2: Binaer: Namen, Frames, Ereignisse; StreamClient ignoriert Ereignisse ===
+    n, out = _run(frames, BinarySink, every=0)
+    packets = list(read_binary(io.BytesIO(out)))
+    decoded = [decode(p) for p in packets]
+    client = StreamClient()
+    accepted = [client.feed(p, recv_time=1.0) for p in packets]
+    result = ([d[0] for d in decoded], decoded[0][3], decoded[2][3], accepted)
+    expected = ([KIND_NAMES, KIND_EVENT, KIND_EVENT], ["base", "arm"],
+                {"type": "pose", "pose": 2, "name": "L-Form", "previous": 1}, [False, False, False])
+    if not assert_func("headless", "BinarySink", "every=0 (nur Ereignisse)", expected, result):
+        all_passed = False
+
+    # === TEST 3: Steuer-Socket: Kommando wird im Loop ausgefuehrt, status liefert JSON ===
+    control = ControlServer(port=0)
+    try:
+        with socket.create_connection(control.address, timeout=5.0) as sock:
+            f = sock.makefile("rwb")
+            replies = []
+            for cmd in (b"zero\n", b"tanzen\n"):
+                f.write(cmd)
+                f.flush()
+                replies.append(json.loads(f.readline())["ok"])
+            n, out = _run([{"base": Q_HANG, "arm": Q_HANG}] * 3, JsonLinesSink, control, every=0)
+            f.write(b"status\n")
+            f.flush()
+            status = json.loads(f.readline())
+    finally:
+        control.close()
+    kinds = [json.loads(line)["type"] for line in out.splitlines()]
+    result = (replies, kinds[0], status["frames"], status["calibration"][0])
+    expected = ([True, False], "command", 3, "zero")
+    if not assert_func("headless", "ControlServer", "zero / unbekannt / status", expected, result):
+        all_passed = False
+
+    # === TEST 4: PollScheduler ohne faellige Sensoren -> kein Kreisen, keine HELD-Frames; Dummy mit rate ===
+    from hardware.poll_scheduler import PollScheduler
+
+    class StillSensor:
+        quaternion = Q_HANG
+
+    manager = SensorManager(use_hardware=False)
+    manager.sensors = {"base": StillSensor(), "arm": StillSensor()}
+    manager.dummy_mode = False
+    manager.scheduler = PollScheduler(["base", "arm"], budget=1.0, min_rate=5.0, max_rate=100.0, resolution=1.0)
+    calls = []
+    get_data = manager.get_data
+    manager.get_data = lambda: calls.append(1) or get_data()
+    stop = threading.Event()
+    threading.Timer(0.5, stop.set).start()
+    out = io.BytesIO()
+    n = headless_loop(manager, PoseDetector(), JsonLinesSink(out, ["base", "arm"]), stop_event=stop)
+    dummy = SensorManager(use_hardware=False)
+    t_start = time.perf_counter()
+    paced = headless_loop(dummy, PoseDetector(), JsonLinesSink(io.BytesIO(), ["base", "arm"]), every=0,
+                          max_frames=10, rate=100.0)
+    elapsed = time.perf_counter() - t_start
+    result = (2 <= n <= 4, len(calls) < 100, out.getvalue().count(b'"frame"') == n, paced, elapsed >= 0.09)
+    if not assert_func("headless", "Leerlauf", "ruhende Sensoren (5 Hz) 0.5 s / Dummy 100 Hz",
+                       (True, True, True, 10, True), result):
+        all_passed = False
+
+    # === TEST 5: Keine Grafik-Module im Headless-Pfad ===
+    code = ("import sys, main, headless; "
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in ('pygame', 'OpenGL', 'visualization')))")
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ARMSENSE, capture_output=True, text=True)
+    if not assert_func("headless", "Imports", "main + headless", "[]", proc.stdout.strip()):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,127 @@
+import sys
+import os
+import errno
+import ctypes
+import struct
+import tempfile
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware import i2cdev
+from hardware.i2cdev import I2CDev, BNO055Bank, REG_QUATERNION
+
+class FakeAdapter:
+    """
+    Kernel-Treiber-Ersatz fuer I2C_FUNCS / I2C_RDWR: ein TCA9548A (0x70) mit BNO055 an den Kanaelen.
+    Wie der echte Mux uebernimmt er eine Kanalwahl erst am Ende der ioctl (STOP).
+    max_reads = 1 verhaelt sich wie bcm2835 (nur eine Lese-Nachricht, als letzte).
+    """
+    def __init__(self, devices, funcs=i2cdev.I2C_FUNC_I2C, max_reads=None):
+        self.devices = devices  # {kanal: {adresse: registers}}
+        self.funcs = funcs
+        self.max_reads = max_reads
+        self.mask = 0
+        self.calls = []
+
+    def _regs(self, address):
+        for channel, devices in self.devices.items():
+            if self.mask & (1 << channel) and address in devices:
+                return devices[address]
+        raise OSError(errno.EREMOTEIO, "Remote I/O error")
+
+    def ioctl(self, fd, request, arg):
+        if request == i2cdev.I2C_FUNCS:
+            ctypes.c_ulong.from_address(arg).value = self.funcs
+            return 0
+        data = i2cdev._RdwrData.from_address(arg)
+        msgs = [data.msgs[i] for i in range(data.nmsgs)]
+        reads = [m for m in msgs if m.flags & i2cdev.I2C_M_RD]
+        self.calls.append(len(reads))
+        if self.max_reads is not None and (len(reads) > self.max_reads or (reads and reads[-1] is not msgs[-1])):
+            raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+        pending, pointer = None, {}
+        for m in msgs:
+            if m.addr == 0x70:
+                pending = m.buf[0]
+            elif m.flags & i2cdev.I2C_M_RD:
+                regs = self._regs(m.addr)
+                for i in range(m.len):
+                    m.buf[i] = regs[pointer[m.addr] + i]
+            else:
+                self._regs(m.addr)
+                pointer[m.addr] = m.buf[0]
+        if pending is not None:
+            self.mask = pending
+        return len(msgs)
+
+def bno055(w, x, y, z):
+    regs = bytearray(256)
+    regs[REG_QUATERNION:REG_QUATERNION + 8] = struct.pack("<4h", *(int(v * (1 << 14)) for v in (w, x, y, z)))
+    return regs
+
+def open_dev(adapter, max_reads=None):
+    fd, path = tempfile.mkstemp()  # Gewoehnliche Datei statt /dev/i2c-N
+    os.close(fd)
+    try:
+        return I2CDev(1, max_reads=max_reads, ioctl=adapter.ioctl, path=path)
+    finally:
+        os.remove(path)
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für das i2c-dev Backend aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    devices = {2: {0x28: bno055(1, 0, 0, 0), 0x29: bno055(0.5, 0.5, 0.5, 0.5)},
+               7: {0x28: bno055(0, 1, 0, 0), 0x29: bno055(0, 0, 0, 1)}}
+    sensors = {"a": (2, 0x28), "b": (2, 0x29), "c": (7, 0x28), "d": (7, 0x29)}
+
+    # === TEST 1: Pro Kanal eine Kanalwahl und eine ioctl fuer beide Sensoren ===
+    adapter = FakeAdapter(devices)
+    bank = BNO055Bank(open_dev(adapter), 0x70, sensors)
+    values = bank.read(["a", "b", "c", "d"])
+    quats = {name: i2cdev.decode_quaternion(value) for name, (value, _, _) in values.items()}
+    result = (adapter.calls, quats["b"], quats["d"])
+    if not assert_func("i2cdev", "Gebuendelt", "4 Sensoren an 2 Kanaelen", ([0, 2, 0, 2], (0.5, 0.5, 0.5, 0.5), (0, 0, 0, 1)), result):
+        all_passed = False
+
+    # === TEST 2: bcm2835 (eine Lese-Nachricht pro ioctl), Kanal bleibt gewaehlt ===
+    adapter = FakeAdapter(devices, max_reads=1)
+    bank = BNO055Bank(open_dev(adapter, max_reads=1), 0x70, {"a": (2, 0x28), "b": (2, 0x29)})
+    bank.read(["a", "b"])
+    bank.read(["a", "b"])
+    if not assert_func("i2cdev", "bcm2835", "2 Sweeps, 2 Sensoren an Kanal 2", [0, 1, 1, 1, 1], adapter.calls):
+        all_passed = False
+
+    # === TEST 3: Kanaele mit unterschiedlichen Adressen gemeinsam schalten ===
+    adapter = FakeAdapter({2: {0x28: bno055(1, 0, 0, 0)}, 7: {0x29: bno055(0, 0, 1, 0)}})
+    bank = BNO055Bank(open_dev(adapter), 0x70, {"base": (2, 0x28), "arm": (7, 0x29)}, group_channels=True)
+    bank.read(["base", "arm"])
+    second = bank.read(["base", "arm"])
+    result = (adapter.calls, adapter.mask, i2cdev.decode_quaternion(second["arm"][0]))
+    if not assert_func("i2cdev", "Kanal-Gruppen", "Kanal 2 (0x28) + 7 (0x29)", ([0, 2, 2], 0x84, (0, 0, 1, 0)), result):
+        all_passed = False
+
+    # === TEST 4: NAK isoliert den fehlenden Sensor; SMBus-only Adapter wird abgelehnt ===
+    adapter = FakeAdapter({2: {0x28: bno055(1, 0, 0, 0)}})
+    bank = BNO055Bank(open_dev(adapter), 0x70, {"a": (2, 0x28), "b": (2, 0x29)})
+    values = bank.read(["a", "b"])
+    try:
+        open_dev(FakeAdapter(devices, funcs=0x0eff0000))  # i2c-stub: nur SMBus-Funktionen
+        rejected = False
+    except OSError:
+        rejected = True
+    result = (isinstance(values["a"][0], bytes), type(values["b"][0]).__name__, rejected)
+    if not assert_func("i2cdev", "Fehler", "Sensor b fehlt / i2c-stub", (True, "OSError", True), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
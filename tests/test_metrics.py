@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+import math
+import urllib.request
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from metrics import Registry, SensorMetrics, serve
+from hardware.sensor_manager import SensorManager
+from config import MAX_OUTLIERS
+
+def q_about_x(deg):
+    half = math.radians(deg) / 2
+    return (math.cos(half), math.sin(half), 0.0, 0.0)
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die Metriken aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Histogramm mit festen Buckets im Prometheus-Format (kumulativ) ===
+    registry = Registry()
+    latency = registry.histogram("read_seconds", "Dauer", ["sensor"], buckets=(0.001, 0.01))
+    for value in (0.0005, 0.002, 0.003, 0.5):
+        latency.labels("arm").observe(value)
+    text = registry.prometheus()
+    result = [line for line in text.splitlines() if line.startswith("read_seconds_")]
+    expected = ['read_seconds_bucket{sensor="arm",le="0.001"} 1',
+                'read_seconds_bucket{sensor="arm",le="0.01"} 3',
+                'read_seconds_bucket{sensor="arm",le="+Inf"} 4',
+                'read_seconds_sum{sensor="arm"} 0.5055',
+                'read_seconds_count{sensor="arm"} 4']
+    if not assert_func("metrics", "Histogramm", "4 Werte, Buckets 1 ms / 10 ms", expected, result):
+        all_passed = False
+
+    # === TEST 2: Jump-Filter zaehlt Verwerfungen und erzwungene Uebernahmen ===
+    manager = SensorManager(use_hardware=False)
+    manager.metrics = SensorMetrics(["base", "arm"], registry=registry)
+    # Arm springt dauerhaft um 90°: MAX_OUTLIERS Frames verworfen, dann uebernommen
+    frames = [{"base": q_about_x(0), "arm": q_about_x(0)}] + \
+             [{"base": q_about_x(0), "arm": q_about_x(90)}] * (MAX_OUTLIERS + 2)
+    manager.inject_test_data(list(frames))
+    for _ in frames:
+        manager.get_data()
+    m = manager.metrics
+    result = (m.rejects["arm"].value, m.forced["arm"].value, m.rejects["base"].value)
+    if not assert_func("metrics", "Jump-Filter", f"90° Sprung, MAX_OUTLIERS = {MAX_OUTLIERS}",
+                       (MAX_OUTLIERS, 1, 0), result):
+        all_passed = False
+
+    # === TEST 3: HTTP-Endpunkt (Prometheus-Text und JSON) ===
+    server = serve(0, registry=registry)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(base + "/metrics", timeout=5) as resp:
+            text = resp.read().decode("utf-8")
+            ctype = resp.headers["Content-Type"]
+        with urllib.request.urlopen(base + "/metrics.json", timeout=5) as resp:
+            snapshot = json.load(resp)
+    finally:
+        server.shutdown()
+    line = f'armsense_sensor_jump_rejects_total{{sensor="arm"}} {MAX_OUTLIERS}'
+    values = snapshot["metrics"]["armsense_sensor_forced_accepts_total"]["values"]
+    result = (ctype.startswith("text/plain"), line in text.splitlines(),
+              [(v["labels"]["sensor"], v["value"]) for v in values])
+    if not assert_func("metrics", "Endpunkt", "/metrics und /metrics.json",
+                       (True, True, [("arm", 1), ("base", 0)]), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
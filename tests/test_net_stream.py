@@ -0,0 +1,87 @@
+import sys
+import os
+import time
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from transport.net_stream import FrameEncoder, StreamClient, decode, KIND_FRAME
+from transport.websocket import WebSocketPublisher, WebSocketClient
+
+def round_frame(frame, decimal_places=3):
+    return {key: tuple(round(v, decimal_places) for v in q) for key, q in frame.items()}
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für das Netzwerk-Streaming aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    q_0_deg = (1.0, 0.0, 0.0, 0.0)
+    q_90_deg = (0.7071, 0.7071, 0.0, 0.0)
+    q_45_deg = (0.92388, 0.38268, 0.0, 0.0)
+
+    # === TEST 1: Kodierung (int16) und Paketgroesse ===
+    encoder = FrameEncoder(["base", "arm"])
+    packet = encoder.encode({"base": q_90_deg, "arm": q_0_deg}, 10.0)
+    kind, seq, timestamp, quats = decode(packet)
+    result = (len(packet), kind, seq, timestamp, [tuple(round(v, 3) for v in q) for q in quats])
+    expected = (32, KIND_FRAME, 1, 10.0, [(0.707, 0.707, 0.0, 0.0), q_0_deg])
+    if not assert_func("net_stream", "Kodierung int16", "2 Sensoren, Base 90°", expected, result):
+        all_passed = False
+
+    # === TEST 2: Interpolation ueber einen verlorenen Frame ===
+    # Frames bei t=0 (0°) und t=2 (90°), Frame bei t=1 fehlt -> bei t=1 muss 45° herauskommen
+    encoder = FrameEncoder(["base", "arm"])
+    client = StreamClient(delay=0.0)
+    client.feed(encoder.encode_names(), recv_time=0.0)
+    client.feed(encoder.encode({"base": q_0_deg, "arm": q_0_deg}, 0.0), recv_time=0.0)
+    encoder.encode({"base": q_45_deg, "arm": q_45_deg}, 1.0)  # geht verloren
+    client.feed(encoder.encode({"base": q_90_deg, "arm": q_90_deg}, 2.0), recv_time=2.0)
+    result = round_frame(client.sample(now=1.0))
+    expected = {"base": (0.924, 0.383, 0.0, 0.0), "arm": (0.924, 0.383, 0.0, 0.0)}
+    if not assert_func("net_stream", "Interpolation ueber Verlust", "t=0: 0°, t=1: verloren, t=2: 90°", expected, result):
+        all_passed = False
+    if not assert_func("net_stream", "Verlust-Zaehler", "Sequenz 1, 3 empfangen", 1, client.stats()["lost"]):
+        all_passed = False
+
+    # === TEST 3: Verspaetetes Paket wird einsortiert, Duplikat verworfen ===
+    encoder = FrameEncoder(["base", "arm"])
+    client = StreamClient(delay=0.0)
+    client.feed(encoder.encode_names())
+    p1 = encoder.encode({"base": q_0_deg, "arm": q_0_deg}, 0.0)
+    p2 = encoder.encode({"base": q_45_deg, "arm": q_45_deg}, 1.0)
+    p3 = encoder.encode({"base": q_90_deg, "arm": q_90_deg}, 2.0)
+    for p in (p1, p3, p2, p2):
+        client.feed(p, recv_time=2.0)
+    result = (round_frame(client.sample(now=1.0))["base"], client.stats())
+    expected = ((0.924, 0.383, 0.0, 0.0), {"received": 3, "lost": 0, "duplicates": 1, "late": 0})
+    if not assert_func("net_stream", "Umsortierung", "Reihenfolge 1, 3, 2, 2", expected, result):
+        all_passed = False
+
+    # === TEST 4: WebSocket Loopback ===
+    server = WebSocketPublisher(["base", "arm"], port=0, host="127.0.0.1")
+    try:
+        ws = WebSocketClient("127.0.0.1", server.port)
+        client = StreamClient(delay=0.0)
+        messages = ws.messages()
+        client.feed(next(messages))  # Sensornamen
+        server.publish({"base": q_90_deg, "arm": q_0_deg}, time.time())
+        client.feed(next(messages))
+        result = round_frame(client.latest())
+        ws.close()
+    finally:
+        server.close()
+    expected = {"base": (0.707, 0.707, 0.0, 0.0), "arm": q_0_deg}
+    if not assert_func("net_stream", "WebSocket Loopback", "Base 90° ueber ws://127.0.0.1", expected, result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,94 @@
+import sys
+import os
+import math
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.poll_scheduler import PollScheduler
+from hardware.sensor_manager import SensorManager
+from hardware.filters import JumpFilter
+
+def q_about_x(deg):
+    half = math.radians(deg) / 2
+    return (math.cos(half), math.sin(half), 0.0, 0.0)
+
+class FakeSensor:
+    """Ruhender BNO055; mit fail=True schlaegt der Read fehl."""
+    fail = False
+
+    @property
+    def quaternion(self):
+        if self.fail:
+            raise OSError("NAK")
+        return (1.0, 0.0, 0.0, 0.0)
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für den Polling-Scheduler aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # Budget: 2 ms pro Sweep, jeder Read kostet 1 ms -> max. 2 Sensoren pro Sweep
+    scheduler = PollScheduler(["base", "arm", "hand"], budget=0.002, min_rate=5.0,
+                              max_rate=100.0, resolution=1.0, smoothing=1.0,
+                              default_cost=0.001)
+
+    # === TEST 1: Erster Sweep liest im Budget, der Rest folgt im naechsten ===
+    first = scheduler.select(0.0)
+    for name in first:
+        scheduler.update(name, q_about_x(0), 0.0, 0.001)
+    second = scheduler.select(0.0)
+    result = (len(first), sorted(first + second))
+    if not assert_func("poll_scheduler", "Zeitbudget", "3 Sensoren, Budget 2 Reads", (2, ["arm", "base", "hand"]), result):
+        all_passed = False
+    for name in second:
+        scheduler.update(name, q_about_x(0), 0.0, 0.001)
+
+    # === TEST 2: Bewegter Sensor wird haeufiger gelesen als ruhende ===
+    # "arm" dreht sich mit 100°/s, "base" und "hand" ruhen. Simuliere 1 s mit 100 Sweeps.
+    counts = {"base": 0, "arm": 0, "hand": 0}
+    for step in range(1, 101):
+        now = step * 0.01
+        for name in scheduler.select(now):
+            counts[name] += 1
+            q = q_about_x(100.0 * now) if name == "arm" else q_about_x(0)
+            scheduler.update(name, q, now, 0.001)
+    rates = scheduler.rates()
+    result = (counts["arm"] > 50, counts["base"] <= 6, 5.0 <= rates["base"] <= 6.0)
+    if not assert_func("poll_scheduler", "Bewegung priorisiert", "Arm 100°/s, Base ruht (Min 5 Hz)", (True, True, True), result):
+        all_passed = False
+
+    # === TEST 3: Seltener gelesene (ruhende) Sensoren gelten nicht als veraltet, fehlgeschlagene schon ===
+    manager = SensorManager(use_hardware=False)
+    manager.sensors = {"base": FakeSensor(), "arm": FakeSensor()}
+    manager.dummy_mode = False
+    manager.scheduler = PollScheduler(["base", "arm"], budget=1.0, min_rate=5.0, max_rate=100.0, resolution=1.0)
+    stale = []
+    for _ in range(3):  # Erster Sweep liest beide, danach ist 200 ms lang keiner faellig
+        manager.get_data()
+        stale.append(sorted(manager.get_stale()))
+    manager.sensors["arm"].fail = True
+    manager.scheduler.state["arm"].last_poll = None  # arm sofort faellig
+    for _ in range(2):  # Read schlaegt fehl, danach ist arm wieder nicht faellig: bleibt veraltet
+        manager.get_data()
+        stale.append(sorted(manager.get_stale()))
+    manager.sensors["arm"].fail = False
+    manager.scheduler.state["arm"].last_poll = None
+    manager.get_data()
+    stale.append(sorted(manager.get_stale()))
+    # Der Jump-Filter erfaehrt den geplanten Leseabstand (ruhend: 1 / POLL_MIN_RATE)
+    stale.append(manager.filters["arm"].stage(JumpFilter).interval)
+    expected = [[], [], [], ["arm"], ["arm"], [], 0.2]
+    if not assert_func("poll_scheduler", "Veraltete Sensoren", "ruhender Arm, 1 Lesefehler", expected, stale):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
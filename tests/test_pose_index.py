@@ -0,0 +1,74 @@
+import sys
+import os
+import math
+import shutil
+import tempfile
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from recording.session import SessionWriter
+from recording.pose_index import PoseEventIndex
+
+def q_about_x(deg):
+    half = math.radians(deg) / 2
+    return (math.cos(half), math.sin(half), 0.0, 0.0)
+
+def write_session(path, t0, elbow_curve):
+    """Sitzung mit 100 Hz, Oberarm haengt, Unterarm nach elbow_curve(i) in Grad."""
+    writer = SessionWriter(path, ["base", "arm"], chunk_frames=128)
+    for i in range(len(elbow_curve)):
+        data = {"base": q_about_x(0), "arm": q_about_x(elbow_curve[i])}
+        writer.append(t0 + i * 0.01, data, data)
+    writer.close()
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für den Posen-Ereignis-Index aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    root = tempfile.mkdtemp()
+
+    # Sitzung a: 2 s haengend, 3 s L-Form (mit 5 Frames Flackern bei 3.5 s), 1 s haengend
+    curve = [0.0] * 200 + [90.0] * 150 + [40.0] * 5 + [95.0] * 145 + [0.0] * 100
+    write_session(os.path.join(root, "a"), 1000.0, curve)
+    # Sitzung b: 1 s L-Form, 1 s haengend, 0.5 s L-Form
+    curve = [90.0] * 100 + [0.0] * 100 + [90.0] * 50
+    write_session(os.path.join(root, "b"), 5000.0, curve)
+
+    index = PoseEventIndex.build(root, verbose=False)
+
+    # === TEST 1: Intervalle, Flackern zusammengefasst ===
+    result = [(index.sessions[e["session"]]["path"], index.poses[e["pose"]], round(float(e["duration"]), 2))
+              for e in index.events]
+    expected = [("a", "Arm haengt", 1.99), ("a", "L-Form", 2.99), ("a", "Arm haengt", 0.99),
+                ("b", "L-Form", 0.99), ("b", "Arm haengt", 0.99), ("b", "L-Form", 0.49)]
+    if not assert_func("pose_index", "Intervalle", "2 Sitzungen, Flackern < 0.2 s", expected, result):
+        all_passed = False
+
+    # === TEST 2: Abfrage nach Pose, Dauer und Zeitbereich; Spitzenwinkel ===
+    loaded = PoseEventIndex.load(root)
+    long_l = loaded.query(pose="L-Form", min_duration=0.8)
+    in_range = loaded.query(pose="L-Form", start=5001.5, end=6000.0)
+    result = (len(long_l), round(float(long_l[0]["peak_elbow"])), float(in_range[0]["start"]))
+    if not assert_func("pose_index", "Abfrage", "L-Form >= 0.8 s / ab t = 5001.5", (2, 95, 5002.0), result):
+        all_passed = False
+
+    # === TEST 3: Erneutes build liest nur neue Sitzungen (a ohne Spalten-Dateien -> aus dem Index) ===
+    shutil.rmtree(os.path.join(root, "a", "pose"))
+    write_session(os.path.join(root, "c"), 9000.0, [90.0] * 120)
+    rebuilt = PoseEventIndex.build(root, verbose=False)
+    result = ([s["path"] for s in rebuilt.sessions], len(rebuilt.query(sessions=["a"])),
+              [rebuilt.poses[e["pose"]] for e in rebuilt.query(sessions=["c"])])
+    if not assert_func("pose_index", "Inkrementell", "Sitzung c neu", (["a", "b", "c"], 3, ["L-Form"]), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,78 @@
+import sys
+import os
+import math
+import tempfile
+
+import numpy as np
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from recording.session import SessionWriter, SessionReader
+from rom_stats import load_session
+
+def q_about_x(deg):
+    half = math.radians(deg) / 2
+    return (math.cos(half), math.sin(half), 0.0, 0.0)
+
+def write_session(path, frames=250, chunk_frames=100):
+    """Sitzung mit 100 Hz: Oberarm haengt, Unterarm beugt sich linear von 0° auf 90° (ab Frame 150)."""
+    writer = SessionWriter(path, ["base", "arm"], chunk_frames=chunk_frames)
+    for i in range(frames):
+        elbow = min(90.0, max(0.0, (i - 50) * 0.9))
+        data = {"base": q_about_x(0), "arm": q_about_x(elbow)}
+        raw = {"base": q_about_x(0)}  # "arm" ohne Rohdaten (Read fehlgeschlagen)
+        writer.append(1000.0 + i * 0.01, data, raw)
+    writer.close()
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die spaltenweise Aufzeichnung aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    path = os.path.join(tempfile.mkdtemp(), "sitzung")
+    write_session(path)
+    reader = SessionReader(path)
+
+    # === TEST 1: Index (3 Chunks: 100 + 100 + 50 Frames) ===
+    result = (reader.frames, [c["frames"] for c in reader.chunks], reader.time_range())
+    if not assert_func("recording", "Chunk-Index", "250 Frames, Chunk 100", (250, [100, 100, 50], (1000.0, 1002.49)), result):
+        all_passed = False
+
+    # === TEST 2: Zeitbereich ueber eine Chunk-Grenze, nur eine Spalte ===
+    elbow = reader.read("angle.elbow", 1000.95, 1001.05)
+    result = (len(elbow), round(float(elbow[0]), 1), round(float(elbow[-1]), 1))
+    if not assert_func("recording", "Zeitbereich lesen", "t = 0.95 .. 1.05 s", (11, 40.5, 49.5), result):
+        all_passed = False
+
+    # === TEST 3: Innerhalb eines Chunks bleibt das Ergebnis memory-mapped ===
+    part = reader.read("angle.elbow", 1000.10, 1000.20)
+    result = (isinstance(part, np.memmap), len(part))
+    if not assert_func("recording", "mmap-Zugriff", "t = 0.10 .. 0.20 s", (True, 11), result):
+        all_passed = False
+
+    # === TEST 4: Posen-IDs und fehlende Rohdaten ===
+    pose = reader.read("pose")
+    raw_arm = reader.read("raw.arm")
+    result = (reader.poses[int(pose[0])], reader.poses[int(pose[-1])], bool(np.isnan(raw_arm).all()))
+    if not assert_func("recording", "Posen & Rohdaten", "Arm haengt -> L-Form, arm ohne Rohdaten",
+                       ("Arm haengt", "L-Form", True), result):
+        all_passed = False
+
+    # === TEST 5: ROM-Snapshot im Index passt zur Spalte (ohne die Spalte zu lesen) ===
+    elbow = reader.read("angle.elbow").astype(np.float64)
+    rom = load_session(path).summary()["joint.elbow"]
+    result = (rom["n"], round(rom["max"], 1), round(rom["mean"], 2), abs(rom["p50"] - float(np.median(elbow))) < 0.5)
+    expected = (250, round(float(elbow.max()), 1), round(float(elbow.mean()), 2), True)
+    if not assert_func("recording", "ROM-Snapshot", "Ellbogen 0 -> 90 Grad", expected, result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,80 @@
+import sys
+import os
+import math
+import tempfile
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.sensor_manager import SensorManager
+from recording.session import SessionWriter
+from recording.replay import SessionReplay
+
+def q_about_x(deg):
+    half = math.radians(deg) / 2
+    return (math.cos(half), math.sin(half), 0.0, 0.0)
+
+def record_session(path, frames=1000):
+    """
+    Nimmt 10 s (100 Hz) mit dem echten Filter auf: langsame Bewegung mit Glitches
+    (45° Spruenge), damit der Filter-Zustand (Ausreisser-Zaehler) eine Rolle spielt.
+    """
+    manager = SensorManager(use_hardware=False)
+    writer = SessionWriter(path, ["base", "arm"], chunk_frames=300,
+                           state_source=manager.get_filter_state, keyframe_frames=100)
+    for i in range(frames):
+        angle = 30.0 * math.sin(i / 50.0)
+        raw = {"base": q_about_x(angle), "arm": q_about_x(angle + (45.0 if i % 37 < 3 else 0.0))}
+        if i % 101 == 0:
+            del raw["base"]  # Ausgefallener Read
+        data = manager.process(raw)
+        writer.append(i * 0.01, data, manager.last_raw)
+    writer.close()
+
+def close(q1, q2):
+    return all(abs(a - b) < 1e-5 for a, b in zip(q1, q2))
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für das Replay aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    path = os.path.join(tempfile.mkdtemp(), "sitzung")
+    record_session(path)
+
+    # === TEST 1: Sprung im aufgezeichneten Modus liefert exakt den Frame an der Stelle ===
+    replay = SessionReplay(path)
+    replay.seek(7.375)
+    data = replay.get_data()
+    expected = tuple(float(c) for c in replay.reader.row("q.arm", 737))
+    result = (replay.frame, close(data["arm"], expected))
+    if not assert_func("replay", "Seek (aufgezeichnet)", "t = 7.375 s", (737, True), result):
+        all_passed = False
+
+    # === TEST 2: Neu-Filtern ab Keyframe ergibt dieselben Werte wie die Aufnahme ===
+    refilter = SessionReplay(path, refilter=True)
+    results, costs = [], []
+    for position in (7.375, 2.505, 2.515, 9.995):
+        refilter.seek(position)
+        before = refilter.refiltered
+        data = refilter.get_data()
+        costs.append(refilter.refiltered - before)
+        frame = refilter.frame
+        results.append(all(close(data[name], replay.reader.row(f"q.{name}", frame)) for name in ("base", "arm")))
+    if not assert_func("replay", "Seek (neu gefiltert)", "vor, zurueck, +1 Frame, Ende", [True] * 4, results):
+        all_passed = False
+
+    # === TEST 3: Kein Neu-Filtern ab Sitzungsbeginn: nur ab dem letzten Keyframe ===
+    # Frame 737 -> ab Keyframe 700, 250 -> ab 200 (zurueck), 251 -> sequentiell, 999 -> ab 900
+    if not assert_func("replay", "Sprungkosten", "Keyframes alle 100 Frames", [38, 51, 1, 100], costs):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,118 @@
+import sys
+import os
+import math
+import json
+import shutil
+import tempfile
+
+import numpy as np
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.sensor_manager import SensorManager
+from recording.session import SessionWriter, SessionReader
+from recording.reprocess import reprocess, MANIFEST_FILE
+
+def q_about_x(deg):
+    half = math.radians(deg) / 2
+    return (math.cos(half), math.sin(half), 0.0, 0.0)
+
+def record_session(path, frames):
+    """Aufnahme wie main.py --record: Rohdaten durch einen SensorManager, Nullpunkt fuer 'arm' gesetzt."""
+    manager = SensorManager(use_hardware=False)
+    manager.offsets["arm"] = q_about_x(-5.0)
+    writer = SessionWriter(path, ["base", "arm"], chunk_frames=100, state_source=manager.get_filter_state)
+    for i in range(frames):
+        raw = {"base": q_about_x(10.0 * math.sin(i / 20.0)), "arm": q_about_x(45.0 + 40.0 * math.sin(i / 15.0))}
+        if i % 7 == 3:
+            del raw["arm"]  # Lesefehler
+        t = 1000.0 + i * 0.01
+        writer.append(t, manager.process(raw, t=t), raw)
+    writer.close(verbose=False)
+
+def record_calibrated_session(path, frames, calibrate_at):
+    """Aufnahme mit Null-Kalibrierung mitten in der Sitzung (Arm waehrenddessen ruhig)."""
+    manager = SensorManager(use_hardware=False)
+    writer = SessionWriter(path, ["base", "arm"], chunk_frames=100, state_source=manager.get_filter_state,
+                           state_version=manager.get_calibration_version)
+    for i in range(frames):
+        if i == calibrate_at:
+            manager.calibrate_zero(samples=20)
+        still = calibrate_at <= i < calibrate_at + 40
+        raw = {"base": q_about_x(0.0 if still else 10.0 * math.sin(i / 20.0)),
+               "arm": q_about_x(30.0 if still else 45.0 + 40.0 * math.sin(i / 15.0))}
+        t = 1000.0 + i * 0.01
+        writer.append(t, manager.process(raw, t=t), raw)
+    writer.close(verbose=False)
+    return manager
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die Neu-Auswertung von Sitzungs-Archiven aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    base = tempfile.mkdtemp()
+    archive, out = os.path.join(base, "archiv"), os.path.join(base, "neu")
+    for name, frames in (("p1/a", 250), ("p1/b", 120), ("p2/a", 330)):
+        record_session(os.path.join(archive, name), frames)
+
+    # === TEST 1: Pool mit 2 Prozessen; gleiche Pipeline -> gleiche Quaternionen und Posen ===
+    # (Abweichung nur durch die float32-Rohdaten der Aufnahme als Eingabe)
+    stats = reprocess(archive, out, jobs=2, verbose=False)
+    same = []
+    for name in ("p1/a", "p1/b", "p2/a"):
+        src, dst = SessionReader(os.path.join(archive, name)), SessionReader(os.path.join(out, name))
+        same.append(dst.frames == src.frames and np.array_equal(src.read("pose"), dst.read("pose"))
+                    and np.allclose(src.read("q.arm"), dst.read("q.arm"), atol=1e-6)
+                    and np.allclose(src.read("angle.elbow"), dst.read("angle.elbow"), atol=0.01))
+    result = (stats["sessions"], stats["frames"], stats["errors"], same, stats["rom"].frames, stats["rom"].sessions)
+    if not assert_func("reprocess", "Pool", "3 Sitzungen, 2 Prozesse", (3, 700, 0, [True] * 3, 700, 3), result):
+        all_passed = False
+
+    # === TEST 2: Fortsetzen nach Abbruch: nur unfertige Sitzungen laufen erneut ===
+    skipped = reprocess(archive, out, jobs=2, verbose=False)["sessions"]
+    manifest = os.path.join(out, MANIFEST_FILE)
+    with open(manifest) as f:
+        lines = f.read().splitlines()
+    last = json.loads(lines[-1])["session"]
+    with open(manifest, "w") as f:
+        f.write("\n".join(lines[:-1]) + '\n{"session": "p2/a", "sta')  # Abbruch mitten in der Zeile
+    shutil.copytree(os.path.join(out, last), os.path.join(out, last) + ".tmp")  # Halb geschriebene Ausgabe
+    resumed = reprocess(archive, out, jobs=1, verbose=False)
+    result = (skipped, resumed["sessions"], resumed["frames"], os.path.exists(os.path.join(out, last) + ".tmp"),
+              resumed["rom"].sessions)
+    expected = (0, 1, SessionReader(os.path.join(archive, last)).frames, False, 3)
+    if not assert_func("reprocess", "Manifest", "Abbruch nach 2 von 3 Sitzungen", expected, result):
+        all_passed = False
+
+    # === TEST 3: Kalibrierung mitten in der Sitzung wird ab demselben Frame angewendet ===
+    archive, out = os.path.join(base, "archiv_kalibriert"), os.path.join(base, "neu_kalibriert")
+    manager = record_calibrated_session(os.path.join(archive, "s"), 300, calibrate_at=130)
+    reprocess(archive, out, jobs=1, verbose=False)
+    src, dst = SessionReader(os.path.join(archive, "s")), SessionReader(os.path.join(out, "s"))
+    calibrated = [kf["frame"] for kf in src.keyframes if kf["frame"] % 500]
+    result = (calibrated, manager.offsets["arm"] != (1, 0, 0, 0),
+              bool(np.allclose(src.read("q.arm"), dst.read("q.arm"), atol=1e-6)),
+              bool(np.array_equal(src.read("pose"), dst.read("pose"))))
+    if not assert_func("reprocess", "Kalibrierung", "Null-Kalibrierung ab Frame 130 (20 Samples)", ([150], True, True, True), result):
+        all_passed = False
+
+    # === TEST 4: root ist selbst eine Sitzung -> Ausgabe unter ihrem Namen, out bleibt erhalten ===
+    single_out = os.path.join(base, "neu_einzeln")
+    first = reprocess(os.path.join(archive, "s"), single_out, jobs=1, verbose=False)
+    again = reprocess(os.path.join(archive, "s"), single_out, jobs=1, verbose=False)
+    result = (first["sessions"], first["errors"], sorted(os.listdir(single_out)), again["sessions"])
+    if not assert_func("reprocess", "Einzelne Sitzung", "root = Sitzungs-Verzeichnis", (1, 0, [MANIFEST_FILE, "s"], 0), result):
+        all_passed = False
+
+    shutil.rmtree(base)
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
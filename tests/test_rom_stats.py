@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+import math
+import random
+import statistics
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from rom_stats import RomStats, Welford, TDigest
+
+def q_about_y(deg):
+    half = math.radians(deg) / 2
+    return (math.cos(half), 0.0, math.sin(half), 0.0)
+
+def exact_quantile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für die Bewegungsumfang-Statistik aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    rng = random.Random(7)
+    # Schiefe Verteilung wie ein Ellbogen: meist gestreckt, selten stark gebeugt
+    values = [min(150.0, rng.expovariate(1 / 30.0)) for _ in range(50000)]
+
+    # === TEST 1: Welford exakt, t-Digest-Perzentile auf < 0.5 Grad, Speicher begrenzt ===
+    w, digest = Welford(), TDigest(100)
+    for x in values:
+        w.add(x)
+        digest.add(x)
+    errors = [abs(digest.quantile(p) - exact_quantile(values, p)) for p in (0.01, 0.05, 0.5, 0.95, 0.99)]
+    result = (round(w.mean, 6) == round(statistics.fmean(values), 6),
+              round(w.variance, 4) == round(statistics.variance(values), 4),
+              max(errors) < 0.5, len(digest.to_dict()["centroids"]) <= 100)
+    if not assert_func("rom_stats", "Welford / TDigest", "50000 Werte, exponentiell", (True, True, True, True), result):
+        all_passed = False
+
+    # === TEST 2: Drei Teil-Snapshots (ueber JSON) gemergt = ein Durchlauf ===
+    full, parts = RomStats(["base", "arm"]), []
+    for k in range(3):
+        part = RomStats(["base", "arm"])
+        for i in range(k * 2000, (k + 1) * 2000):
+            data = {"base": q_about_y(20.0), "arm": q_about_y(20.0 + values[i] / 2)}
+            part.add(data, t=i * 0.01)
+            full.add(data, t=i * 0.01)
+        parts.append(json.loads(json.dumps(part.snapshot())))
+    merged = RomStats.from_snapshot(parts[0])
+    for snap in parts[1:]:
+        merged.merge(RomStats.from_snapshot(snap))
+    a, b = full.summary()["joint.elbow"], merged.summary()["joint.elbow"]
+    result = (merged.frames, merged.sessions, round(merged.duration, 2), round(b["mean"], 6) == round(a["mean"], 6),
+              round(b["std"], 6) == round(a["std"], 6), (b["min"], b["max"]) == (a["min"], a["max"]),
+              abs(b["p95"] - a["p95"]) < 0.5, round(b["min"], 3) == round(min(values[:6000]) / 2, 3))
+    expected = (6000, 3, 59.97, True, True, True, True, True)
+    if not assert_func("rom_stats", "merge", "3 x 2000 Frames", expected, result):
+        all_passed = False
+
+    # === TEST 3: Kanaele: Segmente zum Nullpunkt, Gelenke aus JOINTS ===
+    stats = RomStats(["base", "arm"])
+    for deg in (0.0, 45.0, 90.0):
+        stats.add({"base": q_about_y(deg), "arm": q_about_y(90.0)})
+    summary = stats.summary()
+    result = {channel: (round(s["min"], 1), round(s["max"], 1)) for channel, s in summary.items()}
+    expected = {"segment.base": (0.0, 90.0), "segment.arm": (90.0, 90.0),
+                "joint.shoulder": (0.0, 90.0), "joint.elbow": (0.0, 90.0)}
+    if not assert_func("rom_stats", "RomStats", "Kanaele", expected, result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -14,8 +14,12 @@ sys.modules['adafruit_tca9548a'] = MagicMock()
 # Damit das Skript das 'ArmSense' Modul findet
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
 
+from hardware import sensor_manager
 from hardware.sensor_manager import SensorManager
 
+# Die Mock-Busse duerfen den Topologie-Cache der Station nicht ueberschreiben
+sensor_manager.DISCOVERY_CACHE = None
+
 def round_quaternion(q_dict, decimal_places=4):
     """Rundet die Werte in einem Quaternionen-Dict für verlässliche Vergleiche."""
     rounded = {}
@@ -81,6 +85,59 @@ def run_all_tests(assert_func):
     if not assert_func("sensor_manager", "Glitch Protection (Jump Filter >20°)", "Letzter: 0°, Neu (Glitch): 45°", expected_jump, res_jump_rounded):
         all_passed = False
 
+    # === TEST 3: Mehrfach-Kalibrierung mit Ausreisser (asynchron ueber get_data) ===
+    sm_calib = SensorManager()
+    q_10_neg = tuple(-v for v in q_10_deg)  # Gleiche Rotation, anderes Vorzeichen
+    test_queue_calib = [
+        {"base": q_10_deg, "arm": q_10_deg},
+        {"base": q_10_neg, "arm": q_10_deg},
+        {"base": q_45_deg, "arm": q_10_deg},  # Ausreisser -> wird verworfen
+        {"base": q_10_deg, "arm": q_10_deg},
+        {"base": q_10_deg, "arm": q_10_deg},
+        {"base": q_10_deg, "arm": q_10_deg},  # Frame nach der Kalibrierung
+    ]
+    sm_calib.inject_test_data(test_queue_calib)
+    sm_calib.calibrate_zero(samples=5)
+
+    progress = []
+    for _ in range(5):
+        sm_calib.get_data()
+        status = sm_calib.calibration_status()
+        progress.append(status[1] if status else None)
+
+    # Nach der Kalibrierung muss die 10° Haltung als Nullpunkt (Identitaet) erscheinen
+    res_calib = round_quaternion(sm_calib.get_data())
+    expected_calib = {"base": (1.0, 0.0, 0.0, 0.0), "arm": (1.0, 0.0, 0.0, 0.0)}
+
+    if not assert_func("sensor_manager", "Kalibrierung Fortschritt", "5 Samples", [0.2, 0.4, 0.6, 0.8, None], progress):
+        all_passed = False
+    if not assert_func("sensor_manager", "Kalibrierung (Mittelwert + Ausreisser)", "4x 10°, 1x 45° Ausreisser", expected_calib, res_calib):
+        all_passed = False
+
+    # === TEST 4: inject_test_data kopiert die Liste (Warteschlange als deque, O(1) pro Frame) ===
+    sm_queue = SensorManager(use_hardware=False)
+    frames = [{"base": q_0_deg, "arm": q_0_deg}, {"base": q_10_deg, "arm": q_10_deg}]
+    sm_queue.inject_test_data(frames)
+    sm_queue.get_data()
+    res_queue = round_quaternion(sm_queue.get_data())["arm"]
+    if not assert_func("sensor_manager", "Test-Warteschlange", "Liste bleibt unveraendert", (2, (0.9962, 0.0872, 0.0, 0.0)), (len(frames), res_queue)):
+        all_passed = False
+
+    # === TEST 5: Vorwaerts waehrend laufender Null-Kalibrierung wird abgelehnt, nicht ersetzt ===
+    sm_order = SensorManager(use_hardware=False)
+    sm_order.inject_test_data([{"base": q_10_deg, "arm": q_10_deg}] * 6)
+    started = sm_order.calibrate_zero(samples=4)
+    sm_order.get_data()
+    rejected = sm_order.calibrate_forward(samples=4)
+    status = sm_order.calibration_status()
+    for _ in range(3):
+        sm_order.get_data()
+    res_order = (started, rejected, status[0], sm_order.calibration_status(),
+                 round_quaternion(sm_order.get_data())["arm"], sm_order.calibrate_forward(samples=4))
+    expected_order = (True, False, "zero", None, (1.0, 0.0, 0.0, 0.0), True)
+    if not assert_func("sensor_manager", "Kalibrierung Reihenfolge", "Vorwaerts nach 1/4 Null-Samples", expected_order, res_order):
+        all_passed = False
+
     return all_passed
 
 if __name__ == '__main__':
@@ -0,0 +1,123 @@
+import sys
+import os
+import uuid
+import subprocess
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from transport.shm_ring import SharedFrameWriter, SharedFrameReader, CMD_NONE, CMD_ZERO, CMD_FORWARD, CMD_SLOTS, _STATIC
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für den Shared-Memory Ringpuffer aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+    name = f"armsense_test_{uuid.uuid4().hex[:8]}"
+
+    q_0_deg = (1.0, 0.0, 0.0, 0.0)
+    q_90_deg = (0.7071, 0.7071, 0.0, 0.0)
+
+    writer = SharedFrameWriter(name, ["base", "arm"], capacity=4)
+    try:
+        reader = SharedFrameReader(name)
+
+        # === TEST 1: Leerer Puffer liefert Identitaet ===
+        result = reader.get_data()
+        if not assert_func("shm_ring", "Leerer Puffer", "Noch kein Frame", {"base": (1, 0, 0, 0), "arm": (1, 0, 0, 0)}, result):
+            all_passed = False
+
+        # === TEST 2: Neuester Frame gewinnt ===
+        writer.publish({"base": q_0_deg, "arm": q_0_deg}, 1.0)
+        writer.publish({"base": q_90_deg, "arm": q_0_deg}, 2.0)
+        result = reader.get_data()
+        expected = {"base": q_90_deg, "arm": q_0_deg}
+        if not assert_func("shm_ring", "Neuester Frame", "Frame 1: 0°, Frame 2: Base 90°", expected, result):
+            all_passed = False
+        if not assert_func("shm_ring", "Zeitstempel", "Frame 2 bei t=2.0", (2, 2.0), (reader.last_seq, reader.last_timestamp)):
+            all_passed = False
+
+        # === TEST 3: Zero-Copy Sicht ===
+        view = reader.view(2)
+        result = (tuple(view[0:4]), reader.check(2))
+        view.release()
+        if not assert_func("shm_ring", "Zero-Copy View", "Slot von Frame 2", (q_90_deg, True), result):
+            all_passed = False
+
+        # === TEST 4: Ueberholte Frames werden uebersprungen (Kapazitaet 4) ===
+        for i in range(3, 9):
+            writer.publish({"base": q_0_deg, "arm": q_0_deg}, float(i))
+        seqs = [seq for seq, _, _ in reader.read_since(0)]
+        if not assert_func("shm_ring", "read_since nach Ueberlauf", "8 Frames, Kapazitaet 4", [5, 6, 7, 8], seqs):
+            all_passed = False
+
+        # === TEST 5: Kommando-Kanal Richtung Daemon ===
+        result = [writer.poll_command()]
+        reader.calibrate_zero()
+        result.append(writer.poll_command())
+        result.append(writer.poll_command())
+        reader.calibrate_forward()
+        result.append(writer.poll_command())
+        if not assert_func("shm_ring", "Kommando-Kanal", "Zero, dann Forward", [CMD_NONE, CMD_ZERO, CMD_NONE, CMD_FORWARD], result):
+            all_passed = False
+
+        # === TEST 6: Gleichzeitige Sender verlieren keine Kommandos ===
+        reader.calibrate_forward()
+        reader.calibrate_zero()
+        result = [writer.poll_command(), writer.poll_command(), writer.poll_command()]
+        code = ("import sys; from transport.shm_ring import SharedFrameReader, CMD_ZERO; "
+                f"r = SharedFrameReader('{name}'); [r.send_command(CMD_ZERO) for _ in range(200)]; r.close()")
+        armsense = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense'))
+        procs = [subprocess.Popen([sys.executable, "-c", code], cwd=armsense) for _ in range(3)]
+        received = 0
+        while any(p.poll() is None for p in procs):
+            received += writer.poll_command() == CMD_ZERO
+        while writer.poll_command() == CMD_ZERO:
+            received += 1
+        # Kommt der Writer nicht hinterher, verwirft er hoechstens die aeltesten (Ring mit CMD_SLOTS)
+        result.append((writer._last_cmd_seq - 4, 0 < received <= 600))
+        if not assert_func("shm_ring", "Kommando-Kanal", "3 Sender x 200 gleichzeitig",
+                           [CMD_FORWARD, CMD_ZERO, CMD_NONE, (600, True)], result):
+            all_passed = False
+
+        # === TEST 7: Zweiter Writer darf den Ring eines laufenden Writers nicht uebernehmen ===
+        try:
+            SharedFrameWriter(name, ["base", "arm"], capacity=4)
+            result = "uebernommen"
+        except FileExistsError:
+            result = "abgelehnt"
+        result = (result, reader.write_seq)
+        if not assert_func("shm_ring", "Laufender Writer", "Zweiter Writer, gleicher Name", ("abgelehnt", 8), result):
+            all_passed = False
+
+        reader.close()
+    finally:
+        writer.close()
+
+    # === TEST 8: Reste eines abgestuerzten Writers (PID existiert nicht mehr) werden ersetzt ===
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    crashed = SharedFrameWriter(name, ["base", "arm"], capacity=4)
+    crashed.publish({"base": q_90_deg, "arm": q_90_deg}, 1.0)
+    fields = list(_STATIC.unpack_from(crashed.shm.buf, 0))
+    _STATIC.pack_into(crashed.shm.buf, 0, *fields[:-1], dead.pid)
+    crashed.close(unlink=False)  # Absturz: Segment bleibt liegen
+    writer = SharedFrameWriter(name, ["base", "arm"], capacity=4)
+    try:
+        reader = SharedFrameReader(name)
+        result = (reader.write_seq, reader.get_data()["base"])
+        reader.close()
+    finally:
+        writer.close()
+    if not assert_func("shm_ring", "Abgestuerzter Writer", "PID beendet", (0, (1, 0, 0, 0)), result):
+        all_passed = False
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)
@@ -0,0 +1,77 @@
+import sys
+import os
+import math
+import time
+
+# Damit das Skript das 'ArmSense' Modul findet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ArmSense')))
+
+from hardware.skew import SkewResampler
+from hardware.sensor_manager import SensorManager
+from utils import q_angle_between
+
+RATE = 90.0  # Grad/s um Z
+
+def rotation(t):
+    half = math.radians(RATE * t) / 2
+    return (math.cos(half), 0.0, 0.0, math.sin(half))
+
+class RotatingSensor:
+    """Dreht mit RATE; der Read dauert 'delay', der Wert gilt fuer die Mitte der Transaktion."""
+    def __init__(self, t0, delay=0.005):
+        self.t0 = t0
+        self.delay = delay
+
+    @property
+    def quaternion(self):
+        time.sleep(self.delay / 2)
+        q = rotation(time.perf_counter() - self.t0)
+        time.sleep(self.delay / 2)
+        return q
+
+def relative_angles(manager, frames):
+    angles = []
+    for _ in range(frames):
+        data = manager.get_data()
+        angles.append(q_angle_between(data["base"], data["arm"]))
+    return angles[2:]  # Erst ab gefuellter Historie
+
+def run_all_tests(assert_func):
+    """
+    Führt alle Tests für den Ausgleich des Zeitversatzes im Sweep aus.
+    Gibt True zurück, wenn alle Tests erfolgreich waren, sonst False.
+    """
+    all_passed = True
+
+    # === TEST 1: Spaeter gelesener Sensor wird auf den Zeitpunkt des ersten interpoliert ===
+    resampler = SkewResampler(["base", "arm"])
+    resampler.resample({"base": 0.000, "arm": 0.004}, {"base": rotation(0.000), "arm": rotation(0.004)})
+    t, data = resampler.resample({"base": 0.010, "arm": 0.014}, {"base": rotation(0.010), "arm": rotation(0.014)})
+    error = round(q_angle_between(data["arm"], rotation(0.010)), 3)
+    result = (t, error, data["base"] == rotation(0.010))
+    if not assert_func("skew", "SLERP", "base @ 10 ms, arm @ 4/14 ms", (0.010, 0.0, True), result):
+        all_passed = False
+
+    # === TEST 2: Gleiche Bewegung an beiden Sensoren -> ohne Ausgleich Versatz, mit Ausgleich keiner ===
+    t0 = time.perf_counter()
+    manager = SensorManager(use_hardware=False)
+    manager.sensors = {"base": RotatingSensor(t0), "arm": RotatingSensor(t0)}
+    manager.dummy_mode = False
+    skewed = relative_angles(manager, 6)
+    manager.resampler = SkewResampler(["base", "arm"])
+    aligned = relative_angles(manager, 6)
+    times = manager.get_sample_times()
+    # 5 ms Versatz bei 90 Grad/s = 0.45 Grad
+    result = (min(skewed) > 0.3, max(aligned) < 0.1, manager.frame_time == min(times.values()))
+    if not assert_func("skew", "SensorManager", "2 Sensoren, 5 ms pro Read", (True, True, True), result):
+        all_passed = False
+        print(f"    ohne Ausgleich: {skewed}, mit Ausgleich: {aligned}")
+
+    return all_passed
+
+if __name__ == '__main__':
+    def dummy_assert(mod, func, data, exp, act):
+        passed = act == exp
+        print(f"[{func}] {'BESTANDEN' if passed else 'FEHLGESCHLAGEN'} (Ist: {act}, Erwartet: {exp})")
+        return passed
+    run_all_tests(dummy_assert)